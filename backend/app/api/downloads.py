@@ -0,0 +1,208 @@
+"""
+Download Routes - Serves generated CAD artifacts
+Path: app/api/downloads.py
+
+Replaces a plain StaticFiles mount with:
+- strong ETags derived from content hashes, with If-None-Match -> 304
+- precompressed .br/.gz variants chosen from Accept-Encoding
+- byte-range requests (handled by FileResponse, validated by If-Range)
+- long-lived immutable caching for content-addressed URLs
+- friendly download names (skf_config_{id}.dxf) for content-addressed exports
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.core.cad_engine import DXFGenerator
+from app.core.export_cache import export_cache, model_cache
+from app.core.storage import export_storage
+from app.db.models import Export
+from app.db.session import get_db
+from app.utils.compression import available_encodings, variant_path
+
+router = APIRouter()
+
+# Artifacts under these subdirectories never change once written
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+MEDIA_TYPES = {
+    ".dxf": "application/dxf",
+    ".zip": "application/zip",
+    ".glb": "model/gltf-binary",
+    ".stl": "model/stl",
+    ".svg": "image/svg+xml",
+}
+
+# Content-addressed directories: a URL there always names the same bytes
+CONTENT_ADDRESSED_DIRS = (export_cache.cache_dir, model_cache.cache_dir)
+
+# (path, mtime_ns, size) -> sha256 hex, bounded LRU
+_ETAG_CACHE_SIZE = 4096
+_etag_cache: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_etag_lock = threading.Lock()
+
+
+def content_etag(path: Path) -> str:
+    """
+    Strong ETag from the SHA-256 of a file's content.
+    
+    Hashes are memoized per (path, mtime, size), so each file is read
+    once rather than on every request.
+    """
+    stat_result = path.stat()
+    memo_key = (str(path), stat_result.st_mtime_ns, stat_result.st_size)
+    with _etag_lock:
+        digest = _etag_cache.get(memo_key)
+        if digest is not None:
+            _etag_cache.move_to_end(memo_key)
+            return f'"{digest}"'
+    
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            hasher.update(chunk)
+    digest = hasher.hexdigest()[:32]
+    
+    with _etag_lock:
+        _etag_cache[memo_key] = digest
+        if len(_etag_cache) > _ETAG_CACHE_SIZE:
+            _etag_cache.popitem(last=False)
+    return f'"{digest}"'
+
+
+def _resolve_artifact(file_path: str) -> Path:
+    """Map a URL path to a file inside EXPORT_DIR, rejecting traversal."""
+    root = DXFGenerator.EXPORT_DIR.resolve()
+    path = (root / file_path).resolve()
+    if root not in path.parents or path.name.startswith(".") or not path.is_file():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    return path
+
+
+def _export_filename(db: Session, path: Path) -> Optional[str]:
+    """
+    Download name of a content-addressed export file: skf_config_{id}{suffix}.
+    
+    Cached files are named by their content hash; the name comes from the
+    latest export that produced the file. Other files keep their own name.
+    """
+    if export_cache.cache_dir.resolve() not in path.parents:
+        return None
+    relative = path.relative_to(DXFGenerator.EXPORT_DIR.resolve()).as_posix()
+    configuration_id = db.query(Export.configuration_id)\
+        .filter(Export.file_path == f"/downloads/{relative}")\
+        .order_by(Export.id.desc())\
+        .limit(1)\
+        .scalar()
+    return f"skf_config_{configuration_id}{path.suffix}" if configuration_id is not None else None
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    """Parse Accept-Encoding into the set of codings with q > 0."""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def _select_variant(path: Path, accept_encoding: str) -> Tuple[Path, Optional[str]]:
+    """Pick the best precompressed variant the client accepts."""
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding in available_encodings():
+        if encoding in accepted or "*" in accepted:
+            candidate = variant_path(path, encoding)
+            if candidate.is_file():
+                return candidate, encoding
+    return path, None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, as RFC 9110 requires)."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+@router.api_route(
+    "/{file_path:path}",
+    methods=["GET", "HEAD"],
+    summary="Download Artifact",
+    description="Download a generated CAD file with caching, compression and range support"
+)
+def download_artifact(file_path: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Download a generated artifact.
+    
+    - **file_path**: Path returned in an export's `file_path` (after /downloads/)
+    """
+    path = _resolve_artifact(file_path)
+    return serve_artifact(path, request, filename=_export_filename(db, path))
+
+
+def serve_artifact(
+    path: Path,
+    request: Request,
+    filename: Optional[str] = None,
+    cache_control: Optional[str] = None
+) -> Response:
+    """
+    Respond with a stored artifact: variant selection, ETag/304, ranges.
+    
+    Args:
+        path: Resolved file under the storage root
+        request: Incoming request (Accept-Encoding, If-None-Match)
+        filename: Download filename (default: the file's name)
+        cache_control: Cache-Control override, for URLs that aren't content-addressed
+        
+    Returns:
+        Response: 304 or the (possibly precompressed) file
+    """
+    served_path, encoding = _select_variant(path, request.headers.get("accept-encoding", ""))
+    etag = content_etag(served_path)
+    
+    if cache_control is None:
+        is_content_addressed = any(d.resolve() in path.resolve().parents for d in CONTENT_ADDRESSED_DIRS)
+        cache_control = IMMUTABLE_CACHE_CONTROL if is_content_addressed else REVALIDATE_CACHE_CONTROL
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": cache_control,
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    # Downloads drive LRU retention (see ExportStorage)
+    export_storage.record_access(path)
+    
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    
+    return FileResponse(
+        served_path,
+        headers=headers,
+        media_type=MEDIA_TYPES.get(path.suffix.lower(), "application/octet-stream"),
+        filename=filename or path.name,
+        stat_result=served_path.stat()
+    )
@@ -0,0 +1,41 @@
+"""
+Metrics Route - Prometheus scrape endpoint
+Path: app/api/metrics.py
+
+Serves the process registry of app/core/metrics.py. Run one scrape target
+per server process: each worker keeps its own counters (export job metrics
+are merged into the process that queued the job).
+"""
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.job_queue import export_queue
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics.gauge("export_queue_depth", "Export jobs submitted but not yet finished", lambda: [((), export_queue.depth())])
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    summary="Prometheus Metrics",
+    description="Request latency, CAD phase timings, SQL statements, export queue depth and cache hit rates"
+)
+def get_metrics():
+    """
+    Scrape endpoint in the Prometheus text format.
+    
+    - **http_request_duration_seconds**: Latency histogram per route template
+    - **cad_phase_duration_seconds**: document, layers, geometry, entities, dimensions, save
+    - **db_queries_total / db_query_duration_seconds**: SQL statements by type
+    - **export_queue_depth**: Export jobs in flight
+    - **cache_requests_total / cache_hit_ratio**: export, model and geometry caches
+    """
+    if not metrics.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled (METRICS_ENABLED)")
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -3,7 +3,7 @@ API V1 Router - Aggregates all V1 routes
 Path: app/api/v1/router.py
 """
 from fastapi import APIRouter
-from app.api.v1.routes import configurations, exports
+from app.api.v1.routes import configurations, exports, models, profiles
 
 # Create main API router
 api_router = APIRouter()
@@ -21,3 +21,17 @@ api_router.include_router(
     prefix="/exports",
     tags=["Exports"]
 )
+
+# Include model routes
+api_router.include_router(
+    models.router,
+    prefix="/models",
+    tags=["Models"]
+)
+
+# Include admin routes for stored request profiles
+api_router.include_router(
+    profiles.router,
+    prefix="/admin/profiles",
+    tags=["Admin"]
+)
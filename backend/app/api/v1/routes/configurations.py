@@ -2,17 +2,25 @@
 Configuration API Routes
 Path: app/api/v1/routes/configurations.py
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import List, Optional
 
-from app.db.session import get_db
+from app.api.downloads import REVALIDATE_CACHE_CONTROL, etag_matches
+from app.core.config import settings
+from app.core.response_cache import configuration_cache
+from app.db.session import AnySession, get_session, open_session, run_db
 from app.schemas.configuration import (
+    ConfigurationBatchValidationRequest,
+    ConfigurationBatchValidationResponse,
     ConfigurationCreate,
+    ConfigurationImportReport,
     ConfigurationResponse,
-    ConfigurationUpdate
+    ConfigurationUpdate,
+    ConfigurationUpdateResponse,
+    RuleViolation
 )
-from app.services import configuration_service
+from app.schemas.export import ArtifactFreshness
+from app.services import artifact_service, configuration_service
 
 router = APIRouter()
 
@@ -24,9 +32,11 @@ router = APIRouter()
     summary="Create Configuration",
     description="Create a new bearing configuration with part number and parameters"
 )
-def create_configuration(
+async def create_configuration(
     config: ConfigurationCreate,
-    db: Session = Depends(get_db)
+    response: Response,
+    idempotent: bool = Query(True, description="Return an identical stored configuration (200); false: fail with 409"),
+    db: AnySession = Depends(get_session)
 ):
     """
     Create a new configuration.
@@ -36,9 +46,19 @@ def create_configuration(
     - **material_params**: JSON object with material specs
     - **advanced_params**: Optional additional parameters
     - **status**: Configuration status (default: "draft")
+    - **idempotent**: Identical configurations (same product, part number,
+      ST, NOB and parameters) are stored once; by default the stored one is
+      returned with 200, with idempotent=false the request fails with 409
     """
     try:
-        return configuration_service.create_configuration(db=db, config=config)
+        if not idempotent:
+            return await run_db(db, configuration_service.create_configuration, config=config)
+        db_config, created = await run_db(db, configuration_service.get_or_create_configuration, config=config)
+        if not created:
+            response.status_code = status.HTTP_200_OK
+        return db_config
+    except HTTPException:
+        raise  # rule violations keep their 400, duplicates their 409
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -46,33 +66,119 @@ def create_configuration(
         )
 
 
+@router.post(
+    "/import",
+    response_model=ConfigurationImportReport,
+    summary="Bulk Import Configurations",
+    description="Stream newline-delimited JSON configurations into the database in batched transactions"
+)
+async def import_configurations(
+    request: Request,
+    transaction_size: Optional[int] = Query(None, ge=1),
+    db: AnySession = Depends(get_session)
+):
+    """
+    Bulk-import configurations from an NDJSON request body.
+    
+    Each non-blank line is one configuration object with the same fields as
+    Create Configuration. The body is read line by line and inserted in
+    batched transactions; invalid lines are skipped and listed in the report.
+    
+    - **transaction_size**: Lines validated and committed together
+      (default IMPORT_TRANSACTION_SIZE, capped at IMPORT_MAX_TRANSACTION_SIZE)
+    """
+    try:
+        return await configuration_service.import_configurations(
+            db,
+            request.stream(),
+            transaction_size=transaction_size
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import configurations: {str(e)}"
+        )
+
+
+@router.post(
+    "/validate",
+    response_model=ConfigurationBatchValidationResponse,
+    summary="Batch Validate Parameters",
+    description="Check many candidate parameter sets against the engineering rules without saving them"
+)
+def validate_configurations(request: ConfigurationBatchValidationRequest):
+    """
+    Validate candidate parameter sets in one vectorized pass.
+    
+    - **candidates**: Flat parameter sets (PN, ST, NOB, LS, L1, MX, GREASE, ...)
+    - **require_complete**: Also require every mandatory parameter (default true)
+    """
+    if len(request.candidates) > settings.VALIDATION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.VALIDATION_BATCH_MAX_ITEMS} candidates per request"
+        )
+    return configuration_service.validate_candidates(
+        request.candidates,
+        require_complete=request.require_complete
+    )
+
+
 @router.get(
     "/",
     response_model=List[ConfigurationResponse],
     summary="List Configurations",
     description="Retrieve all configurations with pagination support"
 )
-def list_configurations(
+async def list_configurations(
+    response: Response,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    part_number: Optional[str] = None,
+    db: AnySession = Depends(get_session)
 ):
     """
-    List all configurations with pagination.
+    List all configurations with pagination, oldest first.
     
-    - **skip**: Number of items to skip (for pagination)
+    - **skip**: Number of items to skip (offset pagination)
     - **limit**: Number of items to return (max 100)
+    - **cursor**: Opaque cursor from the previous page's X-Next-Cursor header
+      (keyset pagination, takes precedence over skip)
+    - **status**: Only return configurations with this status
+    - **part_number**: Only return configurations with this part number
+    
+    When more results exist, the cursor of the next page is returned in the
+    X-Next-Cursor response header.
     """
     if limit > 100:
         limit = 100
     
     try:
-        return configuration_service.get_configurations(db=db, skip=skip, limit=limit)
+        configs, next_cursor = await run_db(
+            db,
+            configuration_service.get_configurations_page,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            status=status_filter,
+            part_number=part_number
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve configurations: {str(e)}"
         )
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return configs
 
 
 @router.get(
@@ -81,52 +187,103 @@ def list_configurations(
     summary="Get Configuration",
     description="Retrieve a specific configuration by ID"
 )
-def get_configuration(
+async def get_configuration(
     config_id: int,
-    db: Session = Depends(get_db)       
+    request: Request
 ):
     """
     Get a specific configuration by ID.
     
     - **config_id**: The ID of the configuration to retrieve
+    
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when
+    the configuration is unchanged. Serialised responses are cached until
+    the configuration is updated or deleted, so a hit opens no session.
     """
-    config = configuration_service.get_configuration(db=db, config_id=config_id)
-    if not config:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Configuration with ID {config_id} not found"
-        )
-    return config
+    cached = configuration_cache.get(config_id)
+    if cached is None:
+        generation = configuration_cache.generation()
+        async with open_session() as db:
+            config = await run_db(db, configuration_service.get_configuration, config_id=config_id)
+            if not config:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Configuration with ID {config_id} not found"
+                )
+            body = ConfigurationResponse.model_validate(config).model_dump_json().encode()
+        cached = configuration_cache.put(config_id, body, generation)
+    
+    headers = {"ETag": cached.etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
 
 
 @router.patch(
     "/{config_id}",
-    response_model=ConfigurationResponse,
+    response_model=ConfigurationUpdateResponse,
     summary="Update Configuration",
     description="Partially update an existing configuration"
 )
-def update_configuration(
+async def update_configuration(
     config_id: int,
     config_update: ConfigurationUpdate,
-    db: Session = Depends(get_db)
+    regenerate: Optional[bool] = Query(None, description="Queue regeneration of affected artifacts (default: EXPORT_REGENERATE_ON_UPDATE)"),
+    db: AnySession = Depends(get_session)
 ):
     """
     Update an existing configuration (partial update).
     
     - **config_id**: The ID of the configuration to update
     - Only provided fields will be updated
+    - Fails with 409 if the result would be identical to another configuration
+    - A non-draft configuration must be complete when it leaves draft or its
+      geometry changes; otherwise missing parameters are listed in `incomplete`
+    - Exports of artifacts that read a changed parameter are marked `stale`
+    - **regenerate**: Also queue regeneration of those artifacts
     """
-    config = configuration_service.update_configuration(
-        db=db,
+    config = await run_db(
+        db,
+        configuration_service.update_configuration,
         config_id=config_id,
-        config_update=config_update
+        config_update=config_update,
+        regenerate=settings.EXPORT_REGENERATE_ON_UPDATE if regenerate is None else regenerate
     )
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Configuration with ID {config_id} not found"
         )
-    return config
+    response = ConfigurationUpdateResponse.model_validate(config)
+    response.incomplete = [RuleViolation(**v) for v in configuration_service.incomplete_violations(config)]
+    return response
+
+
+@router.get(
+    "/{config_id}/artifacts",
+    response_model=List[ArtifactFreshness],
+    summary="Artifact Freshness",
+    description="Per-artifact dependencies and whether a file matching the current parameters exists"
+)
+async def get_artifact_freshness(
+    config_id: int,
+    db: AnySession = Depends(get_session)
+):
+    """
+    Get the freshness of every artifact generated from a configuration.
+    
+    - **config_id**: The ID of the configuration
+    - **depends_on**: Parameters the artifact reads; changing others never invalidates it
+    - **fresh**: A generated file matches the current parameters
+    """
+    report = await run_db(db, artifact_service.get_artifact_freshness, config_id=config_id)
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Configuration with ID {config_id} not found"
+        )
+    return report
 
 
 @router.delete(
@@ -135,9 +292,9 @@ def update_configuration(
     summary="Delete Configuration",
     description="Delete a configuration and all associated exports"
 )
-def delete_configuration(
+async def delete_configuration(
     config_id: int,
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Delete a configuration.
@@ -145,7 +302,7 @@ def delete_configuration(
     - **config_id**: The ID of the configuration to delete
     - This will also delete all associated exports (cascade delete)
     """
-    success = configuration_service.delete_configuration(db=db, config_id=config_id)
+    success = await run_db(db, configuration_service.delete_configuration, config_id=config_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2,12 +2,23 @@
 Export API Routes
 Path: app/api/v1/routes/exports.py
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from app.db.session import get_db
-from app.schemas.export import ExportCreate, ExportResponse, ExportUpdate
+from app.db.session import AnySession, get_db, get_session, run_db
+from app.schemas.export import (
+    ExportBatchCreate,
+    ExportCacheStats,
+    ExportCreate,
+    ExportFormatsCreate,
+    ExportResponse,
+    ExportStorageReport,
+    ExportUpdate,
+    GeneratorInfo
+)
+from app.core.writers import get_writer
 from app.services import export_service
 
 router = APIRouter()
@@ -16,9 +27,9 @@ router = APIRouter()
 @router.post(
     "/",
     response_model=ExportResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Create Export",
-    description="Create a new CAD export request for a configuration"
+    description="Queue a CAD export for a configuration and return immediately"
 )
 def create_export(
     export: ExportCreate,
@@ -28,8 +39,18 @@ def create_export(
     Create a new export request.
     
     - **configuration_id**: ID of the configuration to export
-    - **format**: Export format (STEP, IGES, STL, etc.)
+    - **format**: Export format (DXF, DXF_BINARY, SVG or STL)
+    
+    Returns the export as `pending` with a `job_id`; poll GET /exports/{id}
+    until it is `completed` or `failed`. Cached files complete immediately.
+    
+    With **delivery** = `stream` the file itself is returned as the response
+    body (gzip-encoded if **compress**), and is only stored under /downloads
+    if **persist** is set.
     """
+    if export.delivery == "stream":
+        return _stream_export(export, db)
+    
     try:
         return export_service.create_export(db=db, export=export)
     except Exception as e:
@@ -39,22 +60,201 @@ def create_export(
         )
 
 
+def _stream_export(export: ExportCreate, db: Session) -> StreamingResponse:
+    """Build the streaming response for delivery="stream"."""
+    try:
+        chunks = export_service.stream_export(db=db, export=export)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create export: {str(e)}"
+        )
+    if chunks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Configuration with ID {export.configuration_id} not found"
+        )
+    
+    writer = get_writer(export.format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="skf_config_{export.configuration_id}{writer.suffix}"'
+    }
+    if export.compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(chunks, media_type=writer.media_type, headers=headers)
+
+
+@router.post(
+    "/formats",
+    response_model=List[ExportResponse],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Create Multi-Format Export",
+    description="Export one configuration in several formats from a single geometry build"
+)
+def create_format_exports(
+    request: ExportFormatsCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create one export per requested format.
+    
+    - **configuration_id**: ID of the configuration to export
+    - **formats**: Export formats (DXF, DXF_BINARY, SVG, STL)
+    
+    All formats are generated by one job, so the geometry is built once.
+    Poll each returned export as for POST /exports.
+    """
+    try:
+        exports = export_service.create_format_exports(db=db, request=request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create exports: {str(e)}"
+        )
+    if exports is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Configuration with ID {request.configuration_id} not found"
+        )
+    return exports
+
+
+@router.post(
+    "/batch",
+    response_class=StreamingResponse,
+    summary="Batch Export",
+    description="Export many configurations and stream the files back as one ZIP"
+)
+def create_batch_export(
+    batch: ExportBatchCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create a batch export.
+    
+    - **configuration_ids**: Configurations to export
+    - **status** / **part_number**: Filter used when no IDs are given
+    - **format**: Export format (default: DXF)
+    
+    Files are added to the ZIP as they finish. The archive ends with
+    `manifest.json`, which lists every export's status and error message.
+    """
+    if not batch.configuration_ids and batch.status is None and batch.part_number is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide configuration_ids or a status/part_number filter"
+        )
+    
+    batch_id, jobs = export_service.start_batch_export(db=db, batch=batch)
+    return StreamingResponse(
+        export_service.stream_batch_zip(batch_id, jobs),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="skf_batch_{batch_id}.zip"',
+            "X-Batch-Id": batch_id
+        }
+    )
+
+
+@router.get(
+    "/generators",
+    response_model=List[GeneratorInfo],
+    summary="List CAD Generators",
+    description="Products that can be exported, with their formats and parameter schemas"
+)
+def list_generators():
+    """
+    Describe the CAD generator of every product.
+    
+    - **product_id**: Value of a configuration's product_id
+    - **formats**: Export formats the product supports
+    - **params**: Parameters the generator reads, with defaults and limits
+    """
+    return export_service.get_generators()
+
+
+@router.get(
+    "/cache/stats",
+    response_model=ExportCacheStats,
+    summary="Export Cache Stats",
+    description="Hit/miss counters of the generated-artifact cache"
+)
+def get_export_cache_stats():
+    """
+    Get export cache statistics.
+    
+    - **hits** / **misses**: Lookups since process start
+    - **hit_rate**: hits / (hits + misses)
+    
+    Disk usage and the size budget are in GET /exports/storage/report.
+    """
+    return export_service.get_cache_stats()
+
+
+@router.get(
+    "/storage/report",
+    response_model=ExportStorageReport,
+    summary="Last Storage Sweep",
+    description="Report of the most recent retention/orphan sweep of the exports directory"
+)
+def get_storage_report():
+    """
+    Get the most recent storage sweep report.
+    
+    - **bytes_reclaimed**: Bytes freed by the sweep
+    - **orphans_removed** / **expired_removed** / **evicted_removed**: Files removed per reason
+    """
+    report = export_service.get_last_storage_report()
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No storage sweep has run yet"
+        )
+    return report
+
+
+@router.post(
+    "/storage/sweep",
+    response_model=ExportStorageReport,
+    summary="Sweep Storage",
+    description="Apply the retention policy and remove orphaned export files now"
+)
+def sweep_storage():
+    """
+    Run a storage sweep immediately.
+    
+    Expired or evicted files mark their exports as `expired`.
+    """
+    try:
+        return export_service.sweep_storage()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to sweep storage: {str(e)}"
+        )
+
+
 @router.get(
     "/{export_id}",
     response_model=ExportResponse,
     summary="Get Export",
     description="Retrieve a specific export by ID"
 )
-def get_export(
+async def get_export(
     export_id: int,
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Get a specific export by ID.
     
     - **export_id**: The ID of the export to retrieve
     """
-    export = export_service.get_export(db=db, export_id=export_id)
+    export = await run_db(db, export_service.get_export, export_id=export_id)
     if not export:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -69,34 +269,52 @@ def get_export(
     summary="List Exports by Configuration",
     description="Retrieve all exports for a specific configuration"
 )
-def list_exports_by_configuration(
+async def list_exports_by_configuration(
     configuration_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    db: AnySession = Depends(get_session)
 ):
     """
-    Get all exports for a specific configuration.
+    Get all exports for a specific configuration, oldest first.
     
     - **configuration_id**: ID of the configuration
-    - **skip**: Number of items to skip (for pagination)
+    - **skip**: Number of items to skip (offset pagination)
     - **limit**: Number of items to return (max 100)
+    - **cursor**: Opaque cursor from the previous page's X-Next-Cursor header
+      (keyset pagination, takes precedence over skip)
+    - **status**: Only return exports with this status
     """
     if limit > 100:
         limit = 100
     
     try:
-        return export_service.get_exports_by_config(
-            db=db,
+        exports, next_cursor = await run_db(
+            db,
+            export_service.get_exports_page,
             configuration_id=configuration_id,
+            limit=limit,
+            cursor=cursor,
             skip=skip,
-            limit=limit
+            status=status_filter
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve exports: {str(e)}"
         )
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return exports
 
 
 @router.patch(
@@ -105,22 +323,23 @@ def list_exports_by_configuration(
     summary="Update Export",
     description="Update export status and details (used by C# service)"
 )
-def update_export(
+async def update_export(
     export_id: int,
     export_update: ExportUpdate,
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Update export status and details.
     
     - **export_id**: The ID of the export to update
-    - **status**: New status (pending, processing, completed, failed)
+    - **status**: New status (pending, processing, completed, failed, expired)
     - **file_path**: Path to generated file (when completed)
     - **job_id**: External job tracking ID (for C# service)
     - **error_message**: Error details (if failed)
     """
-    export = export_service.update_export_status(
-        db=db,
+    export = await run_db(
+        db,
+        export_service.update_export_status,
         export_id=export_id,
         export_update=export_update
     )
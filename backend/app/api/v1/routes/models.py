@@ -0,0 +1,153 @@
+"""
+Model API Routes - Parametric 3D models (GLB)
+Path: app/api/v1/routes/models.py
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from starlette.concurrency import run_in_threadpool
+
+from app.api.downloads import REVALIDATE_CACHE_CONTROL, serve_artifact
+from app.db.session import AnySession, get_session, run_db
+from app.schemas.export import ExportCacheStats
+from app.schemas.model import CatalogModelStretchInfo, LinearGuideModelParams
+from app.services import model_service
+
+router = APIRouter()
+
+GLB_RESPONSE = {200: {"content": {"model/gltf-binary": {}}, "description": "Binary glTF model"}}
+
+
+@router.get(
+    "/linear-guide",
+    responses=GLB_RESPONSE,
+    summary="Linear Guide Model",
+    description="Generate (or fetch from cache) a parametric GLB of a linear guide"
+)
+async def get_linear_guide_model(
+    request: Request,
+    params: LinearGuideModelParams = Depends()
+):
+    """
+    Get a parametric linear guide model.
+    
+    - **W** / **LS**: Rail width and length (mm)
+    - **NOB**: Number of carriages
+    - **H**, **H1**, **L1**, **B**: Overall height, rail height, carriage length and width
+    - **F** / **G**: Mounting-hole pitch and first-hole distance from the rail end
+    """
+    geometry_params = params.model_dump(exclude={"NOB"}, exclude_none=True)
+    try:
+        path = await run_in_threadpool(
+            model_service.get_linear_guide_model,
+            geometry_params,
+            {'NOB': params.NOB}
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return serve_artifact(path, request, filename="linear_guide.glb", cache_control=REVALIDATE_CACHE_CONTROL)
+
+
+@router.get(
+    "/configuration/{config_id}",
+    responses=GLB_RESPONSE,
+    summary="Configuration Model",
+    description="Generate (or fetch from cache) the GLB of a stored configuration"
+)
+async def get_configuration_model(
+    config_id: int,
+    request: Request,
+    db: AnySession = Depends(get_session)
+):
+    """
+    Get the 3D model of a configuration.
+    
+    - **config_id**: ID of the configuration
+    """
+    try:
+        path = await run_db(db, model_service.get_configuration_model, config_id=config_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Configuration with ID {config_id} not found"
+        )
+    return serve_artifact(path, request, filename=f"skf_config_{config_id}.glb", cache_control=REVALIDATE_CACHE_CONTROL)
+
+
+@router.get(
+    "/catalog/{model_name}",
+    responses=GLB_RESPONSE,
+    summary="Stretched Catalog Model",
+    description="Resize a catalog GLB to a length, keeping ends and hole features undistorted"
+)
+async def get_stretched_catalog_model(
+    model_name: str,
+    request: Request,
+    length: float = Query(..., gt=0, description="Target length along the model's long axis (mm)")
+):
+    """
+    Get a catalog model stretched to a length.
+    
+    - **model_name**: Catalog file name without .glb (e.g. SSELBWN14-110)
+    - **length**: Target length; only the plain zones between features elongate.
+      Rounded to MODEL_STRETCH_STEP_MM and capped at MODEL_STRETCH_MAX_LENGTH_MM (400 above it)
+    """
+    try:
+        path = await run_in_threadpool(model_service.get_stretched_model, model_name, length)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Catalog model {model_name} not found"
+        )
+    return serve_artifact(path, request, filename=f"{model_name}_{model_service.quantize_stretch_length(length):g}.glb", cache_control=REVALIDATE_CACHE_CONTROL)
+
+
+@router.get(
+    "/catalog/{model_name}/zones",
+    response_model=CatalogModelStretchInfo,
+    summary="Catalog Model Stretch Zones",
+    description="Rigid and stretchable zones of a catalog model along its long axis"
+)
+async def get_catalog_model_zones(model_name: str):
+    """
+    Get the stretch zones of a catalog model.
+    
+    - **model_name**: Catalog file name without .glb
+    """
+    try:
+        info = await run_in_threadpool(model_service.get_stretch_info, model_name)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Catalog model {model_name} not found"
+        )
+    return info
+
+
+@router.get(
+    "/cache/stats",
+    response_model=ExportCacheStats,
+    summary="Model Cache Statistics",
+    description="Hit/miss counters of the generated-model cache"
+)
+def get_model_cache_stats():
+    """
+    Get model cache hit/miss statistics for this worker process.
+    """
+    return model_service.get_model_cache_stats()
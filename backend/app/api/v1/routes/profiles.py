@@ -0,0 +1,100 @@
+"""
+Profile API Routes - Download stored request profiles (admin)
+Path: app/api/v1/routes/profiles.py
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.profiling import profile_store
+from app.core.security import require_admin
+from app.schemas.profile import ProfileInfo
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/",
+    response_model=List[ProfileInfo],
+    summary="List Request Profiles",
+    description="Stored profiles of requests run under the profiler, newest first"
+)
+async def list_profiles():
+    """
+    List stored request profiles.
+    
+    Requests are profiled when PROFILING_ENABLED is on and they carry the
+    PROFILING_HEADER or are picked by PROFILING_SAMPLE_RATE. Retention is
+    bounded by PROFILES_MAX_COUNT and PROFILES_MAX_AGE_SECONDS.
+    """
+    return await run_in_threadpool(profile_store.list)
+
+
+@router.get(
+    "/{request_id}",
+    responses={200: {"content": {"text/plain": {}}, "description": "Collapsed stacks"}},
+    summary="Download Request Profile",
+    description="Collapsed stacks of one profiled request (flamegraph.pl / speedscope input)"
+)
+async def download_profile(request_id: str):
+    """
+    Download the profile of one request as collapsed stacks.
+    
+    - **request_id**: X-Request-ID returned by the profiled request
+    
+    Each line is `thread;outermost frame;...;innermost frame samples`.
+    """
+    meta = await run_in_threadpool(_get_meta, request_id)
+    return FileResponse(
+        profile_store.stacks_path(meta["request_id"]),
+        media_type="text/plain; charset=utf-8",
+        filename=f"{meta['request_id']}.collapsed"
+    )
+
+
+@router.get(
+    "/{request_id}/info",
+    response_model=ProfileInfo,
+    summary="Get Request Profile Info",
+    description="Metadata of one profiled request"
+)
+async def get_profile_info(request_id: str):
+    """
+    Get the metadata of one profiled request.
+    
+    - **request_id**: X-Request-ID returned by the profiled request
+    """
+    return await run_in_threadpool(_get_meta, request_id)
+
+
+@router.delete(
+    "/{request_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete Request Profile",
+    description="Remove a stored profile"
+)
+async def delete_profile(request_id: str):
+    """
+    Delete a stored profile.
+    
+    - **request_id**: X-Request-ID returned by the profiled request
+    """
+    await run_in_threadpool(_get_meta, request_id)
+    await run_in_threadpool(profile_store.delete, request_id)
+    return None
+
+
+def _get_meta(request_id: str) -> dict:
+    """Profile metadata, or 404 for unknown or malformed IDs."""
+    try:
+        meta = profile_store.get(request_id)
+    except ValueError:
+        meta = None
+    if meta is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {request_id} not found"
+        )
+    return meta
@@ -1,12 +1,24 @@
 """
 CAD Engine - DXF Generation Module
 Generates 2D DXF drawings from configuration parameters.
+
+ezdxf takes a third of a second to import, so it is only loaded when the
+first drawing is built; importing this module (and the app) stays cheap.
 """
-import ezdxf
-from ezdxf import enums
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional
 import os
+import pickle
+import threading
+
+from app.core import geometry as geometry_module
+from app.core.config import settings
+from app.core.metrics import cad_phase
+from app.core.geometry import DEFAULT_DETAIL, DetailLevel, GeometryModel, geometry_cache, get_detail_level
+from app.utils.streaming import iter_text_writer
+
+if TYPE_CHECKING:
+    from ezdxf.document import Drawing
 
 
 class DXFGenerator:
@@ -14,14 +26,14 @@ class DXFGenerator:
     Generates DXF files for SKF Linear Guide configurations.
     """
     
-    # Default export directory (relative to backend root)
-    EXPORT_DIR = Path(__file__).parent.parent.parent / "exports"
+    # Export directory (EXPORTS_DIR; relative paths are resolved against the backend root)
+    EXPORT_DIR = Path(__file__).parent.parent.parent / settings.EXPORTS_DIR
     
     # Drawing constants
-    LAYER_RAIL = "RAIL"
-    LAYER_BLOCKS = "BLOCKS"
-    LAYER_DIMENSIONS = "DIMENSIONS"
-    LAYER_CENTERLINES = "CENTERLINES"
+    LAYER_RAIL = geometry_module.LAYER_RAIL
+    LAYER_BLOCKS = geometry_module.LAYER_BLOCKS
+    LAYER_DIMENSIONS = geometry_module.LAYER_DIMENSIONS
+    LAYER_CENTERLINES = geometry_module.LAYER_CENTERLINES
     
     # Colors (AutoCAD Color Index)
     COLOR_RAIL = 5       # Blue
@@ -29,15 +41,52 @@ class DXFGenerator:
     COLOR_DIMENSIONS = 7 # White/Black
     COLOR_CENTERLINES = 3 # Green
     
-    def __init__(self):
-        """Initialize the generator and ensure export directory exists."""
-        self.EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    # Bump whenever the drawing code changes so cached artifacts are invalidated
+    DRAWING_REVISION = 1
     
-    def generate_linear_guide(
+    def __init__(self, use_prototype: bool = True):
+        """
+        Initialize the generator.
+        
+        Nothing is touched on disk; files are written with their parent
+        directories created on demand (the app creates EXPORT_DIR on startup).
+        
+        Args:
+            use_prototype: Derive documents from a pre-configured prototype
+                instead of building each one with ezdxf.new()
+        """
+        self.use_prototype = use_prototype
+        self._prototype: Optional[bytes] = None  # pickled base document
+    
+    def drawing_inputs(
         self,
         config_id: int,
         geometry_params: Dict[str, Any],
         application_params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Normalize the parameters that actually shape a Linear Guide drawing.
+        
+        Two configurations with equal drawing inputs produce identical DXF files,
+        so this dict is what artifact caches are keyed on.
+        
+        Args:
+            config_id: The configuration ID (used for the default part number)
+            geometry_params: Dict containing W (width), LS (length), etc.
+            application_params: Dict containing NOB (num blocks), PN (part number), etc.
+            
+        Returns:
+            Dict: Normalized W, LS, NOB and PN values
+        """
+        return geometry_module.linear_guide_drawing_inputs(config_id, geometry_params, application_params)
+    
+    def generate_linear_guide(
+        self,
+        config_id: int,
+        geometry_params: Dict[str, Any],
+        application_params: Optional[Dict[str, Any]] = None,
+        filename: Optional[str] = None,
+        detail: str = DEFAULT_DETAIL
     ) -> str:
         """
         Generate a DXF file for a Linear Guide configuration.
@@ -46,92 +95,235 @@ class DXFGenerator:
             config_id: The configuration ID (used in filename)
             geometry_params: Dict containing W (width), LS (length), etc.
             application_params: Dict containing NOB (num blocks), PN (part number), etc.
+            filename: Optional path relative to EXPORT_DIR (default: skf_config_{id}.dxf)
+            detail: Detail level (see app/core/geometry.py DETAIL_LEVELS)
             
         Returns:
             str: The relative file path to the generated DXF file
         """
-        # Extract parameters with defaults
-        rail_width = float(geometry_params.get('W', 20))  # mm
-        rail_length = float(geometry_params.get('LS', 500))  # mm
-        num_blocks = int((application_params or {}).get('NOB', 2))
-        part_number = (application_params or {}).get('PN', f'SKF-{config_id}')
+        doc = self.build_linear_guide(config_id, geometry_params, application_params, detail)
         
-        # Block dimensions (proportional to rail width)
-        block_width = rail_width * 1.5  # Blocks are wider than rail
-        block_length = rail_width * 2   # Blocks are longer than wide
+        # Save file (write to a temp file first so concurrent writers of the
+        # same path never expose a half-written drawing)
+        filename = filename or f"skf_config_{config_id}.dxf"
+        filepath = self.EXPORT_DIR / filename
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = filepath.with_name(
+            f".{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with cad_phase("save"):
+            doc.saveas(tmp_path)
+        os.replace(tmp_path, filepath)
         
-        # Create DXF document
-        doc = ezdxf.new('R2010')  # AutoCAD 2010 format for compatibility
-        msp = doc.modelspace()
+        # Return relative path for URL
+        return f"/downloads/{filename}"
+    
+    def stream_linear_guide(
+        self,
+        config_id: int,
+        geometry_params: Dict[str, Any],
+        application_params: Optional[Dict[str, Any]] = None,
+        detail: str = DEFAULT_DETAIL
+    ) -> Iterator[bytes]:
+        """
+        Generate a Linear Guide drawing and stream its DXF bytes as they are serialised.
         
-        # Setup layers
-        self._setup_layers(doc)
+        The drawing is built before returning, so geometry errors surface
+        immediately; nothing is written to EXPORT_DIR.
         
-        # Draw rail (centered at origin)
-        rail_start_x = 0
-        rail_start_y = -rail_width / 2
-        self._draw_rectangle(
-            msp, 
-            rail_start_x, rail_start_y,
-            rail_length, rail_width,
-            layer=self.LAYER_RAIL
+        Args:
+            config_id: The configuration ID
+            geometry_params: Dict containing W (width), LS (length), etc.
+            application_params: Dict containing NOB (num blocks), PN (part number), etc.
+            detail: Detail level (see app/core/geometry.py DETAIL_LEVELS)
+            
+        Returns:
+            Iterator[bytes]: Consecutive chunks of the encoded DXF file
+        """
+        doc = self.build_linear_guide(config_id, geometry_params, application_params, detail)
+        return iter_text_writer(
+            doc.write,
+            encoding=doc.output_encoding,
+            errors='dxfreplace'
         )
+    
+    def build_linear_guide(
+        self,
+        config_id: int,
+        geometry_params: Dict[str, Any],
+        application_params: Optional[Dict[str, Any]] = None,
+        detail: str = DEFAULT_DETAIL
+    ) -> "Drawing":
+        """
+        Build the in-memory DXF document for a Linear Guide configuration.
         
-        # Draw blocks evenly spaced along the rail
-        if num_blocks > 0:
-            # Calculate spacing
-            total_block_space = num_blocks * block_length
-            remaining_space = rail_length - total_block_space
-            spacing = remaining_space / (num_blocks + 1)
+        Args:
+            config_id: The configuration ID (used for the default part number)
+            geometry_params: Dict containing W (width), LS (length), etc.
+            application_params: Dict containing NOB (num blocks), PN (part number), etc.
+            detail: Detail level (see app/core/geometry.py DETAIL_LEVELS)
             
-            for i in range(num_blocks):
-                block_x = spacing + i * (block_length + spacing)
-                block_y = -block_width / 2
-                self._draw_rectangle(
-                    msp,
-                    block_x, block_y,
-                    block_length, block_width,
-                    layer=self.LAYER_BLOCKS
-                )
-        
-        # Draw centerline
-        msp.add_line(
-            (-rail_length * 0.1, 0),
-            (rail_length * 1.1, 0),
-            dxfattribs={'layer': self.LAYER_CENTERLINES, 'linetype': 'CENTER'}
-        )
+        Returns:
+            Drawing: The complete, unsaved document
+        """
+        geometry = geometry_cache.get_linear_guide(config_id, geometry_params, application_params)
+        return self.render(geometry, detail)
+    
+    def render(self, geometry: GeometryModel, detail: str = DEFAULT_DETAIL) -> "Drawing":
+        """
+        Draw a format-agnostic geometry model into a new DXF document.
         
-        # Add dimensions
-        self._add_dimensions(msp, rail_length, rail_width, block_length, block_width, num_blocks)
+        Rendering dimensions (anonymous blocks with their graphics) is the
+        most expensive step; the "preview" level draws them as plain lines
+        and a text instead.
         
-        # Add title block / text
-        msp.add_text(
-            f"Part: {part_number}",
-            dxfattribs={
-                'layer': self.LAYER_DIMENSIONS,
-                'height': rail_width * 0.3,
-                'style': 'Standard'
-            }
-        ).set_placement((0, -rail_width * 2))
+        Args:
+            geometry: Model from app/core/geometry.py
+            detail: Detail level (see app/core/geometry.py DETAIL_LEVELS)
+            
+        Returns:
+            Drawing: The complete, unsaved document
+            
+        Raises:
+            ValueError: If the detail level doesn't exist or the hole parameters are inconsistent
+        """
+        level = get_detail_level(detail)
+        
+        # Create DXF document (layers and linetypes already set up)
+        with cad_phase("document"):
+            doc = self._new_document()
+        msp = doc.modelspace()
+        
+        # Other products draw on layers the prototype doesn't have
+        with cad_phase("layers"):
+            for name, color in geometry.layers.items():
+                if name not in doc.layers:
+                    doc.layers.add(name, color=color)
+        
+        # Emission order (outlines, lines, dimensions, texts) is part of the
+        # output; changing it requires a DRAWING_REVISION bump
+        with cad_phase("entities"):
+            self._add_entities(msp, geometry, level)
+            if level.holes:
+                self._add_holes(msp, geometry, level)
         
+        with cad_phase("dimensions"):
+            for dimension in geometry.dimensions:
+                if not level.render_dimensions:
+                    self._add_plain_dimension(msp, dimension)
+                    continue
+                msp.add_linear_dim(
+                    base=dimension.base,
+                    p1=dimension.p1,
+                    p2=dimension.p2,
+                    angle=dimension.angle,
+                    dimstyle='Standard',
+                    override={'dimtxt': dimension.text_height}
+                ).render()
+        
+        if level.texts:
+            with cad_phase("texts"):
+                self._add_texts(msp, geometry)
+        
+        return doc
+    
+    def _add_plain_dimension(self, msp, dimension) -> None:
+        """Draw a dimension as extension lines, dimension line and measurement text (no DIMENSION entity)."""
+        import numpy as np
+        from ezdxf.enums import TextEntityAlignment  # ezdxf is loaded by now
+        
+        direction = dimension.direction
+        base = np.asarray(dimension.base, dtype=np.float64)
+        q1 = base + direction * np.dot(np.subtract(dimension.p1, base), direction)
+        q2 = base + direction * np.dot(np.subtract(dimension.p2, base), direction)
+        attribs = {'layer': dimension.layer}
+        for start, end in ((dimension.p1, q1), (dimension.p2, q2), (q1, q2)):
+            msp.add_line(tuple(start), tuple(end), dxfattribs=attribs)
+        normal = np.array([-direction[1], direction[0]])
+        insert = (q1 + q2) / 2 + normal * dimension.text_height * 0.5
         msp.add_text(
-            f"L={rail_length}mm  W={rail_width}mm  Blocks={num_blocks}",
+            f"{dimension.measurement:g}",
             dxfattribs={
-                'layer': self.LAYER_DIMENSIONS,
-                'height': rail_width * 0.2,
+                'layer': dimension.layer,
+                'height': dimension.text_height,
+                'rotation': dimension.angle,
                 'style': 'Standard'
             }
-        ).set_placement((0, -rail_width * 2.5))
+        ).set_placement(tuple(insert), align=TextEntityAlignment.BOTTOM_CENTER)
+    
+    def _add_holes(self, msp, geometry: GeometryModel, level: DetailLevel) -> None:
+        """Add the hole detail: through-hole and counterbore circles, centre marks."""
+        for hole in geometry.holes:
+            msp.add_circle(hole.center, hole.diameter / 2, dxfattribs={'layer': hole.layer})
+            if hole.counterbore_diameter:
+                msp.add_circle(hole.center, hole.counterbore_diameter / 2, dxfattribs={'layer': hole.layer})
+            if level.centerlines:
+                x, y = hole.center
+                mark = max(hole.diameter, hole.counterbore_diameter or 0) * 0.6
+                attribs = {'layer': self.LAYER_CENTERLINES}
+                msp.add_line((x - mark, y), (x + mark, y), dxfattribs=attribs)
+                msp.add_line((x, y - mark), (x, y + mark), dxfattribs=attribs)
+    
+    def _add_entities(self, msp, geometry: GeometryModel, level: DetailLevel) -> None:
+        """Add the outlines and lines of a geometry model to the modelspace."""
+        for polyline in geometry.polylines:
+            points = [tuple(point) for point in polyline.points.tolist()]
+            if polyline.closed:
+                points.append(points[0])  # Close the outline explicitly
+            msp.add_lwpolyline(points, dxfattribs={'layer': polyline.layer})
         
-        # Save file
-        filename = f"skf_config_{config_id}.dxf"
-        filepath = self.EXPORT_DIR / filename
-        doc.saveas(filepath)
+        for line in geometry.lines:
+            if line.layer == self.LAYER_CENTERLINES and not level.centerlines:
+                continue
+            attribs = {'layer': line.layer}
+            if line.linetype:
+                attribs['linetype'] = line.linetype
+            msp.add_line(line.start, line.end, dxfattribs=attribs)
+    
+    def _add_texts(self, msp, geometry: GeometryModel) -> None:
+        """Add the labels of a geometry model (part number, summary) to the modelspace."""
+        for text in geometry.texts:
+            msp.add_text(
+                text.text,
+                dxfattribs={
+                    'layer': text.layer,
+                    'height': text.height,
+                    'style': 'Standard'
+                }
+            ).set_placement(text.insert)
+    
+    def _new_document(self) -> "Drawing":
+        """
+        Create a fully configured, empty drawing.
         
-        # Return relative path for URL
-        return f"/downloads/{filename}"
+        The base document is built once per process and kept pickled;
+        unpickling a copy is several times cheaper than ezdxf.new() plus
+        layer/linetype setup, and every export gets an independent document.
+        """
+        if not self.use_prototype:
+            return self._build_base_document()
+        
+        if self._prototype is None:
+            self._prototype = pickle.dumps(
+                self._build_base_document(),
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+        
+        doc = pickle.loads(self._prototype)
+        # Each export is a distinct drawing for CAD software
+        doc.reset_fingerprint_guid()
+        doc.reset_version_guid()
+        return doc
     
-    def _setup_layers(self, doc: ezdxf.document.Drawing) -> None:
+    def _build_base_document(self) -> "Drawing":
+        """Build an empty drawing with all static setup applied."""
+        import ezdxf  # deferred, see module docstring
+        
+        doc = ezdxf.new('R2010')  # AutoCAD 2010 format for compatibility
+        self._setup_layers(doc)
+        return doc
+    
+    def _setup_layers(self, doc: "Drawing") -> None:
         """Create layers with appropriate colors and linetypes."""
         doc.layers.add(self.LAYER_RAIL, color=self.COLOR_RAIL)
         doc.layers.add(self.LAYER_BLOCKS, color=self.COLOR_BLOCKS)
@@ -141,56 +333,6 @@ class DXFGenerator:
         # Add CENTER linetype if not present
         if 'CENTER' not in doc.linetypes:
             doc.linetypes.add('CENTER', pattern='A,1.25,-.25,.25,-.25')
-    
-    def _draw_rectangle(
-        self,
-        msp,
-        x: float,
-        y: float,
-        width: float,
-        height: float,
-        layer: str
-    ) -> None:
-        """Draw a rectangle using a closed polyline."""
-        points = [
-            (x, y),
-            (x + width, y),
-            (x + width, y + height),
-            (x, y + height),
-            (x, y)  # Close the rectangle
-        ]
-        msp.add_lwpolyline(points, dxfattribs={'layer': layer})
-    
-    def _add_dimensions(
-        self,
-        msp,
-        rail_length: float,
-        rail_width: float,
-        block_length: float,
-        block_width: float,
-        num_blocks: int
-    ) -> None:
-        """Add dimension annotations to the drawing."""
-        dim_offset = rail_width * 0.8
-        
-        # Rail length dimension (below)
-        msp.add_linear_dim(
-            base=(rail_length / 2, -rail_width / 2 - dim_offset),
-            p1=(0, -rail_width / 2),
-            p2=(rail_length, -rail_width / 2),
-            dimstyle='Standard',
-            override={'dimtxt': rail_width * 0.15}
-        ).render()
-        
-        # Rail width dimension (left side)
-        msp.add_linear_dim(
-            base=(-dim_offset, 0),
-            p1=(0, -rail_width / 2),
-            p2=(0, rail_width / 2),
-            angle=90,
-            dimstyle='Standard',
-            override={'dimtxt': rail_width * 0.15}
-        ).render()
 
 
 # Singleton instance for easy import
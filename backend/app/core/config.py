@@ -1,15 +1,103 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
+# Relative directory settings resolve against the backend root, not the working directory
+BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "SKF CAD Configurator API"
     VERSION: str = "1.0.0"
 
 
     DATABASE_URL: str = "sqlite:///./skf_configurator.db"
+    # async path: routes await an AsyncSession (requires e.g. aiosqlite)
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str = ""  # default: DATABASE_URL with the async driver
+    # create missing tables/columns/indexes and the exports directory when the
+    # app starts (disable when a deploy step owns the schema, or for fast workers)
+    INIT_ON_STARTUP: bool = True
+    # re-queue exports abandoned by a crashed process when the app starts
+    # (one DB round-trip; skipped if the schema doesn't exist yet)
+    RECOVER_EXPORTS_ON_STARTUP: bool = True
+
+    # connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+
+    # SQLite connection tuning (applied on connect)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB, i.e. 64 MB
     BACKEND_CORS_ORIGINS: list = ["http://localhost:5173"]
 
-    MODELS_DIR: Path = Path("public/models")
+    # catalog GLBs (optimizer input, stretch endpoint); the frontend serves the same files statically
+    MODELS_DIR: Path = Path("../frontend/public")
+    # stretch lengths are rounded to this step (one cached GLB per step) and capped
+    MODEL_STRETCH_STEP_MM: float = 1.0
+    MODEL_STRETCH_MAX_LENGTH_MM: float = 6000.0
     EXPORTS_DIR: Path = Path("exports")
 
+    # content-addressed cache for generated CAD artifacts
+    EXPORT_CACHE_ENABLED: bool = True
+    # write .gz (and .br, if brotli is installed) next to generated files
+    EXPORT_PRECOMPRESS: bool = True
+
+    # process pool for export jobs (0 = run inline in the request)
+    EXPORT_WORKERS: int = 2
+    EXPORT_WORKER_MAX_TASKS: int = 50
+    EXPORT_BATCH_MAX_ITEMS: int = 500
+    # unfinished exports untouched for this long are presumed abandoned by a
+    # dead process and re-queued at startup; shorter leases re-run slow jobs
+    EXPORT_RECOVERY_LEASE_SECONDS: int = 900
+    # in-memory geometry models shared by the export writers (per process)
+    GEOMETRY_CACHE_SIZE: int = 256
+    # queue regeneration of affected artifacts when a configuration is PATCHed
+    EXPORT_REGENERATE_ON_UPDATE: bool = False
+
+    # serialised GET /configurations/{id} responses (see app/core/response_cache.py)
+    CONFIG_CACHE_SIZE: int = 1024  # 0 = disabled
+    CONFIG_CACHE_TTL_SECONDS: float = 0  # 0 = entries live until invalidated
+    CONFIG_CACHE_INVALIDATION_BUS: str = ""  # "" = this process only, "redis" or "module:Class"
+    CONFIG_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # retention of files under the exports directory (see app/core/storage.py)
+    EXPORT_STORAGE_MAX_BYTES: int = 1024 * 1024 * 1024
+    EXPORT_RETENTION_DAYS: int = 30  # 0 = no age limit
+    EXPORT_ORPHAN_GRACE_SECONDS: int = 3600
+    EXPORT_SWEEP_INTERVAL_SECONDS: int = 600  # 0 = no background sweeper
+
+    # bulk NDJSON configuration import
+    IMPORT_TRANSACTION_SIZE: int = 1000  # rows validated and committed together
+    IMPORT_MAX_TRANSACTION_SIZE: int = 10000
+    IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # /metrics: request, CAD phase, SQL and cache instrumentation
+    METRICS_ENABLED: bool = True
+
+    # opt-in request profiling (see app/core/profiling.py)
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"  # value must equal ADMIN_TOKEN when one is set
+    PROFILING_SAMPLE_RATE: float = 0.0  # share of requests profiled without the header
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILES_DIR: Path = Path("profiles")  # relative paths resolve against the backend root
+    PROFILES_MAX_COUNT: int = 200
+    PROFILES_MAX_AGE_SECONDS: int = 7 * 24 * 3600  # 0 = no age limit
+
+    # X-Admin-Token required by admin routes (empty = admin routes are open)
+    ADMIN_TOKEN: str = ""
+
+    # rule engine batch validation
+    VALIDATION_BATCH_MAX_ITEMS: int = 10000
+
+    @property
+    def models_path(self) -> Path:
+        """MODELS_DIR resolved against the backend root."""
+        return BACKEND_DIR / self.MODELS_DIR
+
 settings = Settings()
\ No newline at end of file
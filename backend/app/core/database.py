@@ -1,15 +1,60 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
+from .metrics import instrument_engine
 
-# 1. CREATE ENGINE
-# connect_args only needed for sqlite (allows multiple threads)
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
+IS_SQLITE = make_url(settings.DATABASE_URL).get_backend_name() == "sqlite"
+IS_SQLITE_MEMORY = IS_SQLITE and make_url(settings.DATABASE_URL).database in (None, "", ":memory:")
+
+
+def _engine_kwargs() -> dict:
+    """Pool and driver options shared by the sync and async engines."""
+    kwargs = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if IS_SQLITE:
+        # connect_args only needed for sqlite (allows multiple threads)
+        kwargs["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    if not IS_SQLITE_MEMORY:
+        # in-memory SQLite uses a single shared connection, so no pool sizing
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return kwargs
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Tune every new SQLite connection for concurrent web traffic.
+    
+    - WAL lets readers proceed while a writer commits
+    - synchronous=NORMAL is durable under WAL and avoids an fsync per commit
+    - busy_timeout makes writers wait for the lock instead of failing with
+      "database is locked"
+    - mmap_size serves reads from the page cache without read() copies
+    """
+    cursor = dbapi_connection.cursor()
+    if not IS_SQLITE_MEMORY:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.close()
 
-)
+
+# 1. CREATE ENGINE
+engine = create_engine(settings.DATABASE_URL, **_engine_kwargs())
+if IS_SQLITE:
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+instrument_engine(engine)
 
 # 2. CREATE SESSION FACTORY
 # autocommit=False means you control when to save
@@ -23,3 +68,91 @@ SessionLocal = sessionmaker(
 # 3. CREATE BASE CLASS
 # all your models will inherit from this
 Base = declarative_base()
+
+
+def ensure_indexes(bind=None) -> None:
+    """
+    Create indexes declared on the models that are missing from the database.
+    
+    create_all() only creates indexes together with new tables, so indexes
+    added to existing tables would otherwise never reach older databases.
+    """
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def ensure_columns(bind=None) -> None:
+    """
+    Add nullable columns declared on the models that are missing from the database.
+    
+    Like indexes, create_all() never alters existing tables; new optional
+    columns are added with ALTER TABLE so older databases keep working.
+    """
+    bind = bind or engine
+    existing_tables = set(inspect(bind).get_table_names())
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=connection.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+
+# 4. ASYNC ENGINE (optional, see DB_ASYNC)
+# created on first use so the async driver (e.g. aiosqlite) is only
+# required when the async path is enabled
+_async_engine = None
+_async_session_factory = None
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def get_async_database_url() -> str:
+    """ASYNC_DATABASE_URL, or DATABASE_URL with the matching async driver."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """Return the shared AsyncEngine, creating it on first use."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        
+        kwargs = _engine_kwargs()
+        if not IS_SQLITE_MEMORY:
+            # aiosqlite defaults to NullPool; pool connections like the sync engine
+            kwargs["poolclass"] = AsyncAdaptedQueuePool
+        _async_engine = create_async_engine(get_async_database_url(), **kwargs)
+        if IS_SQLITE:
+            event.listen(_async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        instrument_engine(_async_engine.sync_engine)
+    return _async_engine
+
+
+def AsyncSessionLocal():
+    """Create an AsyncSession bound to the shared async engine."""
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        
+        # expire_on_commit=False: attributes stay loaded after commit, so
+        # response serialisation never triggers lazy IO outside the event loop
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return _async_session_factory()
@@ -0,0 +1,122 @@
+"""
+Export Cache - Content-addressed store for generated CAD artifacts
+Path: app/core/export_cache.py
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.metrics import record_cache_lookup
+from app.core.storage import ExportStorage, export_storage, shard_relative
+
+
+def compute_cache_key(inputs: Dict[str, Any]) -> str:
+    """
+    Hash drawing inputs into a stable cache key.
+    
+    Args:
+        inputs: Normalized parameters that shape the artifact
+        
+    Returns:
+        str: Hex SHA-256 digest of the canonical JSON encoding
+    """
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ExportCache:
+    """
+    Content-addressed artifact cache.
+    
+    Artifacts live under EXPORT_DIR/<subdir>/ab/cd/<key><suffix> so they can
+    be served through the /downloads route. The file system is the index,
+    which keeps the cache consistent across worker processes; size and age
+    limits are enforced by the ExportStorage sweeper.
+    """
+    
+    def __init__(
+        self,
+        storage: ExportStorage,
+        subdir: str = "cache",
+        suffix: str = ".dxf",
+        referenced_by_exports: bool = True,
+        name: str = "export"
+    ):
+        """
+        Initialize the cache inside a storage root.
+        
+        Args:
+            storage: Storage the artifacts live in
+            subdir: Directory under the storage root
+            suffix: File suffix of the artifacts
+            referenced_by_exports: False for caches served by key rather than
+                through Export rows, so the sweeper doesn't treat them as orphans
+            name: Label of the cache in /metrics
+        """
+        self.storage = storage
+        self.name = name
+        self.subdir = subdir
+        self.suffix = suffix
+        self.cache_dir = storage.root_dir / subdir
+        if not referenced_by_exports:
+            storage.register_unreferenced_dir(self.cache_dir)
+        
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def relative_name(self, key: str, suffix: Optional[str] = None) -> str:
+        """Path of the artifact relative to the export root (suffix defaults to the cache's)."""
+        name = key + (self.suffix if suffix is None else suffix)
+        return f"{self.subdir}/{shard_relative(name, key)}"
+    
+    def path_for(self, key: str, suffix: Optional[str] = None) -> Path:
+        """Absolute path of the artifact for a key."""
+        return self.storage.root_dir / self.relative_name(key, suffix)
+    
+    def url_for(self, key: str, suffix: Optional[str] = None) -> str:
+        """Download URL of the artifact for a key."""
+        return f"/downloads/{self.relative_name(key, suffix)}"
+    
+    def get(self, key: str, suffix: Optional[str] = None) -> Optional[str]:
+        """
+        Look up an artifact and record a hit or miss.
+        
+        Args:
+            key: Cache key from compute_cache_key
+            suffix: File suffix, for caches holding several formats
+            
+        Returns:
+            str: Download URL of the cached artifact, or None on a miss
+        """
+        path = self.path_for(key, suffix)
+        hit = path.exists()
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        record_cache_lookup(self.name, hit)
+        
+        if not hit:
+            return None
+        # Reuse counts as use for LRU retention
+        self.storage.record_access(path)
+        return self.url_for(key, suffix)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Singleton instances for easy import
+export_cache = ExportCache(storage=export_storage)
+model_cache = ExportCache(storage=export_storage, subdir="models", suffix=".glb", referenced_by_exports=False, name="model")
@@ -0,0 +1,82 @@
+"""
+Generator Registry - CAD generators per product family, loaded on first use
+Path: app/core/generators/__init__.py
+
+Product IDs match the frontend schema registry (frontend/src/constants/schemas.js).
+Each entry names the generator class as "module:Class"; the module is only
+imported (and the generator instantiated) when a configuration of that
+product is first exported, so startup doesn't pay for unused families.
+"""
+import importlib
+import threading
+from typing import Any, Dict, List
+
+# Configurations without a product_id predate the registry and are linear guides
+DEFAULT_PRODUCT_ID = "LINEAR_GUIDE"
+
+GENERATORS = {
+    "LINEAR_GUIDE": "app.core.generators.linear_guide:LinearGuideGenerator",
+    "HEX_BOLT": "app.core.generators.bolts:HexBoltGenerator",
+    "ALLEN_BOLT": "app.core.generators.bolts:AllenBoltGenerator",
+    "M8_BOLT": "app.core.generators.bolts:M8BoltGenerator",
+    "HYDRAULIC": "app.core.generators.hydraulic:HydraulicUnitGenerator",
+}
+
+
+def normalize_product_id(product_id: str) -> str:
+    """Canonical product ID ("hex_bolt" -> "HEX_BOLT")."""
+    return product_id.strip().upper()
+
+
+class GeneratorRegistry:
+    """Maps product IDs to lazily created generator instances."""
+
+    def __init__(self, targets: Dict[str, str]):
+        self._targets = dict(targets)
+        self._generators: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def product_ids(self) -> List[str]:
+        return list(self._targets)
+
+    def register(self, product_id: str, target: str) -> None:
+        """Add or replace a product's generator ("module:Class"), e.g. from a plugin."""
+        product_id = normalize_product_id(product_id)
+        with self._lock:
+            self._targets[product_id] = target
+            self._generators.pop(product_id, None)
+
+    def get(self, product_id: str):
+        """
+        Generator of a product, imported and instantiated on first use.
+
+        Raises:
+            ValueError: If no generator is registered for the product
+        """
+        product_id = normalize_product_id(product_id or DEFAULT_PRODUCT_ID)
+        generator = self._generators.get(product_id)
+        if generator is not None:
+            return generator
+
+        with self._lock:
+            if product_id not in self._generators:
+                target = self._targets.get(product_id)
+                if target is None:
+                    raise ValueError(
+                        f"Unknown product {product_id!r}; available: {', '.join(self._targets)}"
+                    )
+                module_name, class_name = target.split(":")
+                self._generators[product_id] = getattr(importlib.import_module(module_name), class_name)()
+            return self._generators[product_id]
+
+    def for_config(self, config: Any):
+        """Generator of a configuration (ORM row or schema)."""
+        return self.get(getattr(config, "product_id", None) or DEFAULT_PRODUCT_ID)
+
+    def loaded(self) -> List[str]:
+        """Product IDs whose generator has been created in this process."""
+        return list(self._generators)
+
+
+# Singleton instance for easy import
+generator_registry = GeneratorRegistry(GENERATORS)
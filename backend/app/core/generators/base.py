@@ -0,0 +1,266 @@
+"""
+Generator Base - Parameter schema and contract of a product's CAD generator
+Path: app/core/generators/base.py
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.core.export_cache import compute_cache_key
+from app.core.geometry import DEFAULT_DETAIL, GeometryModel, geometry_cache, get_detail_level
+from app.core.writers import WRITERS, FormatWriter
+from app.domain.validation import configuration_params
+
+
+class ParamSpec:
+    """
+    One parameter a generator reads.
+
+    Attributes:
+        key: Parameter name in the flattened configuration (configuration_params)
+        type: "number" or "string"
+        default: Used when the parameter is missing (None: no default)
+        required: Whether a value (or default) must be present
+        minimum / maximum: Inclusive bounds for numbers
+        options: Allowed values for strings
+    """
+
+    def __init__(
+        self,
+        key: str,
+        type: str = "number",
+        default: Any = None,
+        required: bool = False,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None,
+        options: Optional[Sequence[Any]] = None,
+        unit: Optional[str] = None,
+        description: str = ""
+    ):
+        self.key = key
+        self.type = type
+        self.default = default
+        self.required = required
+        self.minimum = minimum
+        self.maximum = maximum
+        self.options = list(options) if options is not None else None
+        self.unit = unit
+        self.description = description
+
+    def coerce(self, value: Any) -> Any:
+        """
+        Normalize one value (defaults applied).
+
+        Raises:
+            ValueError: If the value is missing, malformed or out of range
+        """
+        if value in (None, ""):
+            value = self.default
+        if value is None:
+            if self.required:
+                raise ValueError(f"{self.key} is required")
+            return None
+
+        if self.type == "number":
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{self.key} must be a number")
+            if self.minimum is not None and value < self.minimum:
+                raise ValueError(f"{self.key} must be at least {self.minimum:g}")
+            if self.maximum is not None and value > self.maximum:
+                raise ValueError(f"{self.key} must be at most {self.maximum:g}")
+        else:
+            value = str(value)
+        if self.options is not None and value not in self.options:
+            raise ValueError(f"{self.key} must be one of: {', '.join(map(str, self.options))}")
+        return value
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-ready description for the API."""
+        return {
+            "key": self.key,
+            "type": self.type,
+            "default": self.default,
+            "required": self.required,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "options": self.options,
+            "unit": self.unit,
+            "description": self.description,
+        }
+
+
+class CADGenerator:
+    """
+    Builds the geometry of one product family from its configurations.
+
+    Subclasses declare their parameters, supported formats and revision and
+    implement build(); inputs, caching and fingerprints are shared.
+
+    Attributes:
+        product_id: Registry key (matches the frontend SCHEMAS keys)
+        name: Display name
+        params: Parameters the generator reads (the only ones that shape its files)
+        formats: Export formats it can produce (keys of app.core.writers.WRITERS)
+        revision: Bump whenever the geometry changes so cached files are invalidated
+        has_model: Whether /models/configuration serves a GLB for the product
+    """
+
+    product_id = ""
+    name = ""
+    params: List[ParamSpec] = []
+    formats: Sequence[str] = ("DXF", "DXF_BINARY", "SVG", "STL")
+    revision = 1
+    has_model = False
+
+    @property
+    def param_keys(self) -> List[str]:
+        return [spec.key for spec in self.params]
+
+    def supports(self, export_format: str) -> bool:
+        return export_format in self.formats
+
+    def writer(self, export_format: str) -> FormatWriter:
+        """
+        Writer for one of the generator's formats.
+
+        Raises:
+            ValueError: If the product cannot be exported in that format
+        """
+        writer = WRITERS.get(export_format)
+        if writer is None or not self.supports(writer.format):
+            raise ValueError(
+                f"{self.name} cannot be exported as {export_format}; supported: {', '.join(self.formats)}"
+            )
+        return writer
+
+    def inputs(self, config: Any) -> Dict[str, Any]:
+        """
+        Normalized inputs of a configuration (ORM row or schema).
+
+        Raises:
+            ValueError: Listing every missing or invalid parameter
+        """
+        params = self.source_params(config)
+        inputs, errors = {}, []
+        for spec in self.params:
+            try:
+                inputs[spec.key] = spec.coerce(params.get(spec.key))
+            except ValueError as e:
+                errors.append(str(e))
+        if errors:
+            raise ValueError("; ".join(errors))
+        return inputs
+
+    def validate(self, config: Any, require_complete: bool = False) -> List[Dict[str, Any]]:
+        """
+        Violations of the parameter schema, in the rule engine's format.
+
+        Drafts are only checked for malformed values; complete configurations
+        must also provide every required parameter.
+        """
+        params = configuration_params(config)
+        violations = []
+        for spec in self.params:
+            value = params.get(spec.key)
+            if value in (None, "") and not require_complete:
+                continue
+            try:
+                spec.coerce(value)
+            except ValueError as e:
+                violations.append({"rule": f"{self.product_id.lower()}_{spec.key}", "fields": [spec.key], "message": str(e)})
+        return violations
+
+    def source_params(self, config: Any) -> Dict[str, Any]:
+        """Flat parameters the generator reads, taken from where its geometry builder takes them."""
+        return configuration_params(config)
+
+    def artifact_params(self, config: Any) -> Dict[str, Any]:
+        """
+        Parameter values as they shape the generated files, for fingerprints and change detection.
+
+        Values go through their ParamSpec, so "500", 500 and 500.0 (or a missing
+        value and its default) are the same input. Integral numbers are kept as
+        ints, so fingerprints of already-canonical values don't change. Values
+        that fail validation are kept as given.
+        """
+        params = self.source_params(config)
+        normalized = {}
+        for spec in self.params:
+            value = params.get(spec.key)
+            try:
+                value = spec.coerce(value)
+            except ValueError:
+                pass  # reported when the file is generated
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            normalized[spec.key] = value
+        return normalized
+
+    def build(self, inputs: Dict[str, Any]) -> GeometryModel:
+        """Build the geometry for normalized inputs."""
+        raise NotImplementedError
+
+    def geometry(self, config: Any) -> GeometryModel:
+        """
+        Geometry of a configuration, shared through the in-memory geometry cache.
+
+        Raises:
+            ValueError: If the parameters are invalid
+        """
+        inputs = self.inputs(config)
+        key = json.dumps({"generator": self.product_id, "revision": self.revision, **inputs}, sort_keys=True)
+        return geometry_cache.get_or_build(key, lambda: self.build(inputs))
+
+    def cache_key(self, config: Any, writer: FormatWriter, detail: str = DEFAULT_DETAIL) -> str:
+        """Content hash of everything that shapes a configuration's file in one format (and detail level)."""
+        inputs = {
+            "artifact": f"{self.product_id.lower()}_{writer.format.lower()}",
+            "revision": self.revision,
+            "writer_revision": writer.revision,
+            **self.inputs(config),
+        }
+        level = get_detail_level(detail)
+        if writer.uses_detail and level.name != DEFAULT_DETAIL:
+            inputs["detail"] = level.name
+        return compute_cache_key(inputs)
+
+    def fingerprint(self, config: Any, artifact: Any, detail: str = DEFAULT_DETAIL) -> str:
+        """
+        Hash of the parameter values an artifact of this product was made from.
+
+        Every parameter is hashed, so the detail level (which only selects
+        what is drawn of them) doesn't change it.
+        """
+        params = self.artifact_params(config)
+        return compute_cache_key({
+            "artifact": artifact.name,
+            "product": self.product_id,
+            "revision": self.revision,
+            **{key: params.get(key) for key in self.param_keys},
+        })
+
+    def produces(self, artifact: Any) -> bool:
+        """Whether the product has files of an artifact type."""
+        return any(self.supports(f) for f in artifact.formats)
+
+    def depends_on(self, artifact: Any) -> List[str]:
+        """Parameters an artifact of this product reads."""
+        return self.param_keys
+
+    def affected_artifacts(self, changed: Sequence[str], artifacts: Sequence[Any]) -> List[Any]:
+        """Artifacts (of the given candidates) that a parameter change invalidates."""
+        if set(changed).isdisjoint(self.param_keys):
+            return []
+        return [a for a in artifacts if self.produces(a)]
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-ready description for the API."""
+        return {
+            "product_id": self.product_id,
+            "name": self.name,
+            "formats": list(self.formats),
+            "revision": self.revision,
+            "has_model": self.has_model,
+            "params": [spec.describe() for spec in self.params],
+        }
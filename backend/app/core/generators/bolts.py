@@ -0,0 +1,302 @@
+"""
+Bolt Generators - Hex, Allen (socket head cap) and M8 bolts
+Path: app/core/generators/bolts.py
+
+All bolts share one drawing: a side view with the axis along +X, the head
+left of the bearing face at X=0 and the thread at the far end. The 3D solid
+stands on the bearing face (Y up): head above Y=0, shank below.
+Threads are drawn as minor-diameter lines, not modelled.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.generators.base import CADGenerator, ParamSpec
+from app.core.geometry import (
+    LAYER_CENTERLINES,
+    LAYER_DIMENSIONS,
+    LAYER_OUTLINE,
+    LAYER_THREAD,
+    PART_LAYERS,
+    GeometryModel,
+    Line,
+    LinearDimension,
+    Polyline,
+    Solid,
+    Text,
+)
+from app.core.mesh_engine import merge_meshes, prism, regular_polygon
+
+# Facets of round heads and shanks in the 3D solid
+ROUND_SEGMENTS = 32
+
+# Metric thread: minor diameter = d - MINOR_DIAMETER_FACTOR * P
+MINOR_DIAMETER_FACTOR = 1.22687
+
+# ISO 261 coarse pitches
+COARSE_PITCH = {3: 0.5, 4: 0.7, 5: 0.8, 6: 1.0, 8: 1.25, 10: 1.5, 12: 1.75, 16: 2.0, 20: 2.5}
+
+# ISO 4762 socket head cap screws: thread size -> (head diameter dk, head height k)
+SOCKET_HEAD = {3: (5.5, 3), 4: (7, 4), 5: (8.5, 5), 6: (10, 6), 8: (13, 8), 10: (16, 10), 12: (18, 12), 16: (24, 16), 20: (30, 20)}
+
+
+def thread_diameter(thread_size: str) -> float:
+    """Nominal diameter of a metric thread designation ("M10" or "M10x1.5" -> 10)."""
+    match = re.match(r"\s*M\s*([0-9.]+)", str(thread_size), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Unrecognised thread size {thread_size!r}")
+    return float(match.group(1))
+
+
+def thread_pitch(designation: Optional[str]) -> Optional[float]:
+    """Pitch of a "MxP" designation ("M10×1.5" -> 1.5), None if it names none."""
+    match = re.search(r"[x×*]\s*([0-9.]+)", str(designation or ""))
+    return float(match.group(1)) if match else None
+
+
+def build_bolt_geometry(
+    inputs: Dict[str, Any],
+    diameter: float,
+    length: float,
+    thread_length: float,
+    pitch: float,
+    head_width: float,
+    head_height: float,
+    hex_head: bool,
+    title: List[str],
+    flange_diameter: float = 0.0,
+    flange_height: float = 0.0,
+) -> GeometryModel:
+    """
+    Build the geometry of a bolt.
+
+    Args:
+        inputs: Normalized inputs (stored on the model)
+        diameter: Nominal thread diameter d
+        length: Nominal length L (bearing face to tip)
+        thread_length: Thread length b, measured from the tip
+        pitch: Thread pitch P
+        head_width: Width across flats s (hex) or head diameter dk (round)
+        head_height: Head height k, flange excluded
+        hex_head: Hexagon head; otherwise round (socket head)
+        title: Lines of the title block
+        flange_diameter / flange_height: Optional washer face under the head
+
+    Returns:
+        GeometryModel: The complete geometry
+
+    Raises:
+        ValueError: If the dimensions are inconsistent
+    """
+    minor = diameter - MINOR_DIAMETER_FACTOR * pitch
+    if min(diameter, length, pitch, head_width, head_height) <= 0 or minor <= 0:
+        raise ValueError("Bolt dimensions must be positive")
+    if not 0 < thread_length <= length:
+        raise ValueError("Thread length must be positive and not exceed the bolt length")
+    if head_width <= diameter:
+        raise ValueError("Head must be wider than the thread diameter")
+
+    # Seen across a flat, a hexagon shows its corner-to-corner width
+    head_span = head_width / np.cos(np.pi / 6) if hex_head else head_width
+    head_start = -flange_height - head_height
+    chamfer = (diameter - minor) / 2
+
+    geometry = GeometryModel(
+        inputs,
+        build_solids=lambda: [Solid("bolt", _bolt_mesh(
+            diameter, length, head_span / 2, head_height, hex_head, flange_diameter, flange_height
+        ))],
+        layers=PART_LAYERS
+    )
+
+    # Head (a hexagon shows three faces) and optional flange
+    geometry.polylines.append(_rectangle(head_start, -head_span / 2, head_height, head_span))
+    if hex_head:
+        for y in (-head_span / 4, head_span / 4):
+            geometry.lines.append(Line((head_start, y), (-flange_height, y), layer=LAYER_OUTLINE))
+    if flange_height > 0:
+        geometry.polylines.append(_rectangle(-flange_height, -flange_diameter / 2, flange_height, flange_diameter))
+
+    # Shank with a chamfered tip
+    r, tip = diameter / 2, minor / 2
+    geometry.polylines.append(Polyline(
+        [(0, r), (length - chamfer, r), (length, tip), (length, -tip), (length - chamfer, -r), (0, -r)],
+        layer=LAYER_OUTLINE, closed=True
+    ))
+
+    # Thread: minor-diameter lines and the thread end
+    thread_start = length - thread_length
+    for y in (-tip, tip):
+        geometry.lines.append(Line((thread_start, y), (length, y), layer=LAYER_THREAD))
+    geometry.lines.append(Line((thread_start, -r), (thread_start, r), layer=LAYER_OUTLINE))
+
+    # Axis
+    overshoot = diameter * 0.5
+    geometry.lines.append(Line(
+        (head_start - overshoot, 0), (length + overshoot, 0),
+        layer=LAYER_CENTERLINES, linetype='CENTER'
+    ))
+
+    # Length and thread length (below/above), diameters (right/left), head height (above)
+    text_height = max(diameter * 0.25, 1.0)
+    offset = diameter * 0.8
+    geometry.dimensions.append(LinearDimension(
+        base=(length / 2, -head_span / 2 - offset), p1=(0, -r), p2=(length, -tip),
+        text_height=text_height
+    ))
+    geometry.dimensions.append(LinearDimension(
+        base=(length - thread_length / 2, r + offset), p1=(thread_start, r), p2=(length, tip),
+        text_height=text_height
+    ))
+    geometry.dimensions.append(LinearDimension(
+        base=(length + offset, 0), p1=(length - chamfer, -r), p2=(length - chamfer, r),
+        angle=90, text_height=text_height
+    ))
+    geometry.dimensions.append(LinearDimension(
+        base=(head_start - offset, 0), p1=(head_start, -head_span / 2), p2=(head_start, head_span / 2),
+        angle=90, text_height=text_height
+    ))
+    geometry.dimensions.append(LinearDimension(
+        base=(head_start + head_height / 2, head_span / 2 + offset),
+        p1=(head_start, head_span / 2), p2=(-flange_height, head_span / 2),
+        text_height=text_height
+    ))
+
+    # Title block
+    line_height = text_height * 1.6
+    top = -head_span / 2 - offset - line_height * 2
+    for i, text in enumerate(title):
+        geometry.texts.append(Text(
+            text, (head_start, top - i * line_height * 1.5),
+            line_height if i == 0 else text_height, LAYER_DIMENSIONS
+        ))
+    return geometry
+
+
+def _rectangle(x: float, y: float, width: float, height: float) -> Polyline:
+    return Polyline(
+        [(x, y), (x + width, y), (x + width, y + height), (x, y + height)],
+        layer=LAYER_OUTLINE, closed=True
+    )
+
+
+def _bolt_mesh(
+    diameter: float,
+    length: float,
+    head_radius: float,
+    head_height: float,
+    hex_head: bool,
+    flange_diameter: float,
+    flange_height: float
+):
+    """Head, flange and shank as one mesh, bearing face at Y=0."""
+    if hex_head:
+        head_outline = regular_polygon(head_radius, 6)
+    else:
+        head_outline = regular_polygon(head_radius, ROUND_SEGMENTS)
+    parts = [
+        prism(regular_polygon(diameter / 2, ROUND_SEGMENTS), -length, 0.0),
+        prism(head_outline, flange_height, flange_height + head_height),
+    ]
+    if flange_height > 0:
+        parts.append(prism(regular_polygon(flange_diameter / 2, ROUND_SEGMENTS), 0.0, flange_height))
+    return merge_meshes(parts)
+
+
+class HexBoltGenerator(CADGenerator):
+    """Structural hex bolt, ISO 4014 (partial thread) or ISO 4017 (full thread)."""
+
+    product_id = "HEX_BOLT"
+    name = "Structural Hex Bolt"
+    params = [
+        ParamSpec("PN", type="string", description="Part number"),
+        ParamSpec("THREAD_SIZE", type="string", default="M16", options=["M16"]),
+        ParamSpec("STANDARD", type="string", default="ISO 4014", options=["ISO 4014", "ISO 4017"]),
+        ParamSpec("L", required=True, minimum=10, maximum=300, unit="mm", description="Bolt length"),
+        ParamSpec("S", default=24, minimum=24, maximum=24, unit="mm", description="Width across flats"),
+        ParamSpec("K", default=10, minimum=10, maximum=10, unit="mm", description="Head height"),
+        ParamSpec("P", default=2.0, options=[2.0, 1.5], unit="mm", description="Thread pitch"),
+        ParamSpec("LT", minimum=10, unit="mm", description="Thread length (default per standard)"),
+        ParamSpec("THREAD_TYPE", type="string", default="coarse", options=["coarse", "fine"]),
+    ]
+
+    def build(self, inputs: Dict[str, Any]) -> GeometryModel:
+        diameter = thread_diameter(inputs["THREAD_SIZE"])
+        length = inputs["L"]
+        thread_length = inputs["LT"]
+        if thread_length is None:
+            # ISO 4017 is threaded to the head; ISO 4014 uses b = 2d + 6 (L <= 125)
+            full = inputs["STANDARD"] == "ISO 4017"
+            thread_length = length if full else min(2 * diameter + 6, length)
+        return build_bolt_geometry(
+            inputs, diameter, length, thread_length, inputs["P"], inputs["S"], inputs["K"], hex_head=True,
+            title=[
+                f"Part: {inputs['PN'] or 'HEX BOLT'}",
+                f"{inputs['STANDARD']}  {inputs['THREAD_SIZE']}x{inputs['P']:g}x{length:g}  {inputs['THREAD_TYPE']}",
+            ]
+        )
+
+
+class AllenBoltGenerator(CADGenerator):
+    """Socket head cap screw (ISO 4762 / DIN 912); head dimensions default to the standard."""
+
+    product_id = "ALLEN_BOLT"
+    name = "M10 Allen Bolt"
+    params = [
+        ParamSpec("PN", type="string", description="Part number"),
+        ParamSpec("MODEL", type="string", default="DIN 912"),
+        ParamSpec("MAT", type="string"),
+        ParamSpec("VAR02", type="string", default="M10", options=[f"M{d}" for d in SOCKET_HEAD], description="Thread size"),
+        ParamSpec("VAR04", required=True, minimum=5, maximum=200, unit="mm", description="Length"),
+        ParamSpec("FIX02", type="string", description="Thread M x P (default: coarse pitch)"),
+        ParamSpec("FIX04", minimum=0, unit="mm", description="Head diameter"),
+        ParamSpec("FIX06", minimum=0, unit="mm", description="Head height"),
+        ParamSpec("FIX08", minimum=0, unit="mm", description="Thread length (default 2d + 12)"),
+    ]
+
+    def build(self, inputs: Dict[str, Any]) -> GeometryModel:
+        size = int(thread_diameter(inputs["VAR02"]))
+        head_diameter, head_height = SOCKET_HEAD[size]
+        length = inputs["VAR04"]
+        pitch = thread_pitch(inputs["FIX02"]) or COARSE_PITCH[size]
+        thread_length = inputs["FIX08"] or min(2 * size + 12, length)
+        return build_bolt_geometry(
+            inputs, size, length, thread_length, pitch,
+            inputs["FIX04"] or head_diameter, inputs["FIX06"] or head_height, hex_head=False,
+            title=[
+                f"Part: {inputs['PN'] or 'ALLEN BOLT'}",
+                f"{inputs['MODEL']}  {inputs['VAR02']}x{length:g}  {inputs['MAT'] or ''}".rstrip(),
+            ]
+        )
+
+
+class M8BoltGenerator(CADGenerator):
+    """M8 hex bolt with optional washer face; the head follows ISO 4017 proportions (s = 1.625 d, k = 0.6625 d)."""
+
+    product_id = "M8_BOLT"
+    name = "M8x16 Bolt"
+    params = [
+        ParamSpec("PN", type="string", description="Part number"),
+        ParamSpec("ARTNR", type="string", description="Article number"),
+        ParamSpec("GUETE", type="string", description="Property class"),
+        ParamSpec("D", default=8, minimum=1, unit="mm", description="Nominal thread diameter"),
+        ParamSpec("P", default=1.25, minimum=0.1, unit="mm", description="Pitch"),
+        ParamSpec("L", default=16, minimum=1, unit="mm", description="Nominal length"),
+        ParamSpec("B", minimum=0, unit="mm", description="Thread length (default: full thread)"),
+        ParamSpec("C", default=0, minimum=0, unit="mm", description="Washer/flange height"),
+    ]
+
+    def build(self, inputs: Dict[str, Any]) -> GeometryModel:
+        diameter, length = inputs["D"], inputs["L"]
+        head_width = 1.625 * diameter
+        return build_bolt_geometry(
+            inputs, diameter, length, inputs["B"] or length, inputs["P"], head_width, 0.6625 * diameter,
+            hex_head=True,
+            title=[
+                f"Part: {inputs['PN'] or inputs['ARTNR'] or 'M8 BOLT'}",
+                f"M{diameter:g}x{inputs['P']:g}x{length:g}  {inputs['GUETE'] or ''}".rstrip(),
+            ],
+            flange_diameter=head_width / np.cos(np.pi / 6),
+            flange_height=inputs["C"]
+        )
@@ -0,0 +1,113 @@
+"""
+Hydraulic Unit Generator - Layout schematic of a pump station
+Path: app/core/generators/hydraulic.py
+
+The configurator only captures ratings for this product (volumes, pump,
+motor, electrics), not a geometry, so the drawing is a schematic: the
+reservoir and expansion tank are sized from their volumes, pump and motor
+are symbols, and the ratings are listed as text. There is no 3D model.
+"""
+from typing import Any, Dict
+
+from app.core.generators.base import CADGenerator, ParamSpec
+from app.core.geometry import LAYER_DIMENSIONS, LAYER_OUTLINE, GeometryModel, LinearDimension, Line, Polyline, Text
+
+LAYER_PIPES = "PIPES"
+HYDRAULIC_LAYERS = {
+    LAYER_OUTLINE: 5,     # Blue
+    LAYER_PIPES: 3,       # Green
+    LAYER_DIMENSIONS: 7,  # White/Black
+}
+
+# Reservoir drawn as a box with this width-to-height ratio, 400 mm wide at 150 l
+RESERVOIR_ASPECT = 0.6
+RESERVOIR_REFERENCE = (150.0, 400.0)
+
+
+def _box(x: float, y: float, width: float, height: float) -> Polyline:
+    return Polyline(
+        [(x, y), (x + width, y), (x + width, y + height), (x, y + height)],
+        layer=LAYER_OUTLINE, closed=True
+    )
+
+
+class HydraulicUnitGenerator(CADGenerator):
+    """Hydraulic pump station (schematic drawing only)."""
+
+    product_id = "HYDRAULIC"
+    name = "Hydraulic Component"
+    formats = ("DXF", "DXF_BINARY", "SVG")
+    params = [
+        ParamSpec("PN", type="string", description="Part number"),
+        ParamSpec("ARTICLE_NAME", type="string"),
+        ParamSpec("IDNR", type="string"),
+        ParamSpec("RESERVOIR_VOLUME", default=150, minimum=100, maximum=500, unit="l"),
+        ParamSpec("PUMP_TYPE", type="string", default="Medana CH1-LSP",
+                  options=["Medana CH1-LSP", "Medana CH1-LCV", "Helix V"]),
+        ParamSpec("EXPANSION_TANK", default=8, minimum=0, unit="l"),
+        ParamSpec("MOTOR_CLASS", type="string", default="IE2", options=["IE2", "IE3", "IE4"]),
+        ParamSpec("CONTROL_UNIT", type="string", default="EC-Rain Easy Control"),
+        ParamSpec("SENSOR_RANGE", type="string", default="0 - 5 m"),
+        ParamSpec("VOLTAGE", default=230, minimum=0, unit="V"),
+        ParamSpec("SPEED", default=2900, minimum=0, unit="rpm"),
+    ]
+
+    def build(self, inputs: Dict[str, Any]) -> GeometryModel:
+        geometry = GeometryModel(inputs, layers=HYDRAULIC_LAYERS)
+
+        # Volumes scale with the cube of the drawn size
+        reference_volume, reference_width = RESERVOIR_REFERENCE
+        width = reference_width * (inputs["RESERVOIR_VOLUME"] / reference_volume) ** (1 / 3)
+        height = width * RESERVOIR_ASPECT
+        geometry.polylines.append(_box(0, 0, width, height))
+
+        # Pump and motor sit on the reservoir lid, the expansion tank beside it
+        unit = width * 0.2
+        pump_x = width * 0.15
+        motor_x = pump_x + unit * 1.2
+        geometry.polylines.append(_box(pump_x, height, unit, unit))
+        geometry.polylines.append(_box(motor_x, height, unit * 1.5, unit))
+        tank_size = unit * max(inputs["EXPANSION_TANK"] / 8, 0.05) ** (1 / 3)
+        tank_x = width + unit
+        if inputs["EXPANSION_TANK"] > 0:
+            geometry.polylines.append(_box(tank_x, height, tank_size, tank_size))
+
+        # Suction line into the reservoir, pressure line to the tank
+        pump_center = pump_x + unit / 2
+        geometry.lines.append(Line((pump_center, height), (pump_center, height * 0.2), layer=LAYER_PIPES))
+        pressure_y = height + unit * 1.5
+        geometry.lines.append(Line((pump_center, height + unit), (pump_center, pressure_y), layer=LAYER_PIPES))
+        geometry.lines.append(Line((pump_center, pressure_y), (tank_x + tank_size / 2, pressure_y), layer=LAYER_PIPES))
+        if inputs["EXPANSION_TANK"] > 0:
+            geometry.lines.append(Line(
+                (tank_x + tank_size / 2, pressure_y), (tank_x + tank_size / 2, height + tank_size), layer=LAYER_PIPES
+            ))
+
+        text_height = width * 0.03
+        geometry.dimensions.append(LinearDimension(
+            base=(width / 2, -width * 0.1), p1=(0, 0), p2=(width, 0), text_height=text_height
+        ))
+        labels = [
+            ((width * 0.05, height * 0.5), f"Reservoir {inputs['RESERVOIR_VOLUME']:g} l"),
+            ((pump_x, height + unit * 0.4), "P"),
+            ((motor_x + unit * 0.1, height + unit * 0.4), f"M {inputs['MOTOR_CLASS']}"),
+        ]
+        if inputs["EXPANSION_TANK"] > 0:
+            labels.append(((tank_x, height + tank_size + text_height), f"{inputs['EXPANSION_TANK']:g} l"))
+        for insert, text in labels:
+            geometry.texts.append(Text(text, insert, text_height, LAYER_DIMENSIONS))
+
+        # Ratings block
+        rows = [
+            f"Part: {inputs['PN'] or inputs['ARTICLE_NAME'] or 'HYDRAULIC UNIT'}",
+            f"Pump: {inputs['PUMP_TYPE']}",
+            f"Motor: {inputs['MOTOR_CLASS']}  {inputs['VOLTAGE']:g} V  {inputs['SPEED']:g} rpm",
+            f"Control: {inputs['CONTROL_UNIT']}  Sensor: {inputs['SENSOR_RANGE']}",
+        ]
+        if inputs["IDNR"]:
+            rows.append(f"ID: {inputs['IDNR']}")
+        for i, text in enumerate(rows):
+            geometry.texts.append(Text(
+                text, (0, -width * 0.25 - i * text_height * 2), text_height * (1.5 if i == 0 else 1), LAYER_DIMENSIONS
+            ))
+        return geometry
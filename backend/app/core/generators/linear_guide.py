@@ -0,0 +1,111 @@
+"""
+Linear Guide Generator - Rail with carriages (plan drawing and 3D solids)
+Path: app/core/generators/linear_guide.py
+"""
+from typing import Any, Dict, List, Sequence
+
+from app.core.export_cache import compute_cache_key
+from app.core.generators.base import CADGenerator, ParamSpec
+from app.core.geometry import (
+    DEFAULT_DETAIL,
+    GeometryModel,
+    build_linear_guide_geometry,
+    geometry_cache,
+    get_detail_level,
+    linear_guide_drawing_inputs,
+    linear_guide_solid_inputs,
+)
+from app.core.writers import FormatWriter
+from app.domain.artifacts import affected_artifacts
+from app.domain.validation import configuration_params, rule_engine
+
+
+class LinearGuideGenerator(CADGenerator):
+    """
+    SKF linear guide. Kept compatible with files generated before the
+    registry existed: same cache keys, fingerprints and validation rules.
+    """
+
+    product_id = "LINEAR_GUIDE"
+    name = "Linear Guide System"
+    has_model = True
+    params = [
+        ParamSpec("W", default=20, minimum=0, unit="mm", description="Rail width"),
+        ParamSpec("LS", default=500, minimum=0, unit="mm", description="Rail length"),
+        ParamSpec("NOB", default=2, minimum=1, maximum=10, description="Number of blocks"),
+        ParamSpec("PN", type="string", description="Part number (default SKF-<id>)"),
+        ParamSpec("H", minimum=0, unit="mm", description="Total height"),
+        ParamSpec("H1", minimum=0, unit="mm", description="Rail height"),
+        ParamSpec("L1", minimum=0, unit="mm", description="Block length"),
+        ParamSpec("B", minimum=0, unit="mm", description="Block width"),
+        ParamSpec("F", minimum=0, unit="mm", description="Mounting hole pitch"),
+        ParamSpec("G", minimum=0, unit="mm", description="End distance of the first hole"),
+        ParamSpec("DD1DD2HH", type="string", description="Hole d1 x d2 x h"),
+    ]
+
+    @staticmethod
+    def application_params(config: Any) -> Dict[str, Any]:
+        """Application parameters used for CAD generation."""
+        return {
+            'NOB': config.number_of_blocks or 2,
+            'PN': config.part_number or f'SKF-{config.id}',
+            'ST': config.surface_treatment
+        }
+
+    def source_params(self, config: Any) -> Dict[str, Any]:
+        # The drawing and the model read NOB and PN from the configuration's
+        # columns (application_params), never from geometry_params
+        params = dict(config.geometry_params or {})
+        params.update(NOB=config.number_of_blocks or 2, PN=config.part_number or f'SKF-{config.id}')
+        return params
+
+    def inputs(self, config: Any) -> Dict[str, Any]:
+        geometry_params = config.geometry_params or {}
+        inputs = linear_guide_drawing_inputs(config.id, geometry_params, self.application_params(config))
+        inputs['solid'] = linear_guide_solid_inputs(geometry_params)
+        return inputs
+
+    def validate(self, config: Any, require_complete: bool = False) -> List[Dict[str, Any]]:
+        return rule_engine.validate(configuration_params(config), require_complete=require_complete)
+
+    def build(self, inputs: Dict[str, Any]) -> GeometryModel:
+        drawing_inputs = {key: value for key, value in inputs.items() if key != 'solid'}
+        return build_linear_guide_geometry(drawing_inputs, inputs['solid'])
+
+    def geometry(self, config: Any) -> GeometryModel:
+        return geometry_cache.get_linear_guide(
+            config.id,
+            config.geometry_params or {},
+            self.application_params(config)
+        )
+
+    def cache_key(self, config: Any, writer: FormatWriter, detail: str = DEFAULT_DETAIL) -> str:
+        inputs = self.inputs(config)
+        solid_inputs = inputs.pop('solid')
+        if writer.uses_solids:
+            # Meshes carry no text, so the part number doesn't shape them
+            del inputs['PN']
+            inputs['solid'] = solid_inputs
+        level = get_detail_level(detail)
+        if writer.uses_detail and level.name != DEFAULT_DETAIL:
+            inputs['detail'] = level.name
+            if level.holes:
+                inputs['solid'] = solid_inputs  # the holes follow the 3D model's pattern
+        return compute_cache_key({
+            "artifact": f"linear_guide_{writer.format.lower()}",
+            "revision": writer.revision,
+            **inputs
+        })
+
+    def fingerprint(self, config: Any, artifact: Any, detail: str = DEFAULT_DETAIL) -> str:
+        return artifact.fingerprint(self.artifact_params(config), detail)
+
+    def produces(self, artifact: Any) -> bool:
+        return True  # every artifact type was declared for the linear guide
+
+    def depends_on(self, artifact: Any) -> List[str]:
+        return list(artifact.depends_on)
+
+    def affected_artifacts(self, changed: Sequence[str], artifacts: Sequence[Any]) -> List[Any]:
+        affected = affected_artifacts(changed)
+        return [artifact for artifact in artifacts if artifact in affected]
@@ -0,0 +1,467 @@
+"""
+Geometry - Format-agnostic model of a configuration, shared by all export writers
+Path: app/core/geometry.py
+
+A GeometryModel holds the 2D plan drawing (polylines, lines, dimensions,
+texts on named layers) and, built on first use, the 3D solids and the
+hole detail. It is built once per set of inputs and kept in an in-memory
+LRU, so exporting one configuration in several formats costs one build
+plus one cheap serialisation per format (see app/core/writers.py).
+
+Drawing writers take a detail level (DETAIL_LEVELS) that selects which
+parts of the model they draw; the model itself is the same for all levels.
+"""
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.mesh_engine import MeshData, model_generator
+from app.core.metrics import cad_phase, record_cache_lookup
+
+# Layers of the plan drawing and their AutoCAD Color Index
+LAYER_RAIL = "RAIL"
+LAYER_BLOCKS = "BLOCKS"
+LAYER_DIMENSIONS = "DIMENSIONS"
+LAYER_CENTERLINES = "CENTERLINES"
+LAYER_OUTLINE = "OUTLINE"
+LAYER_THREAD = "THREAD"
+LAYERS = {
+    LAYER_RAIL: 5,         # Blue
+    LAYER_BLOCKS: 1,       # Red
+    LAYER_DIMENSIONS: 7,   # White/Black
+    LAYER_CENTERLINES: 3,  # Green
+}
+# Layers of part drawings other than the linear guide (bolts, schematics)
+PART_LAYERS = {
+    LAYER_OUTLINE: 5,      # Blue
+    LAYER_THREAD: 1,       # Red
+    LAYER_DIMENSIONS: 7,   # White/Black
+    LAYER_CENTERLINES: 3,  # Green
+}
+# Linetype patterns (DXF notation: dash, gap as negative, ...)
+LINETYPES = {"CENTER": "A,1.25,-.25,.25,-.25"}
+
+# geometry_params keys the 3D solids read on top of the drawing inputs
+SOLID_PARAMS = ("H", "H1", "L1", "B", "F", "G", "DD1DD2HH")
+
+Point = Tuple[float, float]
+
+
+# 1. PRIMITIVES
+class Polyline:
+    """Open or closed 2D polyline."""
+
+    def __init__(self, points: Sequence[Point], layer: str, closed: bool = False):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.layer = layer
+        self.closed = closed
+
+
+class Line:
+    """2D line segment, optionally with a named linetype."""
+
+    def __init__(self, start: Point, end: Point, layer: str, linetype: Optional[str] = None):
+        self.start = start
+        self.end = end
+        self.layer = layer
+        self.linetype = linetype
+
+
+class LinearDimension:
+    """Linear dimension between p1 and p2, measured along `angle` (degrees), drawn through `base`."""
+
+    def __init__(self, base: Point, p1: Point, p2: Point, text_height: float, angle: float = 0.0, layer: str = "0"):
+        self.base = base
+        self.p1 = p1
+        self.p2 = p2
+        self.text_height = text_height
+        self.angle = angle
+        self.layer = layer
+
+    @property
+    def direction(self) -> np.ndarray:
+        radians = np.radians(self.angle)
+        return np.array([np.cos(radians), np.sin(radians)])
+
+    @property
+    def measurement(self) -> float:
+        return float(abs(np.dot(np.subtract(self.p2, self.p1), self.direction)))
+
+
+class Text:
+    """Single-line text with its insertion point at the baseline start."""
+
+    def __init__(self, text: str, insert: Point, height: float, layer: str):
+        self.text = text
+        self.insert = insert
+        self.height = height
+        self.layer = layer
+
+
+class Hole:
+    """Round hole seen from above: through-hole, optional counterbore, centre mark."""
+
+    def __init__(self, center: Point, diameter: float, layer: str, counterbore_diameter: Optional[float] = None):
+        self.center = center
+        self.diameter = diameter
+        self.layer = layer
+        self.counterbore_diameter = counterbore_diameter
+
+
+class Solid:
+    """3D part: one mesh placed at one or more translations (Y up, mm)."""
+
+    def __init__(self, name: str, mesh: MeshData, translations: Optional[np.ndarray] = None):
+        self.name = name
+        self.mesh = mesh
+        self.translations = translations if translations is not None else np.zeros((1, 3), dtype=np.float32)
+
+    def triangles(self) -> np.ndarray:
+        """(n, 3, 3) float32 corner positions of every instance's triangles."""
+        positions, _, indices = self.mesh
+        corners = positions[indices].reshape(-1, 3, 3)
+        placed = corners[None] + self.translations[:, None, None, :]
+        return placed.reshape(-1, 3, 3).astype(np.float32, copy=False)
+
+
+# 2. DETAIL LEVELS
+class DetailLevel:
+    """
+    What a drawing writer draws of a geometry model.
+
+    Attributes:
+        name: Level identifier used in the API
+        render_dimensions: Draw DXF dimensions as DIMENSION entities with
+            rendered blocks (slow); otherwise as plain lines and a text
+        texts: Draw the title block texts
+        centerlines: Draw lines on the centerline layer (and hole centre marks)
+        holes: Draw the hole detail (reads the hole parameters, e.g. F/G/DD1DD2HH)
+    """
+
+    def __init__(self, name: str, render_dimensions: bool, texts: bool, centerlines: bool, holes: bool):
+        self.name = name
+        self.render_dimensions = render_dimensions
+        self.texts = texts
+        self.centerlines = centerlines
+        self.holes = holes
+
+
+DETAIL_LEVELS: Dict[str, DetailLevel] = {
+    level.name: level
+    for level in (
+        # outlines and measurements only, for thumbnails and bulk exports
+        DetailLevel("preview", render_dimensions=False, texts=False, centerlines=False, holes=False),
+        # the drawing as it has always been generated
+        DetailLevel("standard", render_dimensions=True, texts=True, centerlines=True, holes=False),
+        DetailLevel("full", render_dimensions=True, texts=True, centerlines=True, holes=True),
+    )
+}
+DEFAULT_DETAIL = "standard"
+
+
+def get_detail_level(name: Optional[str]) -> DetailLevel:
+    """
+    Detail level by name (None = DEFAULT_DETAIL).
+
+    Raises:
+        ValueError: If the level doesn't exist
+    """
+    level = DETAIL_LEVELS.get((name or DEFAULT_DETAIL).strip().lower())
+    if level is None:
+        raise ValueError(f"Unknown detail level {name!r}; available: {', '.join(DETAIL_LEVELS)}")
+    return level
+
+
+# 3. MODEL
+class GeometryModel:
+    """
+    Everything a writer needs to serialise one configuration.
+
+    Attributes:
+        inputs: Normalized inputs the model was built from
+        layers: Layer name -> AutoCAD Color Index
+        linetypes: Linetype name -> DXF pattern
+    """
+
+    def __init__(
+        self,
+        inputs: Dict[str, Any],
+        build_solids: Optional[Callable[[], List[Solid]]] = None,
+        layers: Optional[Dict[str, int]] = None,
+        build_holes: Optional[Callable[[], List[Hole]]] = None
+    ):
+        """
+        Args:
+            inputs: Normalized inputs the model is built from
+            build_solids: Returns the 3D parts; None for drawings without a 3D model
+            layers: Layer name -> AutoCAD Color Index (default: linear guide layers)
+            build_holes: Returns the hole detail; None for drawings without holes
+        """
+        self.inputs = inputs
+        self.layers = dict(LAYERS if layers is None else layers)
+        self.linetypes = dict(LINETYPES)
+        self.polylines: List[Polyline] = []
+        self.lines: List[Line] = []
+        self.dimensions: List[LinearDimension] = []
+        self.texts: List[Text] = []
+        self._build_solids = build_solids
+        self._solids: Optional[List[Solid]] = None
+        self._build_holes = build_holes
+        self._holes: Optional[List[Hole]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def has_solids(self) -> bool:
+        return self._build_solids is not None
+
+    @property
+    def solids(self) -> List[Solid]:
+        """
+        3D parts, built on first access (only mesh formats need them).
+
+        Raises:
+            ValueError: If the model has no 3D representation or its dimensions are inconsistent
+        """
+        if self._build_solids is None:
+            raise ValueError("This product has no 3D model")
+        with self._lock:
+            if self._solids is None:
+                self._solids = self._build_solids()
+            return self._solids
+
+    @property
+    def holes(self) -> List[Hole]:
+        """
+        Hole detail, built on first access (only the "full" detail level draws it).
+
+        Raises:
+            ValueError: If the hole parameters are inconsistent
+        """
+        if self._build_holes is None:
+            return []
+        with self._lock:
+            if self._holes is None:
+                self._holes = self._build_holes()
+            return self._holes
+
+    def triangles(self) -> np.ndarray:
+        """(n, 3, 3) float32 corners of all solid triangles in model space."""
+        return np.concatenate([solid.triangles() for solid in self.solids])
+
+    def bounds_2d(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(min, max) of the drawing, with text extents estimated from their height (holes lie inside outlines)."""
+        points = [p.points for p in self.polylines]
+        points += [np.array([line.start, line.end]) for line in self.lines]
+        points += [np.array([d.base, d.p1, d.p2]) for d in self.dimensions]
+        for text in self.texts:
+            x, y = text.insert
+            points.append(np.array([[x, y], [x + 0.6 * text.height * len(text.text), y + text.height]]))
+        stacked = np.concatenate(points) if points else np.zeros((1, 2))
+        return stacked.min(axis=0), stacked.max(axis=0)
+
+
+# 4. LINEAR GUIDE
+def linear_guide_drawing_inputs(
+    config_id: int,
+    geometry_params: Dict[str, Any],
+    application_params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Normalized W, LS, NOB and PN of a Linear Guide drawing (defaults applied)."""
+    application_params = application_params or {}
+    return {
+        'W': float(geometry_params.get('W', 20)),  # mm
+        'LS': float(geometry_params.get('LS', 500)),  # mm
+        'NOB': int(application_params.get('NOB', 2)),
+        'PN': str(application_params.get('PN', f'SKF-{config_id}')),
+    }
+
+
+def linear_guide_solid_inputs(geometry_params: Dict[str, Any]) -> Dict[str, Any]:
+    """The SOLID_PARAMS set in geometry_params (unset ones use the model defaults)."""
+    return {key: geometry_params[key] for key in SOLID_PARAMS if geometry_params.get(key) not in (None, "")}
+
+
+def build_linear_guide_geometry(inputs: Dict[str, Any], solid_inputs: Optional[Dict[str, Any]] = None) -> GeometryModel:
+    """
+    Build the geometry of a Linear Guide.
+
+    The plan view has the rail along +X from the origin, centred on Y=0;
+    the 3D solids use the model convention (rail along Z, centred).
+
+    Args:
+        inputs: Drawing inputs from linear_guide_drawing_inputs
+        solid_inputs: Raw geometry_params the 3D solids read (SOLID_PARAMS)
+
+    Returns:
+        GeometryModel: The complete geometry
+    """
+    model_params = {**(solid_inputs or {}), 'W': inputs['W'], 'LS': inputs['LS']}
+    geometry = GeometryModel(
+        inputs,
+        build_solids=lambda: _linear_guide_solids(model_params, inputs['NOB']),
+        build_holes=lambda: _linear_guide_holes(model_params)
+    )
+    rail_width = inputs['W']
+    rail_length = inputs['LS']
+    num_blocks = inputs['NOB']
+    part_number = inputs['PN']
+
+    # Block dimensions (proportional to rail width)
+    block_width = rail_width * 1.5  # Blocks are wider than rail
+    block_length = rail_width * 2   # Blocks are longer than wide
+
+    # Rail (starts at the origin, centred on the X axis)
+    geometry.polylines.append(_rectangle(0, -rail_width / 2, rail_length, rail_width, LAYER_RAIL))
+
+    # Blocks evenly spaced along the rail
+    if num_blocks > 0:
+        total_block_space = num_blocks * block_length
+        remaining_space = rail_length - total_block_space
+        spacing = remaining_space / (num_blocks + 1)
+        for i in range(num_blocks):
+            block_x = spacing + i * (block_length + spacing)
+            geometry.polylines.append(
+                _rectangle(block_x, -block_width / 2, block_length, block_width, LAYER_BLOCKS)
+            )
+
+    # Centerline
+    geometry.lines.append(Line(
+        (-rail_length * 0.1, 0), (rail_length * 1.1, 0),
+        layer=LAYER_CENTERLINES, linetype='CENTER'
+    ))
+
+    # Rail length (below) and width (left side) dimensions
+    dim_offset = rail_width * 0.8
+    geometry.dimensions.append(LinearDimension(
+        base=(rail_length / 2, -rail_width / 2 - dim_offset),
+        p1=(0, -rail_width / 2),
+        p2=(rail_length, -rail_width / 2),
+        text_height=rail_width * 0.15
+    ))
+    geometry.dimensions.append(LinearDimension(
+        base=(-dim_offset, 0),
+        p1=(0, -rail_width / 2),
+        p2=(0, rail_width / 2),
+        angle=90,
+        text_height=rail_width * 0.15
+    ))
+
+    # Title block
+    geometry.texts.append(Text(f"Part: {part_number}", (0, -rail_width * 2), rail_width * 0.3, LAYER_DIMENSIONS))
+    geometry.texts.append(Text(
+        f"L={rail_length}mm  W={rail_width}mm  Blocks={num_blocks}",
+        (0, -rail_width * 2.5), rail_width * 0.2, LAYER_DIMENSIONS
+    ))
+    return geometry
+
+
+def _linear_guide_solids(geometry_params: Dict[str, Any], num_blocks: int) -> List[Solid]:
+    """Rail and carriages of the 3D model (see LinearGuideModelGenerator)."""
+    inputs = model_generator.model_inputs(geometry_params, {'NOB': num_blocks})
+    return [Solid(name, mesh, translations) for name, mesh, translations in model_generator.solid_parts(inputs)]
+
+
+def _linear_guide_holes(geometry_params: Dict[str, Any]) -> List[Hole]:
+    """Rail mounting holes in the plan view, placed like the 3D model's (pitch F, end distance G)."""
+    # The holes do not depend on the carriages, so drawings whose blocks overfill the rail still get them
+    inputs = model_generator.model_inputs(geometry_params, {'NOB': 0})
+    # DD1DD2HH is "d1 x d2 x h": through-hole, then counterbore diameter
+    diameters = [float(d) for d in re.findall(r"[0-9]+(?:\.[0-9]+)?", str(geometry_params.get('DD1DD2HH') or ""))]
+    counterbore = diameters[1] if len(diameters) > 1 and diameters[1] > inputs['D'] else None
+    return [
+        Hole((float(z) + inputs['LS'] / 2, 0.0), inputs['D'], LAYER_RAIL, counterbore_diameter=counterbore)
+        for z in model_generator.hole_centers(inputs)
+    ]
+
+
+def _rectangle(x: float, y: float, width: float, height: float, layer: str) -> Polyline:
+    """Closed axis-aligned rectangle."""
+    return Polyline(
+        [(x, y), (x + width, y), (x + width, y + height), (x, y + height)],
+        layer=layer, closed=True
+    )
+
+
+# 5. IN-MEMORY CACHE
+class GeometryCache:
+    """Bounded LRU of built GeometryModels, keyed by their canonical JSON inputs."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, GeometryModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_linear_guide(
+        self,
+        config_id: int,
+        geometry_params: Dict[str, Any],
+        application_params: Optional[Dict[str, Any]] = None
+    ) -> GeometryModel:
+        """
+        Geometry of a Linear Guide configuration, built on a miss.
+
+        Args:
+            config_id: The configuration ID (used for the default part number)
+            geometry_params: Dict containing W, LS and the SOLID_PARAMS
+            application_params: Dict containing NOB, PN
+
+        Returns:
+            GeometryModel: Shared instance; writers must not modify it
+        """
+        inputs = linear_guide_drawing_inputs(config_id, geometry_params, application_params)
+        solid_inputs = linear_guide_solid_inputs(geometry_params)
+        key = json.dumps({"geometry": "linear_guide", **inputs, "solid": solid_inputs}, sort_keys=True)
+        return self.get_or_build(key, lambda: build_linear_guide_geometry(inputs, solid_inputs))
+
+    def get_or_build(self, key: str, build: Callable[[], GeometryModel]) -> GeometryModel:
+        """
+        Cached geometry for a canonical key, calling build() on a miss.
+
+        Args:
+            key: Canonical encoding of everything the geometry depends on
+            build: Builds the model (exceptions propagate and nothing is cached)
+
+        Returns:
+            GeometryModel: Shared instance; writers must not modify it
+        """
+        with self._lock:
+            geometry = self._entries.get(key)
+            if geometry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        record_cache_lookup("geometry", geometry is not None)
+        if geometry is not None:
+            return geometry
+
+        with cad_phase("geometry"):
+            geometry = build()
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = geometry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return geometry
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached models."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+# Singleton instance for easy import
+geometry_cache = GeometryCache(max_entries=settings.GEOMETRY_CACHE_SIZE)
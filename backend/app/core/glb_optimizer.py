@@ -0,0 +1,389 @@
+"""
+GLB Optimizer - Welding, quantisation, pruning and LODs for catalog models
+Path: app/core/glb_optimizer.py
+
+Each LOD is written as its own GLB (<name>.lod0.glb is full detail) so the
+viewer can load a small file for thumbnails and previews and the full
+model only when needed.
+"""
+import copy
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.glb_reader import GLBDocument
+from app.core.glb_writer import ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER, MODE_TRIANGLES, GLBBuilder
+
+KHR_MESH_QUANTIZATION = "KHR_mesh_quantization"
+
+# Vertices per element of the primitive modes that are welded and decimated
+# (LINES, TRIANGLES); other modes are copied unchanged
+MODE_LINES = 1
+PRIMITIVE_ARITY = {MODE_LINES: 2, MODE_TRIANGLES: 3}
+
+# Default LODs as fractions of the welded vertex count
+DEFAULT_LOD_RATIOS = (1.0, 0.4, 0.15)
+
+# Weld tolerance relative to the model's bounding-box diagonal
+WELD_TOLERANCE = 1e-6
+# Attributes other than POSITION are compared at this absolute precision
+ATTRIBUTE_TOLERANCE = 1e-4
+
+
+class Primitive:
+    """Decoded mesh primitive: float attributes plus uint32 indices."""
+
+    def __init__(self, attributes: Dict[str, np.ndarray], indices: np.ndarray, material: Optional[int], mode: int):
+        self.attributes = attributes
+        self.indices = indices
+        self.material = material
+        self.mode = mode
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.attributes["POSITION"])
+
+    @property
+    def triangle_count(self) -> int:
+        return len(self.indices) // 3 if self.mode == MODE_TRIANGLES else 0
+
+
+def load_primitives(doc: GLBDocument) -> List[List[Primitive]]:
+    """
+    Decode every mesh primitive of a document (normalized integers -> float).
+
+    Raises:
+        ValueError: For skins, animations and morph targets, which are not supported
+    """
+    gltf = doc.gltf
+    if gltf.get("skins") or gltf.get("animations"):
+        raise ValueError("Skinned or animated models are not supported")
+
+    meshes = []
+    for mesh in gltf.get("meshes", []):
+        primitives = []
+        for primitive in mesh["primitives"]:
+            if primitive.get("targets"):
+                raise ValueError("Morph targets are not supported")
+            attributes = {
+                name: np.array(doc.accessor(index, normalize=True))
+                for name, index in primitive["attributes"].items()
+            }
+            if "indices" in primitive:
+                indices = doc.accessor(primitive["indices"]).astype(np.uint32)
+            else:
+                indices = np.arange(len(attributes["POSITION"]), dtype=np.uint32)
+            primitives.append(Primitive(
+                attributes, indices, primitive.get("material"), primitive.get("mode", MODE_TRIANGLES)
+            ))
+        meshes.append(primitives)
+    return meshes
+
+
+def _compact(primitive: Primitive, keep: np.ndarray, indices: np.ndarray) -> Primitive:
+    """Primitive restricted to vertices `keep`, with indices already expressed in new vertex numbers."""
+    arity = PRIMITIVE_ARITY[primitive.mode]
+    elements = indices.reshape(-1, arity)
+    # Drop triangles/segments collapsed by merging
+    degenerate = np.zeros(len(elements), dtype=bool)
+    for a in range(arity):
+        for b in range(a + 1, arity):
+            degenerate |= elements[:, a] == elements[:, b]
+    elements = elements[~degenerate]
+    # Drop exact duplicates; triangles are compared up to rotation so
+    # opposite windings (deliberate back faces) are kept
+    if len(elements):
+        if arity == 3:
+            shift = np.argmin(elements, axis=1)
+            columns = (shift[:, None] + np.arange(3)) % 3
+            canonical = np.take_along_axis(elements, columns, axis=1)
+        else:
+            canonical = np.sort(elements, axis=1)
+        _, first = np.unique(canonical, axis=0, return_index=True)
+        elements = elements[np.sort(first)]
+    attributes = {name: values[keep] for name, values in primitive.attributes.items()}
+    return Primitive(attributes, elements.ravel().astype(np.uint32), primitive.material, primitive.mode)
+
+
+def weld(primitive: Primitive, tolerance: float) -> Primitive:
+    """
+    Merge vertices whose attributes are all equal within tolerance.
+
+    Args:
+        primitive: Source primitive
+        tolerance: Position tolerance in model units
+
+    Returns:
+        Primitive: Primitive with unique vertices and remapped indices
+    """
+    columns = []
+    for name, values in primitive.attributes.items():
+        step = tolerance if name == "POSITION" else ATTRIBUTE_TOLERANCE
+        values = values.reshape(len(values), -1).astype(np.float64)
+        columns.append(np.round(values / step).astype(np.int64))
+    keys = np.concatenate(columns, axis=1)
+    _, keep, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    remap = inverse.ravel().astype(np.uint32)
+    return _compact(primitive, keep, remap[primitive.indices])
+
+
+def cluster(primitive: Primitive, cell_size: float) -> Primitive:
+    """
+    Decimate by vertex clustering on a uniform grid.
+
+    Vertices in the same cell with similar normals collapse to their mean,
+    so hard edges survive while flat and finely tessellated areas simplify.
+
+    Args:
+        primitive: Source primitive (welded)
+        cell_size: Grid cell edge in model units
+
+    Returns:
+        Primitive: Simplified primitive
+    """
+    positions = primitive.attributes["POSITION"]
+    key_columns = [np.floor((positions - positions.min(axis=0)) / cell_size).astype(np.int64)]
+    normals = primitive.attributes.get("NORMAL")
+    if normals is not None:
+        key_columns.append(np.round(normals * 1.5).astype(np.int64))
+    keys = np.concatenate(key_columns, axis=1)
+    _, keep, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    remap = inverse.ravel()
+    clusters = len(keep)
+
+    counts = np.bincount(remap, minlength=clusters)[:, None]
+    simplified = _compact(primitive, keep, remap[primitive.indices])
+    # Representative position/normal: cluster mean instead of the first member
+    simplified.attributes["POSITION"] = np.stack(
+        [np.bincount(remap, weights=positions[:, axis], minlength=clusters) for axis in range(3)], axis=1
+    ).astype(np.float32) / counts
+    if normals is not None:
+        summed = np.stack(
+            [np.bincount(remap, weights=normals[:, axis], minlength=clusters) for axis in range(3)], axis=1
+        )
+        length = np.linalg.norm(summed, axis=1, keepdims=True)
+        simplified.attributes["NORMAL"] = (summed / np.where(length > 0, length, 1)).astype(np.float32)
+    return simplified
+
+
+def decimate(primitives: List[Primitive], ratio: float, diagonal: float) -> List[Primitive]:
+    """
+    Simplify a mesh to roughly `ratio` of its vertices.
+
+    The clustering grid is searched (bisection on a log scale) for the
+    coarsest cell size that still keeps the requested vertex share.
+    """
+    if ratio >= 1.0:
+        return primitives
+
+    def simplifiable_vertices(mesh: List[Primitive]) -> int:
+        return sum(p.vertex_count for p in mesh if p.mode in PRIMITIVE_ARITY)
+
+    target = ratio * simplifiable_vertices(primitives)
+    fine, coarse = np.log(diagonal / 4096), np.log(diagonal / 4)
+    best = primitives
+    for _ in range(12):
+        middle = (fine + coarse) / 2
+        candidate = [cluster(p, float(np.exp(middle))) if p.mode in PRIMITIVE_ARITY else p for p in primitives]
+        if simplifiable_vertices(candidate) >= target:
+            best, fine = candidate, middle  # still enough vertices: try coarser
+        else:
+            coarse = middle
+    return best
+
+
+def _quantize_position(positions: np.ndarray, center: np.ndarray, scale: float) -> np.ndarray:
+    """Positions as normalized int16, padded to 4 components for alignment."""
+    quantized = np.zeros((len(positions), 4), dtype=np.int16)
+    quantized[:, :3] = np.clip(np.round((positions - center) / scale * 32767), -32767, 32767)
+    return quantized
+
+
+def _quantize_unit(values: np.ndarray, dtype, columns: int) -> np.ndarray:
+    """Normalized [-1, 1] / [0, 1] values as integers, padded to `columns`."""
+    limit = np.iinfo(dtype).max
+    quantized = np.zeros((len(values), columns), dtype=dtype)
+    quantized[:, :values.shape[1]] = np.round(values * limit)
+    return quantized
+
+
+def _add_primitive(
+    builder: GLBBuilder,
+    primitive: Primitive,
+    quantize: bool,
+    center: np.ndarray,
+    scale: float
+) -> Dict[str, Any]:
+    """Write a primitive's buffers and return its glTF primitive JSON."""
+    attributes = {}
+    for name, values in primitive.attributes.items():
+        values = values.reshape(len(values), -1)
+        if quantize and name == "POSITION":
+            array = _quantize_position(values, center, scale)
+            attributes[name] = builder.add_accessor(array, ARRAY_BUFFER, with_bounds=True, normalized=True, components=3)
+        elif quantize and name in ("NORMAL", "TANGENT"):
+            array = _quantize_unit(values, np.int8, 4)
+            attributes[name] = builder.add_accessor(
+                array, ARRAY_BUFFER, normalized=True, components=values.shape[1]
+            )
+        elif quantize and name.startswith("TEXCOORD_") and values.min() >= 0 and values.max() <= 1:
+            array = _quantize_unit(values, np.uint16, 2)
+            attributes[name] = builder.add_accessor(array, ARRAY_BUFFER, normalized=True)
+        else:
+            array = values.astype(np.float32)
+            attributes[name] = builder.add_accessor(
+                array, ARRAY_BUFFER, with_bounds=(name == "POSITION"), components=values.shape[1]
+            )
+
+    index_type = np.uint16 if primitive.vertex_count <= 0xFFFF else np.uint32
+    result = {
+        "attributes": attributes,
+        "indices": builder.add_accessor(primitive.indices.astype(index_type), ELEMENT_ARRAY_BUFFER),
+        "mode": primitive.mode,
+    }
+    if primitive.material is not None:
+        result["material"] = primitive.material
+    return result
+
+
+def _strip_extras(value: Any) -> Any:
+    """Deep copy of glTF JSON without `extras` (vendor metadata, often most of the JSON chunk)."""
+    if isinstance(value, dict):
+        return {k: _strip_extras(v) for k, v in value.items() if k != "extras"}
+    if isinstance(value, list):
+        return [_strip_extras(v) for v in value]
+    return value
+
+
+def build_optimized(
+    doc: GLBDocument,
+    meshes: List[List[Primitive]],
+    quantize: bool,
+    keep_extras: bool = False
+) -> GLBBuilder:
+    """
+    Write decoded meshes back into a GLB, keeping the source scene graph.
+
+    With quantization each mesh gets its own dequantization transform: the
+    node that referenced it gets a child node carrying the mesh plus the
+    translation/uniform scale that maps int16 positions back to model units.
+    Unreferenced accessors and bufferViews of the source are not carried over.
+    """
+    copy_json = copy.deepcopy if keep_extras else _strip_extras
+    source = doc.gltf
+    builder = GLBBuilder(generator=source.get("asset", {}).get("generator", "SKF Configurator"))
+    builder.gltf["asset"] = dict(source.get("asset", {"version": "2.0"}))
+    for key in ("materials", "textures", "samplers", "cameras"):
+        if key in source:
+            builder.gltf[key] = copy_json(source[key])
+    # Embedded images keep their bytes
+    if source.get("images"):
+        builder.gltf["images"] = []
+        for image in source["images"]:
+            image = dict(image)
+            if "bufferView" in image:
+                image["bufferView"] = builder.add_buffer_view(np.frombuffer(doc.buffer_view(image["bufferView"]), np.uint8))
+            builder.gltf["images"].append(image)
+    for name in source.get("extensionsUsed", []):
+        builder.use_extension(name, required=name in source.get("extensionsRequired", []))
+    if quantize:
+        builder.use_extension(KHR_MESH_QUANTIZATION, required=True)
+
+    transforms = []
+    for index, primitives in enumerate(meshes):
+        positions = np.concatenate([p.attributes["POSITION"] for p in primitives])
+        lower, upper = positions.min(axis=0), positions.max(axis=0)
+        center = (lower + upper) / 2
+        scale = float(max((upper - lower).max() / 2, 1e-9))
+        transforms.append((center, scale))
+        builder.gltf["meshes"].append({
+            **copy_json({k: v for k, v in source["meshes"][index].items() if k != "primitives"}),
+            "primitives": [_add_primitive(builder, p, quantize, center, scale) for p in primitives],
+        })
+
+    builder.gltf["nodes"] = copy_json(source.get("nodes", []))
+    builder.gltf["scenes"] = copy_json(source.get("scenes", [{"nodes": []}]))
+    builder.gltf["scene"] = source.get("scene", 0)
+    if quantize:
+        for node in list(builder.gltf["nodes"]):
+            if "mesh" not in node:
+                continue
+            center, scale = transforms[node["mesh"]]
+            builder.gltf["nodes"].append({
+                "mesh": node.pop("mesh"),
+                "translation": center.tolist(),
+                "scale": [scale] * 3,
+            })
+            node.setdefault("children", []).append(len(builder.gltf["nodes"]) - 1)
+    return builder
+
+
+def _unused_accessor_count(gltf: Dict[str, Any]) -> int:
+    """Accessors no mesh primitive references (dropped by build_optimized)."""
+    used = set()
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            used.update(primitive["attributes"].values())
+            if "indices" in primitive:
+                used.add(primitive["indices"])
+    return len(gltf.get("accessors", [])) - len(used)
+
+
+def optimize_glb(
+    source: Path,
+    output_dir: Path,
+    lod_ratios: Sequence[float] = DEFAULT_LOD_RATIOS,
+    quantize: bool = True,
+    keep_extras: bool = False
+) -> Dict[str, Any]:
+    """
+    Write optimized LOD variants of a GLB.
+
+    Args:
+        source: Input GLB
+        output_dir: Directory for <stem>.lod<N>.glb files
+        lod_ratios: Vertex share kept by each LOD (1.0 = weld only)
+        quantize: Quantize attributes with KHR_mesh_quantization
+        keep_extras: Keep `extras` metadata on nodes, meshes and materials
+
+    Returns:
+        Dict: Sizes, vertex/triangle counts and accessor pruning per LOD
+    """
+    with GLBDocument(source) as doc:
+        meshes = load_primitives(doc)
+        vertices_before = sum(p.vertex_count for mesh in meshes for p in mesh)
+        triangles_before = sum(p.triangle_count for mesh in meshes for p in mesh)
+
+        all_positions = np.concatenate([p.attributes["POSITION"] for mesh in meshes for p in mesh])
+        diagonal = float(np.linalg.norm(all_positions.max(axis=0) - all_positions.min(axis=0))) or 1.0
+        welded = [
+            [weld(p, diagonal * WELD_TOLERANCE) if p.mode in PRIMITIVE_ARITY else p for p in mesh]
+            for mesh in meshes
+        ]
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = {
+            "source": str(source),
+            "bytes": source.stat().st_size,
+            "vertices": vertices_before,
+            "triangles": triangles_before,
+            "accessors": len(doc.gltf.get("accessors", [])),
+            "unused_accessors": _unused_accessor_count(doc.gltf),
+            "lods": [],
+        }
+        for level, ratio in enumerate(lod_ratios):
+            lod_meshes = [decimate(mesh, ratio, diagonal) for mesh in welded]
+            builder = build_optimized(doc, lod_meshes, quantize, keep_extras)
+            target = output_dir / f"{source.stem}.lod{level}.glb"
+            builder.save(target)
+            report["lods"].append({
+                "level": level,
+                "ratio": ratio,
+                "path": str(target),
+                "bytes": target.stat().st_size,
+                "vertices": sum(p.vertex_count for mesh in lod_meshes for p in mesh),
+                "triangles": sum(p.triangle_count for mesh in lod_meshes for p in mesh),
+                "accessors": len(builder.gltf["accessors"]),
+            })
+    return report
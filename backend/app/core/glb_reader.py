@@ -0,0 +1,345 @@
+"""
+GLB Reader - Memory-mapped, zero-copy access to binary glTF 2.0 files
+Path: app/core/glb_reader.py
+
+Opening a file only reads the 12-byte header and the chunk headers; the
+JSON chunk is parsed on first use and the BIN chunk is never read into
+memory. Accessors and bufferViews are NumPy views over the mapping, so
+memory use stays flat however large the assembly is (pages are loaded by
+the OS as arrays are touched).
+"""
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.glb_writer import ACCESSOR_TYPES, CHUNK_BIN, CHUNK_JSON, GLB_MAGIC, MODE_TRIANGLES
+
+# glTF componentType -> dtype
+COMPONENT_DTYPES = {
+    5120: np.dtype(np.int8),
+    5121: np.dtype(np.uint8),
+    5122: np.dtype(np.int16),
+    5123: np.dtype(np.uint16),
+    5125: np.dtype(np.uint32),
+    5126: np.dtype(np.float32),
+}
+COMPONENT_COUNTS = {name: count for count, name in ACCESSOR_TYPES.items()}
+COMPONENT_COUNTS.update({"MAT2": 4, "MAT3": 9, "MAT4": 16})
+
+MODE_TRIANGLE_STRIP = 5
+MODE_TRIANGLE_FAN = 6
+
+
+def _dequantize(values: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    """Normalized integers -> float32 in [-1, 1] / [0, 1] (glTF rules)."""
+    return np.maximum(values / float(np.iinfo(dtype).max), -1.0).astype(np.float32)
+
+
+def _node_matrix(node: Dict[str, Any]) -> np.ndarray:
+    """Local 4x4 transform of a node (matrix or TRS)."""
+    if "matrix" in node:
+        return np.asarray(node["matrix"], dtype=np.float64).reshape(4, 4).T  # column-major
+    matrix = np.eye(4)
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    matrix[:3, :3] = [
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ]
+    matrix[:3, :3] *= np.asarray(node.get("scale", (1.0, 1.0, 1.0)))[None, :]
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+
+class GLBDocument:
+    """
+    A memory-mapped GLB file.
+
+    Use as a context manager (or call close()); arrays returned by
+    accessor() and buffer_view() are views into the mapping and must not be
+    used after the document is closed.
+    """
+
+    def __init__(self, path: Path):
+        """Map the file and index its chunks (nothing else is read)."""
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{self.path} is not a GLB 2.0 file")
+
+        if len(self._map) < 12:
+            self.close()
+            raise ValueError(f"{self.path} is not a GLB 2.0 file")
+        magic, version, length = struct.unpack_from("<4sII", self._map, 0)
+        if magic != GLB_MAGIC or version != 2:
+            self.close()
+            raise ValueError(f"{self.path} is not a GLB 2.0 file")
+
+        # chunk type -> (offset, length) of its data
+        self.chunks: Dict[bytes, Tuple[int, int]] = {}
+        offset = 12
+        end = min(length, len(self._map))
+        while offset + 8 <= end:
+            chunk_length, chunk_type = struct.unpack_from("<I4s", self._map, offset)
+            self.chunks.setdefault(chunk_type, (offset + 8, chunk_length))
+            offset += 8 + chunk_length
+        if CHUNK_JSON not in self.chunks:
+            self.close()
+            raise ValueError(f"{self.path} has no JSON chunk")
+
+        self._gltf: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "GLBDocument":
+        """Open a GLB file (alias of the constructor)."""
+        return cls(path)
+
+    def __enter__(self) -> "GLBDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file; deferred to garbage collection while views are still alive."""
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # exported arrays keep the mapping alive until they are freed
+        except AttributeError:
+            pass
+        self._file.close()
+
+    # --- raw structure -------------------------------------------------
+
+    @property
+    def gltf(self) -> Dict[str, Any]:
+        """The glTF JSON (parsed on first access)."""
+        if self._gltf is None:
+            offset, length = self.chunks[CHUNK_JSON]
+            self._gltf = json.loads(self._map[offset:offset + length])
+        return self._gltf
+
+    @property
+    def binary(self) -> memoryview:
+        """The BIN chunk as a zero-copy view (empty if absent)."""
+        offset, length = self.chunks.get(CHUNK_BIN, (0, 0))
+        return memoryview(self._map)[offset:offset + length]
+
+    def buffer_view(self, index: int) -> memoryview:
+        """Bytes of a bufferView, as a zero-copy view."""
+        view = self.gltf["bufferViews"][index]
+        if view.get("buffer", 0) != 0:
+            raise ValueError(f"{self.path}: only the GLB-embedded buffer is supported")
+        start = view.get("byteOffset", 0)
+        return self.binary[start:start + view["byteLength"]]
+
+    def accessor(self, index: int, normalize: bool = False) -> np.ndarray:
+        """
+        Accessor data as a (count,) or (count, n) array.
+
+        Args:
+            index: Accessor index
+            normalize: Convert normalized integer accessors to float32 (copies)
+
+        Returns:
+            np.ndarray: Read-only view over the mapping (interleaved data
+                        gives a strided view), unless normalized or sparse
+        """
+        accessor = self.gltf["accessors"][index]
+        dtype = COMPONENT_DTYPES[accessor["componentType"]]
+        components = COMPONENT_COUNTS[accessor["type"]]
+        count = accessor["count"]
+
+        if "bufferView" not in accessor:
+            array = np.zeros((count, components), dtype=dtype)
+        else:
+            view = self.gltf["bufferViews"][accessor["bufferView"]]
+            stride = view.get("byteStride") or dtype.itemsize * components
+            data = self.buffer_view(accessor["bufferView"])
+            array = np.ndarray(
+                shape=(count, components),
+                dtype=dtype,
+                buffer=data,
+                offset=accessor.get("byteOffset", 0),
+                strides=(stride, dtype.itemsize)
+            )
+
+        if "sparse" in accessor:
+            array = self._apply_sparse(array.copy(), accessor["sparse"])
+        if normalize and accessor.get("normalized") and dtype.kind in "iu":
+            array = _dequantize(array, dtype)
+        return array[:, 0] if components == 1 else array
+
+    def _apply_sparse(self, array: np.ndarray, sparse: Dict[str, Any]) -> np.ndarray:
+        """Overlay sparse substitutions on a (copied) dense array."""
+        count = sparse["count"]
+        indices_info, values_info = sparse["indices"], sparse["values"]
+        index_dtype = COMPONENT_DTYPES[indices_info["componentType"]]
+        indices = np.frombuffer(
+            self.buffer_view(indices_info["bufferView"]), dtype=index_dtype,
+            count=count, offset=indices_info.get("byteOffset", 0)
+        )
+        values = np.frombuffer(
+            self.buffer_view(values_info["bufferView"]), dtype=array.dtype,
+            count=count * array.shape[1], offset=values_info.get("byteOffset", 0)
+        ).reshape(count, array.shape[1])
+        array[indices] = values
+        return array
+
+    # --- hierarchy -----------------------------------------------------
+
+    def root_nodes(self) -> List[int]:
+        """Nodes of the default scene (or every parentless node if there is none)."""
+        scenes = self.gltf.get("scenes")
+        if scenes:
+            return list(scenes[self.gltf.get("scene", 0)].get("nodes", []))
+        children = {c for node in self.gltf.get("nodes", []) for c in node.get("children", [])}
+        return [i for i in range(len(self.gltf.get("nodes", []))) if i not in children]
+
+    def iter_nodes(self) -> Iterator[Tuple[int, Optional[int], int]]:
+        """Depth-first walk of the default scene yielding (node, parent, depth)."""
+        nodes = self.gltf.get("nodes", [])
+        stack = [(root, None, 0) for root in reversed(self.root_nodes())]
+        while stack:
+            index, parent, depth = stack.pop()
+            yield index, parent, depth
+            for child in reversed(nodes[index].get("children", [])):
+                stack.append((child, index, depth + 1))
+
+    def node_tree(self) -> List[Dict[str, Any]]:
+        """Nested {index, name, mesh, children} dicts of the default scene."""
+        nodes = self.gltf.get("nodes", [])
+        meshes = self.gltf.get("meshes", [])
+        entries: Dict[int, Dict[str, Any]] = {}
+        roots = []
+        for index, parent, _ in self.iter_nodes():
+            node = nodes[index]
+            mesh = node.get("mesh")
+            entry = {
+                "index": index,
+                "name": node.get("name", f"Node_{index}"),
+                "mesh": None if mesh is None else meshes[mesh].get("name", f"Mesh_{mesh}"),
+                "children": [],
+            }
+            entries[index] = entry
+            (entries[parent]["children"] if parent is not None else roots).append(entry)
+        return roots
+
+    def world_matrices(self) -> Dict[int, np.ndarray]:
+        """World 4x4 transform of every node in the default scene."""
+        nodes = self.gltf.get("nodes", [])
+        world: Dict[int, np.ndarray] = {}
+        for index, parent, _ in self.iter_nodes():
+            local = _node_matrix(nodes[index])
+            world[index] = local if parent is None else world[parent] @ local
+        return world
+
+    # --- statistics ----------------------------------------------------
+
+    def _position_bounds(self, accessor_index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """min/max of a POSITION accessor, from its declared bounds when present."""
+        accessor = self.gltf["accessors"][accessor_index]
+        dtype = COMPONENT_DTYPES[accessor["componentType"]]
+        if "min" in accessor and "max" in accessor and "sparse" not in accessor:
+            lower = np.asarray(accessor["min"], dtype=np.float64)
+            upper = np.asarray(accessor["max"], dtype=np.float64)
+            if accessor.get("normalized") and dtype.kind in "iu":
+                lower, upper = _dequantize(lower, dtype), _dequantize(upper, dtype)
+            return lower, upper
+        positions = self.accessor(accessor_index, normalize=True)
+        return positions.min(axis=0).astype(np.float64), positions.max(axis=0).astype(np.float64)
+
+    def mesh_bounds(self, mesh_index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Local-space (min, max) of a mesh over all its primitives."""
+        bounds = [
+            self._position_bounds(primitive["attributes"]["POSITION"])
+            for primitive in self.gltf["meshes"][mesh_index]["primitives"]
+            if "POSITION" in primitive["attributes"]
+        ]
+        if not bounds:
+            return np.zeros(3), np.zeros(3)
+        return np.min([b[0] for b in bounds], axis=0), np.max([b[1] for b in bounds], axis=0)
+
+    def scene_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """World-space (min, max) of the default scene (box corners transformed)."""
+        corners = []
+        nodes = self.gltf.get("nodes", [])
+        for index, matrix in self.world_matrices().items():
+            mesh = nodes[index].get("mesh")
+            if mesh is None:
+                continue
+            lower, upper = self.mesh_bounds(mesh)
+            box = np.array([[x, y, z, 1.0] for x in (lower[0], upper[0])
+                            for y in (lower[1], upper[1]) for z in (lower[2], upper[2])])
+            corners.append((box @ matrix.T)[:, :3])
+        if not corners:
+            return np.zeros(3), np.zeros(3)
+        points = np.concatenate(corners)
+        return points.min(axis=0), points.max(axis=0)
+
+    def primitive_triangle_count(self, primitive: Dict[str, Any]) -> int:
+        """Triangles drawn by a primitive (0 for points and lines)."""
+        if "indices" in primitive:
+            count = self.gltf["accessors"][primitive["indices"]]["count"]
+        else:
+            count = self.gltf["accessors"][primitive["attributes"]["POSITION"]]["count"]
+        mode = primitive.get("mode", MODE_TRIANGLES)
+        if mode == MODE_TRIANGLES:
+            return count // 3
+        if mode in (MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN):
+            return max(count - 2, 0)
+        return 0
+
+    def mesh_triangle_count(self, mesh_index: int) -> int:
+        """Triangles in one instance of a mesh."""
+        return sum(self.primitive_triangle_count(p) for p in self.gltf["meshes"][mesh_index]["primitives"])
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Size, structure and per-mesh statistics, computed from the JSON alone
+        where possible (bounds fall back to scanning POSITION data).
+
+        Returns:
+            Dict: Counts, scene bounds, rendered triangles and per-mesh details
+        """
+        gltf = self.gltf
+        meshes = gltf.get("meshes", [])
+        nodes = gltf.get("nodes", [])
+        instances = [0] * len(meshes)
+        for index, _, _ in self.iter_nodes():
+            if "mesh" in nodes[index]:
+                instances[nodes[index]["mesh"]] += 1
+
+        per_mesh = []
+        for index, mesh in enumerate(meshes):
+            lower, upper = self.mesh_bounds(index)
+            per_mesh.append({
+                "index": index,
+                "name": mesh.get("name", f"Mesh_{index}"),
+                "primitives": len(mesh["primitives"]),
+                "triangles": self.mesh_triangle_count(index),
+                "instances": instances[index],
+                "min": lower.tolist(),
+                "max": upper.tolist(),
+            })
+        lower, upper = self.scene_bounds()
+        return {
+            "bytes": len(self._map),
+            "json_bytes": self.chunks[CHUNK_JSON][1],
+            "bin_bytes": self.chunks.get(CHUNK_BIN, (0, 0))[1],
+            "nodes": len(nodes),
+            "meshes": len(meshes),
+            "accessors": len(gltf.get("accessors", [])),
+            "scene_min": lower.tolist(),
+            "scene_max": upper.tolist(),
+            "rendered_triangles": sum(m["triangles"] * m["instances"] for m in per_mesh),
+            "mesh_details": per_mesh,
+        }
@@ -0,0 +1,242 @@
+"""
+GLB Writer - Packs NumPy mesh buffers into binary glTF 2.0
+Path: app/core/glb_writer.py
+"""
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence
+
+import numpy as np
+
+GLB_MAGIC = b"glTF"
+GLB_VERSION = 2
+CHUNK_JSON = b"JSON"
+CHUNK_BIN = b"BIN\x00"
+
+# glTF enums
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+COMPONENT_TYPES = {
+    np.dtype(np.int8): 5120,
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.int16): 5122,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+ACCESSOR_TYPES = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4"}
+MODE_TRIANGLES = 4
+
+
+def _pad4(length: int) -> int:
+    """Bytes needed to pad a length to a 4-byte boundary."""
+    return -length % 4
+
+
+class GLBBuilder:
+    """
+    Incrementally assembles a glTF scene whose buffers are NumPy arrays.
+
+    Arrays are kept as references and written straight from their memory
+    into the BIN chunk, so the geometry is never copied into an
+    intermediate bytes object.
+    """
+
+    def __init__(self, generator: str = "SKF Configurator"):
+        """Start an empty single-scene document."""
+        self.gltf: Dict[str, Any] = {
+            "asset": {"version": "2.0", "generator": generator},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [{"byteLength": 0}],
+        }
+        self._blobs: List[np.ndarray] = []
+        self._byte_length = 0
+
+    def add_material(
+        self,
+        name: str,
+        color: Sequence[float],
+        metallic: float = 0.5,
+        roughness: float = 0.4
+    ) -> int:
+        """Add a PBR material and return its index."""
+        self.gltf["materials"].append({
+            "name": name,
+            "pbrMetallicRoughness": {
+                "baseColorFactor": list(color),
+                "metallicFactor": metallic,
+                "roughnessFactor": roughness,
+            },
+        })
+        return len(self.gltf["materials"]) - 1
+
+    def use_extension(self, name: str, required: bool = False) -> None:
+        """Declare a glTF extension in extensionsUsed (and extensionsRequired)."""
+        for key in ("extensionsUsed", "extensionsRequired") if required else ("extensionsUsed",):
+            names = self.gltf.setdefault(key, [])
+            if name not in names:
+                names.append(name)
+
+    def add_buffer_view(
+        self,
+        array: np.ndarray,
+        target: Optional[int] = None,
+        byte_stride: Optional[int] = None
+    ) -> int:
+        """Reference an array as a bufferView (4-byte aligned) and return its index."""
+        array = np.ascontiguousarray(array)
+        padding = _pad4(self._byte_length)
+        if padding:
+            self._blobs.append(np.zeros(padding, dtype=np.uint8))
+            self._byte_length += padding
+
+        view = {"buffer": 0, "byteOffset": self._byte_length, "byteLength": array.nbytes}
+        if target is not None:
+            view["target"] = target
+        if byte_stride is not None:
+            view["byteStride"] = byte_stride
+        self.gltf["bufferViews"].append(view)
+        self._blobs.append(array)
+        self._byte_length += array.nbytes
+        return len(self.gltf["bufferViews"]) - 1
+
+    def add_accessor(
+        self,
+        array: np.ndarray,
+        target: Optional[int] = None,
+        with_bounds: bool = False,
+        normalized: bool = False,
+        components: Optional[int] = None
+    ) -> int:
+        """
+        Add an accessor over a (count,) or (count, n) array and return its index.
+
+        Passing fewer `components` than the array has columns exposes only the
+        leading columns; the row size becomes the byteStride, which is how
+        vertex attributes are padded to the 4-byte alignment glTF requires.
+        """
+        columns = 1 if array.ndim == 1 else array.shape[1]
+        components = components or columns
+        byte_stride = array.dtype.itemsize * columns if components != columns else None
+        accessor = {
+            "bufferView": self.add_buffer_view(array, target, byte_stride),
+            "componentType": COMPONENT_TYPES[array.dtype],
+            "count": int(array.shape[0]),
+            "type": ACCESSOR_TYPES[components],
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if with_bounds:
+            # POSITION accessors must declare min/max
+            values = array.reshape(len(array), columns)[:, :components]
+            accessor["min"] = values.min(axis=0).tolist()
+            accessor["max"] = values.max(axis=0).tolist()
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def add_mesh(
+        self,
+        name: str,
+        positions: np.ndarray,
+        normals: np.ndarray,
+        indices: np.ndarray,
+        material: Optional[int] = None
+    ) -> int:
+        """
+        Add a triangle mesh and return its index.
+
+        Args:
+            name: Mesh name
+            positions: (n, 3) float32 vertex positions
+            normals: (n, 3) float32 unit normals
+            indices: (m,) triangle vertex indices (uint16 or uint32)
+            material: Material index
+
+        Returns:
+            int: Mesh index
+        """
+        if indices.dtype not in (np.uint16, np.uint32):
+            index_type = np.uint16 if len(positions) <= 0xFFFF else np.uint32
+            indices = indices.astype(index_type)
+        primitive = {
+            "attributes": {
+                "POSITION": self.add_accessor(positions.astype(np.float32, copy=False), ARRAY_BUFFER, with_bounds=True),
+                "NORMAL": self.add_accessor(normals.astype(np.float32, copy=False), ARRAY_BUFFER),
+            },
+            "indices": self.add_accessor(indices, ELEMENT_ARRAY_BUFFER),
+            "mode": MODE_TRIANGLES,
+        }
+        if material is not None:
+            primitive["material"] = material
+        self.gltf["meshes"].append({"name": name, "primitives": [primitive]})
+        return len(self.gltf["meshes"]) - 1
+
+    def add_node(
+        self,
+        name: str,
+        mesh: Optional[int] = None,
+        translation: Optional[Sequence[float]] = None,
+        children: Optional[List[int]] = None,
+        parent: Optional[int] = None
+    ) -> int:
+        """Add a node (a root of the scene unless a parent is given) and return its index."""
+        node: Dict[str, Any] = {"name": name}
+        if mesh is not None:
+            node["mesh"] = mesh
+        if translation is not None:
+            node["translation"] = [float(v) for v in translation]
+        if children:
+            node["children"] = list(children)
+        self.gltf["nodes"].append(node)
+        index = len(self.gltf["nodes"]) - 1
+
+        if parent is None:
+            self.gltf["scenes"][0]["nodes"].append(index)
+        else:
+            self.gltf["nodes"][parent].setdefault("children", []).append(index)
+        return index
+
+    def write(self, fp: BinaryIO) -> int:
+        """
+        Write the GLB container to a binary file object.
+
+        Returns:
+            int: Bytes written
+        """
+        gltf = dict(self.gltf)
+        gltf["buffers"] = [{"byteLength": self._byte_length}]
+        # Empty arrays are not allowed by the glTF schema
+        gltf = {key: value for key, value in gltf.items() if value != []}
+
+        json_bytes = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+        json_bytes += b" " * _pad4(len(json_bytes))
+        bin_padding = _pad4(self._byte_length)
+        bin_length = self._byte_length + bin_padding
+
+        total = 12 + 8 + len(json_bytes) + (8 + bin_length if bin_length else 0)
+        fp.write(struct.pack("<4sII", GLB_MAGIC, GLB_VERSION, total))
+        fp.write(struct.pack("<I4s", len(json_bytes), CHUNK_JSON))
+        fp.write(json_bytes)
+        if bin_length:
+            fp.write(struct.pack("<I4s", bin_length, CHUNK_BIN))
+            for blob in self._blobs:
+                fp.write(memoryview(blob).cast("B"))
+            fp.write(b"\x00" * bin_padding)
+        return total
+
+    def save(self, path: Path) -> None:
+        """Write atomically to a path (temp file + rename)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            self.write(f)
+        os.replace(tmp_path, path)
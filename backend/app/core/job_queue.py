@@ -0,0 +1,134 @@
+"""
+Job Queue - Process-pool backend for CPU-bound background jobs
+Path: app/core/job_queue.py
+"""
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+def _run_collecting_metrics(fn: Callable[..., Any], *args: Any):
+    """Worker-side wrapper: run a job and return its result with the metrics it recorded."""
+    return fn(*args), metrics.drain()
+
+
+class JobQueue:
+    """
+    Runs picklable, module-level functions in a ProcessPoolExecutor.
+    
+    Workers are recycled after `max_tasks_per_child` jobs to cap memory growth
+    of long-lived ezdxf processes. With `max_workers=0` jobs run inline in the
+    caller, which keeps development and tests free of subprocesses.
+    """
+    
+    def __init__(self, max_workers: int, max_tasks_per_child: Optional[int] = None):
+        """Configure the queue; the pool itself is created on first use."""
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child or None
+        
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the pool lazily (lock held)."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                max_tasks_per_child=self.max_tasks_per_child
+            )
+        return self._executor
+    
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_error: Optional[Callable[[BaseException], None]] = None
+    ) -> Future:
+        """
+        Queue a job.
+        
+        Args:
+            fn: Module-level function to run in a worker process
+            *args: Picklable arguments for fn
+            on_error: Called in the parent if the job raises or its worker dies
+            
+        Returns:
+            Future: Resolves with the return value of fn
+        """
+        if self.max_workers <= 0:
+            return self._run_inline(fn, *args, on_error=on_error)
+        
+        with self._lock:
+            try:
+                job = self._get_executor().submit(_run_collecting_metrics, fn, *args)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM kill); replace the pool and retry once
+                self._executor = None
+                job = self._get_executor().submit(_run_collecting_metrics, fn, *args)
+            self._in_flight += 1
+        
+        # Callers see fn's result; the worker's metrics go into this process's registry
+        future: Future = Future()
+        
+        def _done(f: Future) -> None:
+            with self._lock:
+                self._in_flight -= 1
+            if f.cancelled():
+                future.cancel()
+                future.set_running_or_notify_cancel()
+                return
+            error = f.exception()
+            if error is not None:
+                future.set_exception(error)
+                if on_error:
+                    on_error(error)
+                return
+            result, recorded = f.result()
+            metrics.merge(recorded)
+            future.set_result(result)
+        
+        job.add_done_callback(_done)
+        return future
+    
+    def _run_inline(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_error: Optional[Callable[[BaseException], None]] = None
+    ) -> Future:
+        """Run a job in the calling thread and wrap the outcome in a Future."""
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+            if on_error:
+                on_error(e)
+        return future
+    
+    def depth(self) -> int:
+        """Number of jobs submitted but not yet finished."""
+        with self._lock:
+            return self._in_flight
+    
+    def shutdown(self) -> None:
+        """
+        Stop the pool. Jobs that have not started are cancelled and stay
+        `pending` in the database, so they are recovered on the next start.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Singleton instance for easy import
+export_queue = JobQueue(
+    max_workers=settings.EXPORT_WORKERS,
+    max_tasks_per_child=settings.EXPORT_WORKER_MAX_TASKS
+)
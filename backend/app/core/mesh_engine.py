@@ -0,0 +1,386 @@
+"""
+Mesh Engine - Parametric 3D models (GLB) for linear guides
+Generates rail, carriages and the rail's mounting-hole pattern from
+configuration parameters, using NumPy for all vertex and index buffers.
+Path: app/core/mesh_engine.py
+
+Coordinate system matches the catalog models (e.g. SSELBWN14-110.glb):
+millimetres, Y up, rail length along Z centred on the origin, rail foot at Y=0.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.glb_writer import GLBBuilder
+
+# (positions (n, 3) float32, normals (n, 3) float32, triangle indices (m,) uint32)
+MeshData = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def merge_meshes(parts: List[MeshData]) -> MeshData:
+    """Concatenate meshes into one, offsetting the indices of each part."""
+    offsets = np.cumsum([0] + [len(p[0]) for p in parts[:-1]])
+    positions = np.concatenate([p[0] for p in parts]).astype(np.float32, copy=False)
+    normals = np.concatenate([p[1] for p in parts]).astype(np.float32, copy=False)
+    indices = np.concatenate([p[2] + offset for p, offset in zip(parts, offsets)]).astype(np.uint32)
+    return positions, normals, indices
+
+
+def _orient(positions: np.ndarray, triangles: np.ndarray, normals: np.ndarray) -> np.ndarray:
+    """Flip triangles whose winding disagrees with their vertex normals (CCW = front)."""
+    a, b, c = (positions[triangles[:, i]] for i in range(3))
+    face_normals = np.cross(b - a, c - a)
+    flip = np.einsum("ij,ij->i", face_normals, normals[triangles[:, 0]]) < 0
+    triangles[flip] = triangles[flip][:, ::-1]
+    return triangles
+
+
+def _quads_to_triangles(quads: np.ndarray) -> np.ndarray:
+    """(q, 4) vertex indices of quads -> (2q, 3) triangles."""
+    return np.concatenate([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+
+def box(lower: Tuple[float, float, float], upper: Tuple[float, float, float]) -> MeshData:
+    """Axis-aligned box with flat-shaded faces (24 vertices, 12 triangles)."""
+    lower = np.asarray(lower, dtype=np.float32)
+    upper = np.asarray(upper, dtype=np.float32)
+    corners = np.array([[x, y, z] for x in (0, 1) for y in (0, 1) for z in (0, 1)], dtype=np.float32)
+    # Corner indices of each face, and the face normal
+    faces = np.array([
+        [0, 1, 3, 2], [4, 6, 7, 5],  # -X, +X
+        [0, 4, 5, 1], [2, 3, 7, 6],  # -Y, +Y
+        [0, 2, 6, 4], [1, 5, 7, 3],  # -Z, +Z
+    ])
+    face_normals = np.repeat(np.eye(3, dtype=np.float32), 2, axis=0) * np.tile([-1, 1], 3)[:, None]
+
+    positions = (lower + corners * (upper - lower))[faces.ravel()]
+    normals = np.repeat(face_normals, 4, axis=0)
+    triangles = _quads_to_triangles(np.arange(24).reshape(6, 4))
+    return positions, normals, _orient(positions, triangles, normals).ravel().astype(np.uint32)
+
+
+def _rect(axis: int, level: float, a_range: Tuple[float, float], b_range: Tuple[float, float], sign: float) -> MeshData:
+    """Single quad on the plane coordinate[axis] == level, facing sign along axis."""
+    a_axis, b_axis = [i for i in range(3) if i != axis]
+    positions = np.zeros((4, 3), dtype=np.float32)
+    positions[:, axis] = level
+    positions[:, a_axis] = [a_range[0], a_range[1], a_range[1], a_range[0]]
+    positions[:, b_axis] = [b_range[0], b_range[0], b_range[1], b_range[1]]
+    normals = np.zeros((4, 3), dtype=np.float32)
+    normals[:, axis] = sign
+    triangles = _quads_to_triangles(np.arange(4)[None])
+    return positions, normals, _orient(positions, triangles, normals).ravel().astype(np.uint32)
+
+
+def rail_with_holes(
+    width: float,
+    height: float,
+    length: float,
+    hole_centers: np.ndarray,
+    hole_radius: float,
+    cell_length: float,
+    segments: int = 32
+) -> MeshData:
+    """
+    Rectangular rail with vertical through-holes.
+
+    Around every hole the top and bottom faces are a width x cell_length
+    cell whose boundary is sampled at the same angles as the hole circle,
+    so the annulus between them triangulates as a ring of quads. The cell
+    template is built once and broadcast over all hole centres.
+
+    Args:
+        width, height, length: Rail dimensions (X, Y, Z)
+        hole_centers: Z coordinate of each hole
+        hole_radius: Through-hole radius
+        cell_length: Length of the face cell around each hole (<= hole pitch)
+        segments: Vertices per hole circle (multiple of 4 keeps cell corners exact)
+
+    Returns:
+        MeshData: The rail mesh
+    """
+    half_w, half_l = width / 2, length / 2
+    count = len(hole_centers)
+
+    theta = np.pi / 4 + 2 * np.pi * np.arange(segments) / segments
+    cos, sin = np.cos(theta), np.sin(theta)
+    # Unit circle pushed out onto the unit square, then scaled to the cell
+    square = np.stack([cos, sin], axis=1) / np.maximum(np.abs(cos), np.abs(sin))[:, None]
+    cell_xz = square * [half_w, cell_length / 2]
+    circle_xz = np.stack([cos, sin], axis=1) * hole_radius
+
+    k = np.arange(segments)
+    ring_quads = np.stack([k, (k + 1) % segments, segments + (k + 1) % segments, segments + k], axis=1)
+    ring_triangles = _quads_to_triangles(ring_quads)
+    centers = np.asarray(hole_centers, dtype=np.float32)
+
+    parts: List[MeshData] = []
+    if count:
+        for level, sign in ((height, 1.0), (0.0, -1.0)):
+            # One annulus per hole: circle ring followed by cell-boundary ring
+            template = np.zeros((2 * segments, 3), dtype=np.float32)
+            template[:segments, [0, 2]] = circle_xz
+            template[segments:, [0, 2]] = cell_xz
+            template[:, 1] = level
+            positions = np.repeat(template[None], count, axis=0)
+            positions[:, :, 2] += centers[:, None]
+            positions = positions.reshape(-1, 3)
+            normals = np.tile(np.array([0, sign, 0], dtype=np.float32), (len(positions), 1))
+            triangles = (ring_triangles[None] + (np.arange(count) * 2 * segments)[:, None, None]).reshape(-1, 3)
+            parts.append((positions, normals, _orient(positions, triangles, normals).ravel()))
+
+        # Hole walls, normals facing the hole axis
+        wall = np.zeros((2 * segments, 3), dtype=np.float32)
+        wall[:, [0, 2]] = np.tile(circle_xz, (2, 1))
+        wall[segments:, 1] = height
+        wall_normals = np.zeros_like(wall)
+        wall_normals[:, [0, 2]] = -np.tile(np.stack([cos, sin], axis=1), (2, 1))
+        positions = np.repeat(wall[None], count, axis=0)
+        positions[:, :, 2] += centers[:, None]
+        positions = positions.reshape(-1, 3)
+        normals = np.tile(wall_normals, (count, 1))
+        triangles = (ring_triangles[None] + (np.arange(count) * 2 * segments)[:, None, None]).reshape(-1, 3)
+        parts.append((positions, normals, _orient(positions, triangles, normals).ravel()))
+
+    # Plain top/bottom strips between hole cells and at the rail ends
+    edges = [-half_l]
+    for center in centers:
+        edges += [center - cell_length / 2, center + cell_length / 2]
+    edges.append(half_l)
+    for start, end in zip(edges[::2], edges[1::2]):
+        if end - start > 1e-6:
+            parts.append(_rect(1, height, (-half_w, half_w), (start, end), 1.0))
+            parts.append(_rect(1, 0.0, (-half_w, half_w), (start, end), -1.0))
+
+    # Sides and end faces
+    parts.append(_rect(0, -half_w, (0.0, height), (-half_l, half_l), -1.0))
+    parts.append(_rect(0, half_w, (0.0, height), (-half_l, half_l), 1.0))
+    parts.append(_rect(2, -half_l, (-half_w, half_w), (0.0, height), -1.0))
+    parts.append(_rect(2, half_l, (-half_w, half_w), (0.0, height), 1.0))
+    return merge_meshes(parts)
+
+
+def carriage(width: float, length: float, rail_width: float, rail_height: float, bottom: float, top: float) -> MeshData:
+    """Carriage straddling the rail: a bridge over it and two legs beside it, centred on the origin."""
+    gap = rail_width * 0.05
+    half_w, half_l = width / 2, length / 2
+    inner = rail_width / 2 + gap
+    bridge_bottom = rail_height + gap
+    return merge_meshes([
+        box((-half_w, bridge_bottom, -half_l), (half_w, top, half_l)),
+        box((-half_w, bottom, -half_l), (-inner, bridge_bottom, half_l)),
+        box((inner, bottom, -half_l), (half_w, bridge_bottom, half_l)),
+    ])
+
+
+def regular_polygon(radius: float, sides: int, phase: float = 0.0) -> np.ndarray:
+    """(sides, 2) corners of a regular polygon centred on the origin, counter-clockwise."""
+    angles = phase + 2 * np.pi * np.arange(sides) / sides
+    return (radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)).astype(np.float32)
+
+
+def prism(outline: np.ndarray, bottom: float, top: float) -> MeshData:
+    """
+    Convex outline in the XZ plane extruded along Y, with flat-shaded sides and caps.
+
+    Args:
+        outline: (n, 2) X/Z corners in order
+        bottom: Y of the lower cap
+        top: Y of the upper cap
+    """
+    outline = np.asarray(outline, dtype=np.float32)
+    count = len(outline)
+    start, end = outline, np.roll(outline, -1, axis=0)
+    center = outline.mean(axis=0)
+
+    # Sides: one quad per edge, normal pointing away from the centre
+    side_positions = np.zeros((count, 4, 3), dtype=np.float32)
+    side_positions[:, :, 0] = np.stack([start[:, 0], end[:, 0], end[:, 0], start[:, 0]], axis=1)
+    side_positions[:, :, 1] = [bottom, bottom, top, top]
+    side_positions[:, :, 2] = np.stack([start[:, 1], end[:, 1], end[:, 1], start[:, 1]], axis=1)
+    edge = end - start
+    side_normals = np.stack([edge[:, 1], np.zeros(count), -edge[:, 0]], axis=1)
+    outward = np.einsum("ij,ij->i", side_normals[:, [0, 2]], (start + end) / 2 - center)
+    side_normals *= np.sign(outward)[:, None]
+    side_normals /= np.linalg.norm(side_normals, axis=1, keepdims=True)
+    sides = (
+        side_positions.reshape(-1, 3),
+        np.repeat(side_normals, 4, axis=0).astype(np.float32),
+        _quads_to_triangles(np.arange(4 * count).reshape(count, 4)),
+    )
+
+    # Caps: triangle fans
+    parts = [sides]
+    fan = np.stack([np.zeros(count - 2, dtype=np.int64), np.arange(1, count - 1), np.arange(2, count)], axis=1)
+    for level, sign in ((bottom, -1.0), (top, 1.0)):
+        positions = np.zeros((count, 3), dtype=np.float32)
+        positions[:, 0], positions[:, 1], positions[:, 2] = outline[:, 0], level, outline[:, 1]
+        normals = np.zeros((count, 3), dtype=np.float32)
+        normals[:, 1] = sign
+        parts.append((positions, normals, fan.copy()))
+
+    oriented = [(p, nrm, _orient(p, tri, nrm).ravel().astype(np.uint32)) for p, nrm, tri in parts]
+    return merge_meshes(oriented)
+
+
+class LinearGuideModelGenerator:
+    """
+    Generates GLB models for SKF Linear Guide configurations.
+    """
+
+    # Colors (RGBA, linear)
+    COLOR_RAIL = (0.62, 0.64, 0.67, 1.0)
+    COLOR_CARRIAGE = (0.05, 0.27, 0.63, 1.0)
+
+    HOLE_SEGMENTS = 32
+
+    # Bump whenever the mesh code changes so cached models are invalidated
+    MODEL_REVISION = 1
+
+    def model_inputs(
+        self,
+        geometry_params: Dict[str, Any],
+        application_params: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Normalize the parameters that shape a Linear Guide model.
+
+        Missing dimensions fall back to the proportions the DXF drawing uses
+        (carriage 1.5 W wide and 2 W long), so both artifacts agree.
+
+        Args:
+            geometry_params: Dict containing W, LS, H, H1, L1, B, F, G, DD1DD2HH
+            application_params: Dict containing NOB
+
+        Returns:
+            Dict: Normalized dimensions in mm; equal inputs give identical models
+
+        Raises:
+            ValueError: If the dimensions are inconsistent
+        """
+        application_params = application_params or {}
+
+        def number(key: str, default: float) -> float:
+            value = geometry_params.get(key)
+            return float(value) if value not in (None, "") else float(default)
+
+        rail_width = number('W', 20)
+        rail_length = number('LS', 500)
+        rail_height = number('H1', rail_width * 0.8)
+        height = number('H', rail_height * 1.75)
+        block_length = number('L1', rail_width * 2)
+        block_width = max(number('B', rail_width * 1.5), rail_width * 1.3)
+        pitch = number('F', 60)
+        num_blocks = int(application_params.get('NOB', geometry_params.get('NOB', 2)))
+
+        # d1 x d2 x h: through-hole diameter first
+        hole_diameter = rail_width * 0.3
+        match = re.match(r"\s*([0-9.]+)", str(geometry_params.get('DD1DD2HH') or ""))
+        if match:
+            hole_diameter = float(match.group(1))
+
+        if min(rail_width, rail_length, rail_height, block_length, pitch, hole_diameter) <= 0:
+            raise ValueError("Dimensions must be positive")
+        if height <= rail_height:
+            raise ValueError("H must exceed the rail height H1")
+        if num_blocks < 0 or num_blocks * block_length > rail_length:
+            raise ValueError("Blocks do not fit on the rail: NOB x L1 must not exceed LS")
+
+        end_distance = geometry_params.get('G')
+        return {
+            'W': rail_width,
+            'LS': rail_length,
+            'H': height,
+            'H1': rail_height,
+            'L1': block_length,
+            'B': block_width,
+            'F': pitch,
+            'G': float(end_distance) if end_distance not in (None, "") else None,
+            'D': hole_diameter,
+            'NOB': num_blocks,
+        }
+
+    def hole_centers(self, inputs: Dict[str, Any]) -> np.ndarray:
+        """Z positions of the rail mounting holes (pitch F, first hole at G or pattern centred)."""
+        length, pitch = inputs['LS'], inputs['F']
+        min_end = inputs['D']
+        if inputs['G'] is not None:
+            first = max(inputs['G'], min_end)
+            count = int(np.floor((length - first - min_end) / pitch)) + 1
+        else:
+            count = int(np.floor((length - 2 * min_end) / pitch)) + 1
+            first = (length - (count - 1) * pitch) / 2
+        if count <= 0:
+            return np.zeros(0, dtype=np.float32)
+        return (first + pitch * np.arange(count) - length / 2).astype(np.float32)
+
+    def block_centers(self, inputs: Dict[str, Any]) -> np.ndarray:
+        """Z positions of the carriages, evenly spaced like the DXF drawing."""
+        num_blocks, length, block_length = inputs['NOB'], inputs['LS'], inputs['L1']
+        spacing = (length - num_blocks * block_length) / (num_blocks + 1)
+        i = np.arange(num_blocks)
+        return -length / 2 + spacing * (i + 1) + block_length * (i + 0.5)
+
+    def solid_parts(self, inputs: Dict[str, Any]) -> List[Tuple[str, MeshData, Optional[np.ndarray]]]:
+        """
+        Meshes of a linear guide for normalized inputs (see model_inputs).
+
+        Shared by the GLB model and the format-agnostic geometry (STL export).
+
+        Returns:
+            List: (name, mesh, (k, 3) instance translations or None for a
+            single part at the origin); the carriage mesh is built once and
+            placed NOB times
+        """
+        holes = self.hole_centers(inputs)
+        radius = inputs['D'] / 2
+        # Keep each hole cell inside its pitch and the rail ends
+        cell_length = min(inputs['W'], inputs['F'])
+        if len(holes):
+            end_room = 2 * (inputs['LS'] / 2 - np.abs(holes).max())
+            cell_length = min(cell_length, float(end_room))
+        radius = min(radius, 0.4 * min(inputs['W'], cell_length))
+
+        parts = [(
+            "rail",
+            rail_with_holes(inputs['W'], inputs['H1'], inputs['LS'], holes, radius, cell_length, self.HOLE_SEGMENTS),
+            None
+        )]
+        if inputs['NOB']:
+            translations = np.zeros((inputs['NOB'], 3), dtype=np.float32)
+            translations[:, 2] = self.block_centers(inputs)
+            parts.append((
+                "carriage",
+                carriage(inputs['B'], inputs['L1'], inputs['W'], inputs['H1'], inputs['H1'] * 0.35, inputs['H']),
+                translations
+            ))
+        return parts
+
+    def build_linear_guide(self, inputs: Dict[str, Any]) -> GLBBuilder:
+        """
+        Build the GLB scene for normalized inputs (see model_inputs).
+
+        The carriage mesh is stored once and instanced by NOB nodes.
+
+        Returns:
+            GLBBuilder: Scene ready to write
+        """
+        builder = GLBBuilder()
+        materials = {
+            "rail": builder.add_material("rail", self.COLOR_RAIL, metallic=0.8, roughness=0.35),
+            "carriage": builder.add_material("carriage", self.COLOR_CARRIAGE, metallic=0.3, roughness=0.5),
+        }
+        root = builder.add_node("linear_guide")
+        for name, mesh, translations in self.solid_parts(inputs):
+            mesh_index = builder.add_mesh(name, *mesh, material=materials[name])
+            if translations is None:
+                builder.add_node(name, mesh=mesh_index, parent=root)
+                continue
+            for i, translation in enumerate(translations):
+                builder.add_node(f"{name}_{i + 1}", mesh=mesh_index, translation=translation, parent=root)
+        return builder
+
+
+# Singleton instance for easy import
+model_generator = LinearGuideModelGenerator()
@@ -0,0 +1,367 @@
+"""
+Metrics - In-process counters and histograms in the Prometheus text format
+Path: app/core/metrics.py
+
+A deliberately small registry (no prometheus_client dependency): recording a
+sample is a dict lookup and a few additions under a per-metric lock, cheap
+enough to leave on in production. Export jobs run in worker processes, so
+workers drain what they recorded and the job queue merges it into the
+parent's registry when the job finishes (see app/core/job_queue.py).
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+# Default latency buckets (seconds): sub-millisecond to tens of seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Finer buckets for steps inside one request (CAD phases, SQL statements)
+PHASE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def label_sets(self) -> List[LabelValues]:
+        with self._lock:
+            return list(self._values)
+
+    def lines(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+    def drain(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[LabelValues, float]) -> None:
+        with self._lock:
+            for labels, value in values.items():
+                self._values[labels] = self._values.get(labels, 0) + value
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (last = +Inf, not cumulative), sum]
+        self._values: Dict[LabelValues, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def lines(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._values.items())
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}"
+
+    def drain(self) -> Dict[LabelValues, List[Any]]:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def merge(self, values: Dict[LabelValues, List[Any]]) -> None:
+        with self._lock:
+            for labels, (counts, total) in values.items():
+                entry = self._values.get(labels)
+                if entry is None:
+                    entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+                entry[0] = [a + b for a, b in zip(entry[0], counts)]
+                entry[1] += total
+
+
+class Gauge:
+    """Value read from a callback when metrics are rendered (e.g. queue depth)."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        labelnames: Sequence[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+
+    def lines(self) -> Iterator[str]:
+        for labels, value in self.collect():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Named metrics of this process, rendered in the Prometheus text format."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        collect: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self._register(Gauge(name, documentation, collect, labelnames))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.lines())
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, Any]:
+        """Take (and reset) the samples recorded since the last drain, e.g. in a worker process."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        drained = {}
+        for metric in metrics:
+            if isinstance(metric, (Counter, Histogram)):
+                values = metric.drain()
+                if values:
+                    drained[metric.name] = values
+        return drained
+
+    def merge(self, drained: Optional[Dict[str, Any]]) -> None:
+        """Add samples drained from another process."""
+        for name, values in (drained or {}).items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(values)
+
+
+# Singleton instance for easy import
+metrics = MetricsRegistry(enabled=settings.METRICS_ENABLED)
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests by route template and status code", ("method", "route", "status")
+)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, until the body is sent", ("method", "route")
+)
+cad_phase_duration = metrics.histogram(
+    "cad_phase_duration_seconds", "Time spent in each phase of CAD generation", ("phase",), buckets=PHASE_BUCKETS
+)
+db_queries = metrics.counter(
+    "db_queries_total", "SQL statements executed, by statement type", ("statement",)
+)
+db_query_duration = metrics.histogram(
+    "db_query_duration_seconds", "SQL statement execution time, by statement type", ("statement",), buckets=PHASE_BUCKETS
+)
+cache_requests = metrics.counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit or miss)", ("cache", "result")
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count one cache lookup (hit ratio = hit / (hit + miss))."""
+    if metrics.enabled:
+        cache_requests.inc(1, cache, "hit" if hit else "miss")
+
+
+def cache_hit_ratios() -> Iterator[Tuple[LabelValues, float]]:
+    """Hit ratio per cache, from the cache_requests_total counters."""
+    caches = sorted({labels[0] for labels in cache_requests.label_sets()})
+    for cache in caches:
+        hits, misses = cache_requests.value(cache, "hit"), cache_requests.value(cache, "miss")
+        yield (cache,), hits / (hits + misses) if hits + misses else 0.0
+
+
+metrics.gauge("cache_hit_ratio", "Share of cache lookups that hit, since process start", cache_hit_ratios, ("cache",))
+
+
+@contextmanager
+def cad_phase(phase: str) -> Iterator[None]:
+    """Time one phase of CAD generation (document, layers, geometry, entities, dimensions, texts, save)."""
+    if not metrics.enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        cad_phase_duration.observe(time.perf_counter() - start, phase)
+
+
+# =============================================================================
+# SQLALCHEMY
+# =============================================================================
+
+_STATEMENT_TYPE = re.compile(r"\s*(\w+)")
+_STATEMENT_TYPES = {"select", "insert", "update", "delete", "pragma", "create", "alter", "with"}
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    match = _STATEMENT_TYPE.match(statement)
+    kind = match.group(1).lower() if match else "other"
+    if kind not in _STATEMENT_TYPES:
+        kind = "other"
+    db_queries.inc(1, kind)
+    db_query_duration.observe(elapsed, kind)
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every SQL statement run through a (sync) Engine."""
+    if not metrics.enabled:
+        return
+    from sqlalchemy import event
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# =============================================================================
+# ASGI MIDDLEWARE
+# =============================================================================
+
+class MetricsMiddleware:
+    """
+    Records latency and status of every HTTP request.
+
+    Requests are labelled with the matched route template (/api/v1/exports/{export_id})
+    so label cardinality stays bounded; unmatched paths share one label.
+    A plain ASGI middleware: streaming bodies pass through untouched and
+    the duration covers the whole response, not just the handler.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            template = getattr(route, "path_format", None) or getattr(route, "path", None) or "<unmatched>"
+            method = scope.get("method", "")
+            http_requests.inc(1, method, template, str(status_code))
+            http_request_duration.observe(elapsed, method, template)
@@ -0,0 +1,248 @@
+"""
+Model Stretch - Feature-preserving resizing of catalog GLBs along their length
+Path: app/core/model_stretch.py
+
+A catalog rail is an extrusion interrupted by features (mounting holes,
+chamfered ends). Scaling it uniformly turns round holes into ovals, so the
+length axis is split into zones instead:
+
+- rigid zones hold geometry (ends, holes) and are only translated
+- stretchable zones are vertex-free spans crossed only by faces parallel to
+  the axis, so elongating them leaves every face normal unchanged
+
+The classification is computed once per base model (StretchTemplate) and
+kept in a small LRU; a resize is then one vectorized lookup per vertex.
+"""
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from app.core.glb_optimizer import Primitive, build_optimized, load_primitives
+from app.core.glb_reader import GLBDocument
+from app.core.glb_writer import MODE_TRIANGLES, GLBBuilder
+
+# Bump when the stretch output changes for the same inputs
+STRETCH_REVISION = 1
+
+# Meshes spanning at least this share of the model's length are stretched
+# (the rail); shorter ones (carriages, end seals) are moved as rigid units
+SPAN_SHARE = 0.95
+# Vertex-free gaps shorter than this share of the length belong to a feature
+FEATURE_GAP = 0.02
+# Largest axis component of the unit normal of a face crossing a stretchable
+# zone; steeper faces (chamfers, cones) would change angle when stretched
+SLOPE_TOLERANCE = 1e-3
+
+AXIS_NAMES = "xyz"
+
+
+class StretchTemplate:
+    """
+    Zone classification of one base model.
+
+    Attributes:
+        axis: Index of the length axis (0-2)
+        knots: Zone boundaries along the axis, ascending (len = zones + 1)
+        stretchable: Per-zone flag, True for zones that elongate
+    """
+
+    def __init__(self, path: Path):
+        """
+        Decode a GLB and classify its vertices.
+
+        Raises:
+            ValueError: If the model has rotated mesh nodes or no stretchable zone
+        """
+        self.path = path
+        self.doc = GLBDocument(path)
+        self.meshes = load_primitives(self.doc)
+        self._check_node_transforms()
+
+        bounds = [self._bounds(mesh) for mesh in self.meshes]
+        lower = np.min([b[0] for b in bounds], axis=0)
+        upper = np.max([b[1] for b in bounds], axis=0)
+        self.axis = int(np.argmax(upper - lower))
+        extent = float(upper[self.axis] - lower[self.axis])
+        if extent <= 0:
+            raise ValueError(f"{path.name} has no extent to stretch")
+
+        spans = [float(b[1][self.axis] - b[0][self.axis]) for b in bounds]
+        self.stretched_meshes = [i for i, span in enumerate(spans) if span >= SPAN_SHARE * extent]
+        stretched = [p for i in self.stretched_meshes for p in self.meshes[i]]
+        coords = np.concatenate([p.attributes["POSITION"][:, self.axis] for p in stretched]).astype(np.float64)
+
+        self.knots, self.stretchable = self._classify(stretched, np.unique(coords), extent)
+        if not self.stretchable.any():
+            raise ValueError(f"{path.name} has no stretchable zone along its {AXIS_NAMES[self.axis]} axis")
+
+        # Per-vertex zone and offset inside it, for all stretched primitives at once
+        self._segment = np.clip(np.searchsorted(self.knots, coords, side="right") - 1, 0, len(self.stretchable) - 1)
+        self._local = coords - self.knots[self._segment]
+        self._splits = np.cumsum([p.vertex_count for p in stretched])[:-1]
+
+        # Rigid meshes follow the zone their centre sits in
+        self.rigid_centers = {
+            i: float((b[0][self.axis] + b[1][self.axis]) / 2)
+            for i, b in enumerate(bounds) if i not in self.stretched_meshes
+        }
+
+    @staticmethod
+    def _bounds(mesh: List[Primitive]) -> Tuple[np.ndarray, np.ndarray]:
+        positions = np.concatenate([p.attributes["POSITION"] for p in mesh])
+        return positions.min(axis=0), positions.max(axis=0)
+
+    def _check_node_transforms(self) -> None:
+        """Zones are computed in mesh space, so mesh nodes may translate but not rotate."""
+        nodes = self.doc.gltf.get("nodes", [])
+        for index, matrix in self.doc.world_matrices().items():
+            if "mesh" not in nodes[index]:
+                continue
+            linear = matrix[:3, :3]
+            if not np.allclose(linear, np.diag(np.diag(linear))):
+                raise ValueError(f"{self.path.name} has rotated mesh nodes, which cannot be stretched")
+
+    def _classify(
+        self,
+        primitives: List[Primitive],
+        coords: np.ndarray,
+        extent: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Split the axis into rigid and stretchable zones.
+
+        Candidate zones are the vertex-free gaps wider than FEATURE_GAP; a
+        candidate is rejected if a face crossing it is not parallel to the
+        axis, since stretching would tilt that face.
+        """
+        gaps = np.diff(coords)
+        candidate = gaps > FEATURE_GAP * extent
+
+        # Count, per gap, the crossing faces that are not parallel to the axis
+        blocked = np.zeros(len(coords), dtype=np.int64)
+        for primitive in primitives:
+            if primitive.mode != MODE_TRIANGLES:
+                continue
+            corners = primitive.attributes["POSITION"][primitive.indices.reshape(-1, 3)].astype(np.float64)
+            normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+            areas = np.linalg.norm(normals, axis=1)
+            slanted = np.abs(normals[:, self.axis]) > SLOPE_TOLERANCE * np.maximum(areas, 1e-30)
+            along = corners[slanted][:, :, self.axis]
+            first = np.searchsorted(coords, along.min(axis=1))
+            last = np.searchsorted(coords, along.max(axis=1))
+            np.add.at(blocked, first, 1)
+            np.add.at(blocked, last, -1)
+        candidate &= np.cumsum(blocked)[:-1] == 0
+
+        # Zones alternate rigid/stretchable; a rigid zone may be a single plane
+        knots = [coords[0]]
+        stretchable = []
+        for gap in np.flatnonzero(candidate):
+            knots += [coords[gap], coords[gap + 1]]
+            stretchable += [False, True]
+        knots.append(coords[-1])
+        stretchable.append(False)
+        return np.asarray(knots, dtype=np.float64), np.asarray(stretchable)
+
+    @property
+    def base_length(self) -> float:
+        return float(self.knots[-1] - self.knots[0])
+
+    @property
+    def min_length(self) -> float:
+        """Combined length of the rigid zones, which the model cannot shrink below."""
+        widths = np.diff(self.knots)
+        return float(widths[~self.stretchable].sum())
+
+    def zones(self) -> List[Dict[str, Any]]:
+        """Zones as JSON-ready dicts (start, end, stretchable)."""
+        return [
+            {"start": float(start), "end": float(end), "stretchable": bool(flag)}
+            for start, end, flag in zip(self.knots[:-1], self.knots[1:], self.stretchable)
+        ]
+
+    def axis_map(self, length: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        New zone boundaries and per-zone scale factors for a target length.
+
+        Stretchable zones share the length change in proportion to their
+        width, so hole spacing stays regular; the model keeps its centre.
+
+        Raises:
+            ValueError: If the length leaves no room for the stretchable zones
+        """
+        if length <= self.min_length:
+            raise ValueError(
+                f"Length must be greater than {self.min_length:g} (the fixed features of {self.path.name})"
+            )
+        widths = np.diff(self.knots)
+        factor = (length - self.min_length) / widths[self.stretchable].sum()
+        scales = np.where(self.stretchable, factor, 1.0)
+        center = (self.knots[0] + self.knots[-1]) / 2
+        new_knots = np.concatenate([[center - length / 2], center - length / 2 + np.cumsum(widths * scales)])
+        return new_knots, scales
+
+    def stretch(self, length: float) -> List[List[Primitive]]:
+        """Copy of the meshes with the stretched axis remapped to `length`."""
+        new_knots, scales = self.axis_map(length)
+        coords = new_knots[self._segment] + self._local * scales[self._segment]
+        moved = iter(np.split(coords, self._splits))
+
+        meshes = []
+        for index, mesh in enumerate(self.meshes):
+            if index in self.stretched_meshes:
+                values = [next(moved) for _ in mesh]
+            else:
+                center = self.rigid_centers[index]
+                zone = int(np.clip(np.searchsorted(self.knots, center, side="right") - 1, 0, len(scales) - 1))
+                shift = new_knots[zone] + (center - self.knots[zone]) * scales[zone] - center
+                values = [p.attributes["POSITION"][:, self.axis] + shift for p in mesh]
+
+            stretched = []
+            for primitive, axis_values in zip(mesh, values):
+                positions = primitive.attributes["POSITION"].copy()
+                positions[:, self.axis] = axis_values
+                stretched.append(Primitive(
+                    {**primitive.attributes, "POSITION": positions},
+                    primitive.indices, primitive.material, primitive.mode
+                ))
+            meshes.append(stretched)
+        return meshes
+
+    def build(self, length: float) -> GLBBuilder:
+        """GLB of the model stretched to `length`, keeping its scene graph and materials."""
+        return build_optimized(self.doc, self.stretch(length), quantize=False)
+
+
+# (path, mtime_ns, size) -> template, bounded LRU
+_TEMPLATE_CACHE_SIZE = 16
+_templates: "OrderedDict[Tuple[str, int, int], StretchTemplate]" = OrderedDict()
+_templates_lock = threading.Lock()
+
+
+def get_stretch_template(path: Path) -> StretchTemplate:
+    """
+    Classification of a base model, computed on first use.
+
+    Templates are keyed by (path, mtime, size), so replacing a catalog file
+    is picked up without a restart.
+
+    Raises:
+        ValueError: If the model cannot be stretched
+    """
+    stat_result = path.stat()
+    key = (str(path), stat_result.st_mtime_ns, stat_result.st_size)
+    with _templates_lock:
+        template = _templates.get(key)
+        if template is not None:
+            _templates.move_to_end(key)
+            return template
+
+    template = StretchTemplate(path)
+    with _templates_lock:
+        _templates[key] = template
+        if len(_templates) > _TEMPLATE_CACHE_SIZE:
+            _templates.popitem(last=False)
+    return template
@@ -0,0 +1,272 @@
+"""
+Request Profiling - Opt-in sampling profiler with stored flame-graph stacks
+Path: app/core/profiling.py
+
+A request is profiled when it carries the PROFILING_HEADER (whose value
+must equal ADMIN_TOKEN when one is configured) or is picked by
+PROFILING_SAMPLE_RATE. While it runs, a sampler thread records the Python
+stacks of every busy thread every PROFILING_INTERVAL_MS; idle threads
+(waiting on a lock, queue or selector) are skipped. A statistical
+profiler is used rather than cProfile, because routes hand database work to
+threadpool threads that a per-thread deterministic profiler would miss.
+Concurrent requests also show up in the stacks, and export jobs running in
+worker processes do not.
+
+Profiles are stored under PROFILES_DIR as collapsed stacks
+(`thread;outer;...;leaf count`, readable by flamegraph.pl and speedscope)
+plus a JSON sidecar, named by request ID; a client ID that is already
+taken gets a random suffix, so a request can't overwrite another profile.
+Retention is bounded by count and age.
+"""
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+BACKEND_DIR = Path(__file__).parent.parent.parent
+
+REQUEST_ID_HEADER = "X-Request-ID"
+# Accepted client-supplied request IDs (they become file names)
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# A thread whose innermost frame is in one of these modules is waiting, not working
+IDLE_MODULES = ("threading.py", "selectors.py", "queue.py", "socket.py")
+
+
+def _frame_label(frame) -> str:
+    """'function (path:line)' with site-packages and backend prefixes stripped."""
+    filename = frame.f_code.co_filename
+    for marker in ("site-packages" + os.sep, str(BACKEND_DIR) + os.sep):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            break
+    else:
+        filename = os.path.basename(filename)
+    return f"{frame.f_code.co_name} ({filename}:{frame.f_code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stacks of all busy threads on a background thread."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval_seconds):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or frame.f_code.co_filename.endswith(IDLE_MODULES):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format, one 'frames count' line each."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """
+    Profiles on disk, named by request ID.
+
+    Each profile is <id>.collapsed plus <id>.json (request metadata). After
+    every save the oldest profiles beyond `max_profiles` or older than
+    `max_age_seconds` are removed.
+    """
+
+    def __init__(self, root_dir: Path, max_profiles: int, max_age_seconds: int):
+        self.root_dir = root_dir
+        self.max_profiles = max_profiles
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+
+    def _path(self, request_id: str, suffix: str) -> Path:
+        if not REQUEST_ID_PATTERN.match(request_id):
+            raise ValueError(f"Invalid request ID: {request_id!r}")
+        return self.root_dir / f"{request_id}{suffix}"
+
+    def reserve(self, request_id: str) -> str:
+        """Claim a profile name: the request ID, or the ID plus a random suffix if it is taken."""
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        name = request_id
+        while True:
+            try:
+                # The stacks file doubles as the claim; save() replaces it
+                os.close(os.open(self._path(name, ".collapsed"), os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return name
+            except FileExistsError:
+                name = f"{request_id[:55]}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, request_id: str, collapsed: str, meta: Dict[str, Any]) -> None:
+        """Write a profile (stacks first, so a listed profile is always complete) and prune."""
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        for suffix, content in ((".collapsed", collapsed), (".json", json.dumps(meta))):
+            path = self._path(request_id, suffix)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            os.replace(tmp_path, path)
+        self.prune()
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of stored profiles, newest first."""
+        profiles = []
+        for path in self.root_dir.glob("*.json"):
+            try:
+                profiles.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # removed or being replaced concurrently
+        return sorted(profiles, key=lambda meta: meta["created_at"], reverse=True)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata of one profile, or None."""
+        try:
+            return json.loads(self._path(request_id, ".json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def stacks_path(self, request_id: str) -> Path:
+        """Collapsed-stacks file of a profile."""
+        return self._path(request_id, ".collapsed")
+
+    def delete(self, request_id: str) -> bool:
+        """Remove a profile; False if it didn't exist."""
+        removed = False
+        for suffix in (".json", ".collapsed"):
+            try:
+                self._path(request_id, suffix).unlink()
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def prune(self) -> int:
+        """Enforce the count and age limits; returns the number of profiles removed."""
+        with self._lock:
+            entries = []
+            for path in self.root_dir.glob("*.json"):
+                try:
+                    entries.append((path.stat().st_mtime, path.stem))
+                except FileNotFoundError:
+                    continue
+            entries.sort(reverse=True)
+            cutoff = time.time() - self.max_age_seconds if self.max_age_seconds > 0 else None
+            expired = [
+                request_id for i, (mtime, request_id) in enumerate(entries)
+                if i >= self.max_profiles or (cutoff is not None and mtime < cutoff)
+            ]
+            for request_id in expired:
+                self.delete(request_id)
+            return len(expired)
+
+
+def _should_profile(headers: Dict[str, str]) -> Optional[str]:
+    """Why a request is profiled ('header' or 'sample'), or None."""
+    requested = headers.get(settings.PROFILING_HEADER.lower())
+    if requested is not None and (
+        not settings.ADMIN_TOKEN or hmac.compare_digest(requested.encode("latin-1"), settings.ADMIN_TOKEN.encode())
+    ):
+        return "header"
+    if settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles opted-in requests and stores the result under their request ID.
+
+    The ID comes from a well-formed X-Request-ID header (suffixed if a
+    profile already has it) or is generated, and is returned in the
+    X-Request-ID response header of profiled requests.
+    """
+
+    def __init__(self, app, store: Optional[ProfileStore] = None):
+        self.app = app
+        self.store = store or profile_store
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        trigger = _should_profile(headers)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = headers.get(REQUEST_ID_HEADER.lower(), "")
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        request_id = await run_in_threadpool(self.store.reserve, request_id)
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.lower().encode("latin-1"), request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        sampler = StackSampler(settings.PROFILING_INTERVAL_MS / 1000)
+        started_at = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            sampler.stop()
+            meta = {
+                "request_id": request_id,
+                "method": scope.get("method", ""),
+                "path": scope.get("path", ""),
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status_code,
+                "trigger": trigger,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "samples": sampler.samples,
+                "interval_ms": settings.PROFILING_INTERVAL_MS,
+                "created_at": started_at.isoformat(),
+            }
+            await run_in_threadpool(self.store.save, request_id, sampler.collapsed(), meta)
+
+
+# Singleton instance for easy import
+profile_store = ProfileStore(
+    root_dir=BACKEND_DIR / settings.PROFILES_DIR,
+    max_profiles=settings.PROFILES_MAX_COUNT,
+    max_age_seconds=settings.PROFILES_MAX_AGE_SECONDS
+)
@@ -0,0 +1,223 @@
+"""
+Response Cache - Serialised API responses with ETags and shared invalidation
+Path: app/core/response_cache.py
+
+GET /configurations/{id} is polled heavily; its serialised JSON is kept in
+a bounded in-process LRU together with a strong ETag, so a hit needs
+neither a database session nor pydantic serialisation.
+
+Writes invalidate entries precisely (configuration_service.update_configuration
+and delete_configuration). Each process has its own cache, so with several
+server processes an invalidation must reach the others: the cache publishes
+it on an InvalidationBus and applies what the bus delivers. The default bus
+is process-local. Set CONFIG_CACHE_INVALIDATION_BUS to "redis" (requires
+the redis package and CONFIG_CACHE_REDIS_URL) or to a "module:Class" of
+your own bus; without one, multi-process deployments should bound
+staleness with CONFIG_CACHE_TTL_SECONDS.
+"""
+import hashlib
+import importlib
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional
+
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+# (namespace, keys) handed to InvalidationBus subscribers
+InvalidationCallback = Callable[[str, List[Hashable]], None]
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    stored_at: float
+
+
+class InvalidationBus:
+    """
+    Carries invalidations between the processes sharing a cache.
+
+    Subclasses override publish() and start(), and deliver the keys other
+    processes published to every subscribed callback. This base class is the
+    process-local bus: nothing leaves the process.
+    """
+
+    def __init__(self):
+        self._subscribers: List[InvalidationCallback] = []
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        self._subscribers.append(callback)
+
+    def start(self) -> None:
+        """Start receiving invalidations from other processes (called from the app lifespan)."""
+
+    def publish(self, namespace: str, keys: List[Hashable]) -> None:
+        """Announce that keys of a cache namespace changed (the caller has already dropped them)."""
+
+    def deliver(self, namespace: str, keys: List[Hashable]) -> None:
+        """Hand keys received from another process to the subscribers."""
+        for callback in self._subscribers:
+            callback(namespace, keys)
+
+    def close(self) -> None:
+        """Stop background delivery, if any."""
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Invalidations over a Redis pub/sub channel (optional `redis` dependency)."""
+
+    CHANNEL = "skf-configurator:cache-invalidation"
+
+    def __init__(self, url: str):
+        super().__init__()
+        import redis  # optional dependency, only needed for this bus
+
+        self._origin = uuid.uuid4().hex
+        self._client = redis.Redis.from_url(url)  # connects on first use
+        self._thread = None
+
+    def start(self) -> None:
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.CHANNEL: self._on_message})
+        self._thread = pubsub.run_in_thread(sleep_time=0.5, daemon=True)
+
+    def publish(self, namespace: str, keys: List[Hashable]) -> None:
+        message = {"origin": self._origin, "namespace": namespace, "keys": list(keys)}
+        try:
+            self._client.publish(self.CHANNEL, json.dumps(message))
+        except Exception:
+            logger.exception("Failed to publish cache invalidation")
+
+    def _on_message(self, message: Dict[str, Any]) -> None:
+        payload = json.loads(message["data"])
+        if payload["origin"] != self._origin:
+            self.deliver(payload["namespace"], payload["keys"])
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+
+def create_invalidation_bus() -> InvalidationBus:
+    """Bus selected by CONFIG_CACHE_INVALIDATION_BUS ("", "redis" or "module:Class")."""
+    target = settings.CONFIG_CACHE_INVALIDATION_BUS
+    if not target:
+        return InvalidationBus()
+    if target == "redis":
+        return RedisInvalidationBus(settings.CONFIG_CACHE_REDIS_URL)
+    module_name, class_name = target.split(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class ResponseCache:
+    """
+    Bounded LRU of serialised responses, keyed by resource ID.
+
+    Every invalidation bumps a generation counter; put() only stores a body
+    if no invalidation happened since it was read, so a response read
+    before a concurrent update can never be cached after it.
+    """
+
+    def __init__(self, namespace: str, max_entries: int, ttl_seconds: float = 0, bus: Optional[InvalidationBus] = None):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.bus = bus or InvalidationBus()
+        self.bus.subscribe(self._on_remote_invalidation)
+
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def etag_for(body: bytes) -> str:
+        """Strong ETag of a response body."""
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def generation(self) -> int:
+        """Current generation; take it before reading a resource and pass it to put()."""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Cached response, or None on a miss (or an expired entry)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds > 0 and time.monotonic() - entry.stored_at > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        record_cache_lookup(self.namespace, entry is not None)
+        return entry
+
+    def put(self, key: Hashable, body: bytes, generation: int) -> CachedResponse:
+        """
+        Store a serialised response read under `generation`.
+
+        Returns:
+            CachedResponse: The entry (returned even when it was too late to store)
+        """
+        entry = CachedResponse(body, self.etag_for(body), time.monotonic())
+        if self.max_entries <= 0:
+            return entry
+        with self._lock:
+            if self._generation == generation:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop keys here and announce it to the other processes."""
+        self._drop(keys)
+        self.bus.publish(self.namespace, list(keys))
+
+    def _drop(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+            self._generation += 1
+
+    def _on_remote_invalidation(self, namespace: str, keys: List[Hashable]) -> None:
+        if namespace == self.namespace:
+            self._drop(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the number of cached responses."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+# Singleton instance for easy import
+configuration_cache = ResponseCache(
+    namespace="configuration",
+    max_entries=settings.CONFIG_CACHE_SIZE,
+    ttl_seconds=settings.CONFIG_CACHE_TTL_SECONDS,
+    bus=create_invalidation_bus()
+)
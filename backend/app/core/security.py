@@ -0,0 +1,26 @@
+"""
+Security - Access checks for administrative routes
+Path: app/core/security.py
+"""
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency guarding admin routes with the ADMIN_TOKEN setting.
+    
+    When ADMIN_TOKEN is empty the routes are open (development); otherwise
+    the X-Admin-Token header must match it.
+    """
+    if not settings.ADMIN_TOKEN:
+        return
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required (X-Admin-Token)"
+        )
@@ -0,0 +1,263 @@
+"""
+Export Storage - Layout and lifecycle of generated artifacts on disk
+Path: app/core/storage.py
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.cad_engine import DXFGenerator
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.db.models import Export
+from app.utils.compression import PRECOMPRESSED_SUFFIXES, remove_precompressed_variants, variant_path
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_URL_PREFIX = "/downloads/"
+
+
+def shard_relative(filename: str, digest: Optional[str] = None) -> str:
+    """
+    Place a file in two levels of hash-named subdirectories (ab/cd/<filename>).
+    
+    With 65,536 leaf directories, a million artifacts average ~15 files per
+    directory, so listings and lookups stay fast.
+    
+    Args:
+        filename: Final file name
+        digest: Hex digest to shard by (default: SHA-256 of the filename)
+        
+    Returns:
+        str: Relative path with the shard directories prepended
+    """
+    digest = digest or hashlib.sha256(filename.encode("utf-8")).hexdigest()
+    return f"{digest[:2]}/{digest[2:4]}/{filename}"
+
+
+class ExportStorage:
+    """
+    Retention and orphan cleanup for everything under EXPORT_DIR.
+    
+    The last download of an artifact is recorded in its access time (set
+    explicitly, so it works on noatime mounts and across worker processes).
+    A sweep then:
+    1. removes orphans: files no export row references (after a grace period),
+       except under directories registered as unreferenced caches
+    2. expires files not downloaded for `max_age_days`
+    3. evicts least recently downloaded files until under `max_bytes`
+    Export rows whose file was expired or evicted are marked `expired`.
+    """
+    
+    def __init__(
+        self,
+        root_dir: Path,
+        max_bytes: int,
+        max_age_days: int,
+        orphan_grace_seconds: int
+    ):
+        """Configure the retention policy."""
+        self.root_dir = root_dir
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.orphan_grace_seconds = orphan_grace_seconds
+        # caches whose files are looked up by key, never through an export row
+        self.unreferenced_dirs: List[Path] = []
+        
+        self._sweep_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        self.last_report: Optional[Dict[str, Any]] = None
+    
+    def url_for(self, path: Path) -> str:
+        """Download URL of a file under the storage root."""
+        return DOWNLOAD_URL_PREFIX + path.relative_to(self.root_dir).as_posix()
+    
+    def path_for_url(self, file_path: str) -> Path:
+        """File under the storage root for a download URL."""
+        return self.root_dir / file_path.removeprefix(DOWNLOAD_URL_PREFIX)
+    
+    def register_unreferenced_dir(self, path: Path) -> None:
+        """Exempt a cache directory from orphan removal (age and size limits still apply)."""
+        self.unreferenced_dirs.append(path)
+    
+    def record_access(self, path: Path) -> None:
+        """Mark an artifact as just used (mtime, and so the ETag, is kept)."""
+        try:
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except FileNotFoundError:
+            pass
+    
+    def _scan(self) -> List[Dict[str, Any]]:
+        """List primary artifacts with their size (including variants) and last use."""
+        variant_suffixes = tuple(PRECOMPRESSED_SUFFIXES.values())
+        artifacts = []
+        stack = [self.root_dir]
+        while stack:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(Path(entry.path))
+                    elif entry.name.startswith(".") or entry.name.endswith(variant_suffixes):
+                        continue  # temp files and variants follow their artifact
+                    elif entry.is_file(follow_symlinks=False):
+                        stat_result = entry.stat()
+                        path = Path(entry.path)
+                        size = stat_result.st_size
+                        for encoding in PRECOMPRESSED_SUFFIXES:
+                            variant = variant_path(path, encoding)
+                            if variant.exists():
+                                size += variant.stat().st_size
+                        artifacts.append({
+                            "path": path,
+                            "size": size,
+                            "modified": stat_result.st_mtime,
+                            "last_used": max(stat_result.st_atime, stat_result.st_mtime),
+                        })
+        return artifacts
+    
+    def _remove_stale_temp_files(self, now: float) -> int:
+        """Delete temp files left behind by crashed writers; return bytes reclaimed."""
+        reclaimed = 0
+        for path in self.root_dir.rglob(".*.tmp"):
+            try:
+                stat_result = path.stat()
+                if now - stat_result.st_mtime > self.orphan_grace_seconds:
+                    path.unlink()
+                    reclaimed += stat_result.st_size
+            except FileNotFoundError:
+                pass
+        return reclaimed
+    
+    def _remove(self, path: Path) -> None:
+        """Delete an artifact, its variants and any shard directories left empty."""
+        path.unlink(missing_ok=True)
+        remove_precompressed_variants(path)
+        
+        parent = path.parent
+        while parent != self.root_dir and self.root_dir in parent.parents:
+            try:
+                parent.rmdir()
+            except OSError:
+                break  # not empty (or already gone)
+            parent = parent.parent
+    
+    def sweep(self) -> Dict[str, Any]:
+        """
+        Run one retention and orphan-cleanup pass.
+        
+        Returns:
+            Dict: Report with counts per removal reason and bytes reclaimed
+        """
+        with self._sweep_lock:
+            started = time.perf_counter()
+            now = time.time()
+            
+            artifacts = self._scan()
+            bytes_before = sum(a["size"] for a in artifacts)
+            reclaimed = self._remove_stale_temp_files(now)
+            
+            db = SessionLocal()
+            try:
+                referenced: Set[Path] = {
+                    self.path_for_url(row.file_path)
+                    for row in db.query(Export.file_path)
+                    .filter(Export.file_path.isnot(None))
+                    .distinct()
+                }
+                
+                kept = []
+                orphans_removed = 0
+                for artifact in artifacts:
+                    is_orphan = artifact["path"] not in referenced and not any(
+                        directory in artifact["path"].parents for directory in self.unreferenced_dirs
+                    )
+                    if is_orphan and now - artifact["modified"] > self.orphan_grace_seconds:
+                        self._remove(artifact["path"])
+                        reclaimed += artifact["size"]
+                        orphans_removed += 1
+                    else:
+                        kept.append(artifact)
+                
+                # Least recently downloaded first
+                kept.sort(key=lambda a: a["last_used"])
+                expired: List[Path] = []
+                evicted: List[Path] = []
+                total = sum(a["size"] for a in kept)
+                max_age = self.max_age_days * 86400
+                for artifact in kept:
+                    if self.max_age_days and now - artifact["last_used"] > max_age:
+                        expired.append(artifact["path"])
+                    elif total > self.max_bytes:
+                        evicted.append(artifact["path"])
+                    else:
+                        continue
+                    self._remove(artifact["path"])
+                    total -= artifact["size"]
+                    reclaimed += artifact["size"]
+                
+                removed_urls = [self.url_for(path) for path in expired + evicted]
+                if removed_urls:
+                    db.query(Export)\
+                        .filter(Export.file_path.in_(removed_urls))\
+                        .update({"status": "expired", "file_path": None}, synchronize_session=False)
+                    db.commit()
+            finally:
+                db.close()
+            
+            report = {
+                "swept_at": datetime.utcnow(),
+                "files_scanned": len(artifacts),
+                "bytes_before": bytes_before,
+                "bytes_after": total,
+                "orphans_removed": orphans_removed,
+                "expired_removed": len(expired),
+                "evicted_removed": len(evicted),
+                "bytes_reclaimed": reclaimed,
+                "max_bytes": self.max_bytes,
+                "duration_ms": (time.perf_counter() - started) * 1000,
+            }
+            self.last_report = report
+            logger.info(
+                "Export storage sweep reclaimed %d bytes "
+                "(%d orphans, %d expired, %d evicted; %d bytes kept)",
+                reclaimed, orphans_removed, len(expired), len(evicted), total
+            )
+            return report
+    
+    def start_sweeper(self, interval_seconds: int) -> None:
+        """Run sweep() every `interval_seconds` in a daemon thread."""
+        if interval_seconds <= 0 or self._sweeper is not None:
+            return
+        self._stop.clear()
+        
+        def _loop() -> None:
+            while not self._stop.wait(interval_seconds):
+                try:
+                    self.sweep()
+                except Exception:
+                    logger.exception("Export storage sweep failed")
+        
+        self._sweeper = threading.Thread(target=_loop, name="export-storage-sweeper", daemon=True)
+        self._sweeper.start()
+    
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper."""
+        self._stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=5)
+            self._sweeper = None
+
+
+# Singleton instance for easy import
+export_storage = ExportStorage(
+    root_dir=DXFGenerator.EXPORT_DIR,
+    max_bytes=settings.EXPORT_STORAGE_MAX_BYTES,
+    max_age_days=settings.EXPORT_RETENTION_DAYS,
+    orphan_grace_seconds=settings.EXPORT_ORPHAN_GRACE_SECONDS
+)
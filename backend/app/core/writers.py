@@ -0,0 +1,281 @@
+"""
+Writers - Serialise a GeometryModel into export formats
+Path: app/core/writers.py
+
+Every writer consumes the shared geometry model (app/core/geometry.py), so
+a configuration exported in several formats is built once:
+
+- DXF          ASCII drawing (ezdxf, from the per-process prototype)
+- DXF_BINARY   the same drawing as binary DXF (smaller, faster to load)
+- SVG          plan view for browsers and documentation
+- STL          binary STL of the 3D solids, packed with NumPy
+
+The drawing formats honour a detail level (app/core/geometry.py
+DETAIL_LEVELS); STL always contains the complete solids.
+"""
+import io
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from app.core.cad_engine import dxf_generator
+from app.core.geometry import DEFAULT_DETAIL, LAYER_CENTERLINES, GeometryModel, get_detail_level
+from app.core.mesh_engine import LinearGuideModelGenerator
+from app.core.metrics import cad_phase
+from app.utils.streaming import DEFAULT_CHUNK_SIZE, iter_text_writer
+
+
+def _atomic_write(path: Path, data_chunks: Iterator[bytes]) -> None:
+    """Write chunks to a temp file next to path, then rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "wb") as f:
+        for chunk in data_chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+class FormatWriter:
+    """
+    Base class of export writers.
+
+    Attributes:
+        format: Export format name (Export.format)
+        suffix: File suffix of written artifacts
+        media_type: Content-Type when streamed
+        revision: Bump whenever the output changes so cached files are invalidated
+        uses_solids: Whether the output reads the 3D solids (and their inputs)
+        uses_detail: Whether the output depends on the detail level
+    """
+
+    format = ""
+    suffix = ""
+    media_type = "application/octet-stream"
+    revision = 1
+    uses_solids = False
+    uses_detail = False
+
+    def iter_bytes(self, geometry: GeometryModel, detail: str = DEFAULT_DETAIL) -> Iterator[bytes]:
+        """
+        Serialise a geometry model chunk by chunk.
+
+        Raises:
+            ValueError: If the geometry cannot be expressed in this format
+        """
+        raise NotImplementedError
+
+    def save(self, geometry: GeometryModel, path: Path, detail: str = DEFAULT_DETAIL) -> None:
+        """Write the serialised model to path atomically."""
+        with cad_phase("save"):
+            _atomic_write(path, self.iter_bytes(geometry, detail))
+
+
+class DXFWriter(FormatWriter):
+    """ASCII DXF drawing."""
+
+    format = "DXF"
+    suffix = ".dxf"
+    media_type = "application/dxf"
+    revision = dxf_generator.DRAWING_REVISION
+    uses_detail = True
+
+    def iter_bytes(self, geometry: GeometryModel, detail: str = DEFAULT_DETAIL) -> Iterator[bytes]:
+        doc = dxf_generator.render(geometry, detail)
+        return iter_text_writer(doc.write, encoding=doc.output_encoding, errors='dxfreplace')
+
+    def save(self, geometry: GeometryModel, path: Path, detail: str = DEFAULT_DETAIL) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        doc = dxf_generator.render(geometry, detail)
+        with cad_phase("save"):
+            doc.saveas(tmp_path)
+        os.replace(tmp_path, path)
+
+
+class BinaryDXFWriter(FormatWriter):
+    """Binary DXF: the same entities as DXF without text encoding of numbers."""
+
+    format = "DXF_BINARY"
+    suffix = ".dxf"
+    media_type = "application/dxf"
+    revision = dxf_generator.DRAWING_REVISION
+    uses_detail = True
+
+    def iter_bytes(self, geometry: GeometryModel, detail: str = DEFAULT_DETAIL) -> Iterator[bytes]:
+        buffer = io.BytesIO()
+        dxf_generator.render(geometry, detail).write(buffer, fmt="bin")
+        view = buffer.getbuffer()
+        for start in range(0, len(view), DEFAULT_CHUNK_SIZE):
+            yield bytes(view[start:start + DEFAULT_CHUNK_SIZE])
+
+
+class STLWriter(FormatWriter):
+    """
+    Binary STL of the 3D solids.
+
+    Triangles are packed into one structured array with the 50-byte STL
+    record layout and written straight from its buffer. Models are Y up;
+    STL consumers expect Z up, so the solids are rotated +90 deg about X.
+    """
+
+    format = "STL"
+    suffix = ".stl"
+    media_type = "model/stl"
+    revision = LinearGuideModelGenerator.MODEL_REVISION
+    uses_solids = True
+
+    RECORD = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+    HEADER = b"SKF Configurator binary STL".ljust(80, b"\0")
+
+    def records(self, geometry: GeometryModel) -> np.ndarray:
+        """(n,) RECORD array of all solid triangles."""
+        triangles = geometry.triangles()
+        # Y up -> Z up: (x, y, z) -> (x, -z, y)
+        z_up = np.empty_like(triangles)
+        z_up[..., 0] = triangles[..., 0]
+        z_up[..., 1] = -triangles[..., 2]
+        z_up[..., 2] = triangles[..., 1]
+
+        normals = np.cross(z_up[:, 1] - z_up[:, 0], z_up[:, 2] - z_up[:, 0])
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        np.divide(normals, lengths, out=normals, where=lengths > 0)
+
+        records = np.zeros(len(z_up), dtype=self.RECORD)
+        records["normal"] = normals
+        records["vertices"] = z_up
+        return records
+
+    def iter_bytes(self, geometry: GeometryModel, detail: str = DEFAULT_DETAIL) -> Iterator[bytes]:
+        records = self.records(geometry)
+        yield self.HEADER + struct.pack("<I", len(records))
+        view = memoryview(records).cast("B")
+        for start in range(0, len(view), DEFAULT_CHUNK_SIZE):
+            yield view[start:start + DEFAULT_CHUNK_SIZE]
+
+
+class SVGWriter(FormatWriter):
+    """Plan view as SVG (mm user units, Y flipped so the drawing reads like the DXF)."""
+
+    format = "SVG"
+    suffix = ".svg"
+    media_type = "image/svg+xml"
+    revision = 1
+    uses_detail = True
+
+    # AutoCAD Color Index -> RGB (7 is drawn black on a white page)
+    ACI_COLORS = {1: "#ff0000", 2: "#ffff00", 3: "#00a000", 4: "#00c0c0", 5: "#0000ff", 6: "#ff00ff", 7: "#000000"}
+    DASH_PATTERNS = {"CENTER": "12 3 3 3"}
+    MARGIN_SHARE = 0.05
+
+    def iter_bytes(self, geometry: GeometryModel, detail: str = DEFAULT_DETAIL) -> Iterator[bytes]:
+        yield self.render(geometry, detail).encode("utf-8")
+
+    def render(self, geometry: GeometryModel, detail: str = DEFAULT_DETAIL) -> str:
+        """The complete SVG document."""
+        level = get_detail_level(detail)
+        lower, upper = geometry.bounds_2d()
+        margin = float(max(upper - lower) * self.MARGIN_SHARE)
+        x0, y0 = lower[0] - margin, -upper[1] - margin
+        width, height = (upper - lower) + 2 * margin
+
+        by_layer: Dict[str, List[str]] = {}
+
+        def emit(layer: str, element: str) -> None:
+            by_layer.setdefault(layer, []).append(element)
+
+        for polyline in geometry.polylines:
+            points = " ".join(f"{_num(x)},{_num(-y)}" for x, y in polyline.points)
+            tag = "polygon" if polyline.closed else "polyline"
+            emit(polyline.layer, f'<{tag} points="{points}"/>')
+
+        for line in geometry.lines:
+            if line.layer == LAYER_CENTERLINES and not level.centerlines:
+                continue
+            dash = self.DASH_PATTERNS.get(line.linetype or "")
+            emit(line.layer, self._line(line.start, line.end, f' stroke-dasharray="{dash}"' if dash else ""))
+
+        for dim in geometry.dimensions:
+            direction = dim.direction
+            base = np.asarray(dim.base, dtype=np.float64)
+            q1 = base + direction * np.dot(np.subtract(dim.p1, base), direction)
+            q2 = base + direction * np.dot(np.subtract(dim.p2, base), direction)
+            emit(dim.layer, self._line(dim.p1, q1))
+            emit(dim.layer, self._line(dim.p2, q2))
+            emit(dim.layer, self._line(q1, q2))
+            mx, my = (q1 + q2) / 2
+            offset = dim.text_height * 0.5
+            normal = np.array([-direction[1], direction[0]])
+            tx, ty = np.array([mx, my]) + normal * offset
+            rotate = f' transform="rotate({_num(-dim.angle)} {_num(tx)} {_num(-ty)})"' if dim.angle else ""
+            emit(dim.layer, (
+                f'<text x="{_num(tx)}" y="{_num(-ty)}" font-size="{_num(dim.text_height)}" text-anchor="middle"'
+                f'{rotate} stroke="none" fill="currentColor">{_num(dim.measurement)}</text>'
+            ))
+
+        for hole in geometry.holes if level.holes else []:
+            x, y = hole.center
+            for diameter in filter(None, (hole.diameter, hole.counterbore_diameter)):
+                emit(hole.layer, f'<circle cx="{_num(x)}" cy="{_num(-y)}" r="{_num(diameter / 2)}"/>')
+            if level.centerlines:
+                mark = max(hole.diameter, hole.counterbore_diameter or 0) * 0.6
+                emit(LAYER_CENTERLINES, self._line((x - mark, y), (x + mark, y)))
+                emit(LAYER_CENTERLINES, self._line((x, y - mark), (x, y + mark)))
+
+        for text in geometry.texts if level.texts else []:
+            x, y = text.insert
+            emit(text.layer, (
+                f'<text x="{_num(x)}" y="{_num(-y)}" font-size="{_num(text.height)}" stroke="none" '
+                f'fill="currentColor">{escape(text.text)}</text>'
+            ))
+
+        groups = []
+        for layer, elements in by_layer.items():
+            color = self.ACI_COLORS.get(geometry.layers.get(layer, 7), "#000000")
+            # Outlines are stroked only; texts are filled with the layer colour instead
+            groups.append(f'<g id="{escape(layer)}" color="{color}" stroke="{color}" fill="none">{"".join(elements)}</g>')
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(width)}mm" height="{_num(height)}mm" '
+            f'viewBox="{_num(x0)} {_num(y0)} {_num(width)} {_num(height)}" '
+            f'stroke-width="{_num(max(width, height) / 2000)}" '
+            'font-family="sans-serif">\n'
+            + "\n".join(groups)
+            + "\n</svg>\n"
+        )
+
+    @staticmethod
+    def _line(start, end, extra: str = "") -> str:
+        return f'<line x1="{_num(start[0])}" y1="{_num(-start[1])}" x2="{_num(end[0])}" y2="{_num(-end[1])}"{extra}/>'
+
+
+def _num(value: float) -> str:
+    """SVG coordinate with float noise (e.g. cos(90 deg)) rounded away."""
+    return f"{round(float(value), 4) + 0.0:g}"
+
+
+WRITERS: Dict[str, FormatWriter] = {
+    writer.format: writer for writer in (DXFWriter(), BinaryDXFWriter(), SVGWriter(), STLWriter())
+}
+
+
+def normalize_format(export_format: str) -> str:
+    """Canonical format name ("dxf-binary" -> "DXF_BINARY")."""
+    return export_format.strip().upper().replace("-", "_")
+
+
+def get_writer(export_format: str) -> FormatWriter:
+    """
+    Writer for an export format.
+
+    Raises:
+        ValueError: If no writer supports the format
+    """
+    writer = WRITERS.get(normalize_format(export_format))
+    if writer is None:
+        raise ValueError(f"Unsupported export format {export_format!r}; supported: {', '.join(WRITERS)}")
+    return writer
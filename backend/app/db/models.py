@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
@@ -13,6 +13,10 @@ class Configuration(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # product family, key of the CAD generator registry (app/core/generators);
+    # NULL for rows created before it existed, which are linear guides
+    product_id = Column(String, nullable=True)
+    
     # application step (step 1)
     part_number = Column(String, nullable=False)
     surface_treatment = Column(String)
@@ -25,10 +29,21 @@ class Configuration(Base):
     
     # metadata
     status = Column(String, default="draft")  # draft, completed, exported
+    # canonical hash of the parameters (app/domain/configuration.py), unique
+    # so identical configurations are stored once; NULL until backfilled
+    fingerprint = Column(String, nullable=True)
 
     # relationships
     exports = relationship("Export", back_populates="configuration", cascade="all, delete-orphan")
 
+    # keyset pagination on (created_at, id), optionally filtered
+    __table_args__ = (
+        Index("ix_configurations_created_at_id", "created_at", "id"),
+        Index("ix_configurations_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_configurations_part_number_created_at_id", "part_number", "created_at", "id"),
+        Index("ux_configurations_fingerprint", "fingerprint", unique=True),
+    )
+
 
 class Export(Base):
     __tablename__ = "exports"
@@ -37,16 +52,33 @@ class Export(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # link to configuration
-    configuration_id = Column(Integer, ForeignKey("configurations.id"))
+    configuration_id = Column(Integer, ForeignKey("configurations.id"), index=True)
     
     # export details
     format = Column(String)  # "STEP", "IGES", "STL"
-    status = Column(String)  # "pending", "processing", "completed", "failed"
+    # drawing detail level (app/core/geometry.py DETAIL_LEVELS); NULL = standard
+    detail = Column(String, nullable=True)
+    status = Column(String)  # "pending", "processing", "completed", "stale", "failed", "expired"
     file_path = Column(String, nullable=True)
+    # fingerprint of the configuration parameters the file was generated from
+    # (see app/domain/artifacts.py); a mismatch marks the export stale
+    input_hash = Column(String, nullable=True)
     
     # for C# service integration later
     job_id = Column(String, nullable=True)  # external job tracking
+    # when a worker (or startup recovery) last claimed the job; the lease
+    # recover_unfinished_exports() checks before re-queueing
+    claimed_at = Column(DateTime, nullable=True)
     error_message = Column(String, nullable=True)
     
     # relationships
     configuration = relationship("Configuration", back_populates="exports")
+
+    # per-configuration listings paged on (created_at, id), optionally by status;
+    # file_path: download name lookup of content-addressed files (app/api/downloads.py)
+    __table_args__ = (
+        Index("ix_exports_configuration_id_created_at_id", "configuration_id", "created_at", "id"),
+        Index("ix_exports_configuration_id_status_created_at_id", "configuration_id", "status", "created_at", "id"),
+        Index("ix_exports_status", "status"),
+        Index("ix_exports_file_path", "file_path"),
+    )
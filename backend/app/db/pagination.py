@@ -0,0 +1,74 @@
+"""
+Keyset pagination helpers
+Path: app/db/pagination.py
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque URL-safe token."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a token produced by encode_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def paginate(
+    query: Query,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Page through a query ordered by (created_at, id).
+    
+    With a cursor, rows after that position are returned using the
+    (created_at, id) indexes, so every page costs the same however deep it
+    is and concurrent inserts never shift or duplicate results. Without a
+    cursor, `skip` falls back to OFFSET paging for backward compatibility.
+    
+    Args:
+        query: Filtered query over `model`
+        model: Mapped class with `created_at` and `id` columns
+        limit: Page size
+        cursor: Position returned by a previous page
+        skip: Offset used when no cursor is given
+        
+    Returns:
+        Tuple: Rows of this page and the cursor of the next page (None if last)
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # Row-value comparison maps onto a single index range scan
+        query = query.filter(tuple_(model.created_at, model.id) > tuple_(created_at, row_id))
+    
+    query = query.order_by(model.created_at, model.id)
+    if skip and not cursor:
+        query = query.offset(skip)
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
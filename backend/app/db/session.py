@@ -2,7 +2,21 @@
 Database session dependency
 Path: app/db/session.py
 """
-from app.core.database import SessionLocal
+from contextlib import asynccontextmanager
+from typing import Any, Callable, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, SessionLocal
+
+T = TypeVar("T")
+
+# What get_session() yields, depending on DB_ASYNC
+AnySession = Union[Session, AsyncSession]
+
 
 def get_db():
     """
@@ -13,4 +27,41 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_session():
+    """
+    Dependency for `async def` routes.
+    
+    Yields an AsyncSession when DB_ASYNC is enabled, otherwise a regular
+    Session. Pass it to run_db() so the route works with either.
+    """
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            await run_in_threadpool(db.close)
+
+
+# get_session() outside of dependency injection, for routes that only
+# sometimes need the database (e.g. on a cache miss)
+open_session = asynccontextmanager(get_session)
+
+
+async def run_db(db: AnySession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Await a sync service function `fn(db, *args, **kwargs)`.
+    
+    With an AsyncSession the function runs on the event loop through
+    AsyncSession.run_sync, so waiting on the database never holds a
+    threadpool slot. With a sync Session it runs in the threadpool, exactly
+    like a sync route would.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(fn, *args, **kwargs)
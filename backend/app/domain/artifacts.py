@@ -0,0 +1,141 @@
+"""
+Artifacts - Generated outputs of a configuration and the parameters they read
+Path: app/domain/artifacts.py
+
+Every artifact type declares its parameter dependencies, so a change to a
+configuration only invalidates (and regenerates) the outputs that actually
+read a changed parameter. A fingerprint over those parameters tells whether
+a generated file still matches its configuration.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from app.core.cad_engine import DXFGenerator
+from app.core.export_cache import compute_cache_key
+from app.core.generators import generator_registry
+from app.core.geometry import DEFAULT_DETAIL, get_detail_level
+from app.core.mesh_engine import LinearGuideModelGenerator
+from app.core.writers import WRITERS, normalize_format
+
+# Parameters read by the plan drawing and by the 3D model
+DRAWING_PARAMS = ["W", "LS", "NOB", "PN"]
+MODEL_PARAMS = ["W", "LS", "NOB", "H", "H1", "L1", "B", "F", "G", "DD1DD2HH"]
+# Read by the plan drawing only at detail levels that draw holes
+HOLE_PARAMS = ["F", "G", "DD1DD2HH"]
+
+
+class ArtifactType:
+    """
+    One kind of generated output.
+
+    Attributes:
+        name: Artifact identifier used in the API
+        depends_on: Configuration parameters (rule-engine names) the generator reads
+        formats: Export formats served by this artifact
+        revision: Generator revision; bumping it makes every fingerprint change
+        hole_depends_on: Extra parameters read at detail levels that draw holes
+    """
+
+    def __init__(
+        self,
+        name: str,
+        depends_on: Sequence[str],
+        formats: Sequence[str] = (),
+        revision: int = 1,
+        description: str = "",
+        hole_depends_on: Sequence[str] = ()
+    ):
+        self.name = name
+        self.depends_on = tuple(depends_on)
+        self.formats = tuple(normalize_format(f) for f in formats)
+        self.revision = revision
+        self.description = description
+        self.hole_depends_on = tuple(hole_depends_on)
+
+    def reads_any(self, params: Iterable[str]) -> bool:
+        """Whether the artifact, at any detail level, depends on any of the given parameters."""
+        return not set(self.depends_on + self.hole_depends_on).isdisjoint(params)
+
+    def fingerprint(self, params: Dict[str, Any], detail: str = DEFAULT_DETAIL) -> str:
+        """Hash of the dependency values at a detail level (missing parameters hash as null)."""
+        inputs = {
+            "artifact": self.name,
+            "revision": self.revision,
+            **{name: params.get(name) for name in self.depends_on},
+        }
+        level = get_detail_level(detail)
+        if level.holes and self.hole_depends_on:
+            # Unchanged for the other levels, so fingerprints stored before detail levels stay valid
+            inputs["detail"] = level.name
+            inputs.update({name: params.get(name) for name in self.hole_depends_on})
+        return compute_cache_key(inputs)
+
+
+# 1. ARTIFACT DECLARATIONS
+LINEAR_GUIDE_DXF = ArtifactType(
+    "dxf",
+    depends_on=DRAWING_PARAMS,
+    formats=["DXF"],
+    revision=DXFGenerator.DRAWING_REVISION,
+    description="2D drawing (exports)",
+    hole_depends_on=HOLE_PARAMS
+)
+LINEAR_GUIDE_DXF_BINARY = ArtifactType(
+    "dxf_binary",
+    depends_on=DRAWING_PARAMS,
+    formats=["DXF_BINARY"],
+    revision=WRITERS["DXF_BINARY"].revision,
+    description="2D drawing as binary DXF (exports)",
+    hole_depends_on=HOLE_PARAMS
+)
+LINEAR_GUIDE_SVG = ArtifactType(
+    "svg",
+    depends_on=DRAWING_PARAMS,
+    formats=["SVG"],
+    revision=WRITERS["SVG"].revision,
+    description="2D plan view (exports)",
+    hole_depends_on=HOLE_PARAMS
+)
+LINEAR_GUIDE_STL = ArtifactType(
+    "stl",
+    depends_on=MODEL_PARAMS,
+    formats=["STL"],
+    revision=WRITERS["STL"].revision,
+    description="3D mesh (exports)"
+)
+LINEAR_GUIDE_GLB = ArtifactType(
+    "glb",
+    depends_on=MODEL_PARAMS,
+    formats=["GLB"],
+    revision=LinearGuideModelGenerator.MODEL_REVISION,
+    description="3D model (models/configuration/{id})"
+)
+
+ARTIFACT_TYPES: Dict[str, ArtifactType] = {
+    artifact.name: artifact
+    for artifact in (LINEAR_GUIDE_DXF, LINEAR_GUIDE_DXF_BINARY, LINEAR_GUIDE_SVG, LINEAR_GUIDE_STL, LINEAR_GUIDE_GLB)
+}
+
+
+def artifact_for_format(export_format: Optional[str]) -> ArtifactType:
+    """Artifact behind an export format; exports are drawn as DXF unless another artifact claims the format."""
+    export_format = normalize_format(export_format or "")
+    for artifact in ARTIFACT_TYPES.values():
+        if export_format in artifact.formats:
+            return artifact
+    return LINEAR_GUIDE_DXF
+
+
+def changed_params(before: Dict[str, Any], after: Dict[str, Any]) -> Set[str]:
+    """Parameters whose value differs between two flattened configurations."""
+    return {name for name in before.keys() | after.keys() if before.get(name) != after.get(name)}
+
+
+def affected_artifacts(changed: Iterable[str]) -> List[ArtifactType]:
+    """Artifact types that read at least one changed parameter."""
+    changed = set(changed)
+    return [artifact for artifact in ARTIFACT_TYPES.values() if artifact.reads_any(changed)]
+
+
+def config_fingerprint(config: Any, artifact: ArtifactType, detail: Optional[str] = None) -> str:
+    """Fingerprint of an artifact's inputs for a configuration (ORM row or schema), per its product's generator."""
+    return generator_registry.for_config(config).fingerprint(config, artifact, detail or DEFAULT_DETAIL)
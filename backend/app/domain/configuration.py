@@ -0,0 +1,53 @@
+"""
+Configuration - Canonical fingerprint of a configuration's parameters
+Path: app/domain/configuration.py
+
+Two configurations with the same fingerprint describe the same product, so
+only one of them is stored (Configuration.fingerprint is uniquely indexed).
+The fingerprint covers what shapes the product: product, part number,
+surface treatment, number of blocks and the geometry/material/advanced
+parameter groups. Status and timestamps are bookkeeping and are left out.
+
+Normalisation makes equivalent payloads hash alike: surrounding whitespace
+is stripped, integral floats equal their integers (20.0 == 20), and a
+parameter set to null counts as absent (so a null group equals {}).
+"""
+from typing import Any, Dict
+
+from app.core.export_cache import compute_cache_key
+from app.core.generators import DEFAULT_PRODUCT_ID, normalize_product_id
+
+# Bump when the normalisation changes; stored fingerprints are then
+# recomputed by the backfill (scripts/dedupe_configurations.py)
+FINGERPRINT_VERSION = 1
+
+PARAM_GROUPS = ("geometry_params", "material_params", "advanced_params")
+
+
+def _normalize(value: Any) -> Any:
+    """Canonical form of a parameter value (see module docstring)."""
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items() if item is not None}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def configuration_fingerprint(config: Any) -> str:
+    """Fingerprint of a configuration (ORM row or schema)."""
+    canonical: Dict[str, Any] = {
+        "version": FINGERPRINT_VERSION,
+        "product_id": normalize_product_id(getattr(config, "product_id", None) or DEFAULT_PRODUCT_ID),
+        "part_number": _normalize(config.part_number),
+        "surface_treatment": _normalize(getattr(config, "surface_treatment", None)),
+        "number_of_blocks": _normalize(getattr(config, "number_of_blocks", None)),
+    }
+    for group in PARAM_GROUPS:
+        canonical[group] = _normalize(getattr(config, group, None) or {})
+    return compute_cache_key(canonical)
@@ -0,0 +1,437 @@
+"""
+Validation - Declarative engineering rules for linear guide configurations
+Path: app/domain/validation.py
+
+Rules are plain declarations (ranges, cross-field limits, incompatible
+option pairs). The RuleEngine compiles them once at import time into a
+scalar checker per rule for single configurations and a NumPy checker per
+rule for validating thousands of candidate parameter sets in one pass.
+"""
+import math
+import typing
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.configuration_auto import AutoGeneratedParameters
+
+# Aliases used by Configuration columns and older material_params payloads
+FIELD_ALIASES = {
+    "part_number": "PN",
+    "surface_treatment": "ST",
+    "number_of_blocks": "NOB",
+    "lubrication_units": "MX",
+    "grease_type": "GREASE",
+}
+
+# Option lists offered by the configurator (frontend/src/constants/parameters_linear.js)
+SURFACE_TREATMENTS = ["Standard", "Zinc Plated", "Black Oxide", "Chrome Plated", "Nickel Plated"]
+LUBRICATION_UNITS = ["None", "MX-1", "MX-2", "MX-3", "MX-4"]
+GREASE_TYPES = ["LGMT 2", "LGMT 3", "LGHP 2", "LGEP 2", "LGWA 2"]
+
+
+def _to_number(value: Any) -> float:
+    """Coerce a JSON value to float (numeric strings from form inputs allowed)."""
+    if isinstance(value, bool):
+        raise ValueError("booleans are not numbers")
+    number = float(value)
+    if math.isnan(number):
+        raise ValueError("NaN")
+    return number
+
+
+def _normalize_text(value: Any) -> str:
+    """Case- and whitespace-insensitive form used to compare option values."""
+    return str(value).strip().casefold()
+
+
+# 1. RULE DECLARATIONS
+class Rule:
+    """
+    Base class for declarative rules.
+
+    A rule is skipped when any of its fields is missing; completeness is the
+    job of Required. Subclasses implement both a scalar and a vectorized check.
+    """
+
+    kind = "rule"
+
+    def __init__(self, fields: Sequence[str], message: str):
+        self.fields = list(fields)
+        self.message = message
+
+    @property
+    def name(self) -> str:
+        return f"{self.kind}:{'/'.join(self.fields)}"
+
+    def check(self, values: Dict[str, Any]) -> bool:
+        """Return True if a single parameter set violates the rule."""
+        raise NotImplementedError
+
+    def check_many(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Return a boolean violation mask over column arrays."""
+        raise NotImplementedError
+
+
+class Required(Rule):
+    """Field must be present (only enforced for complete configurations)."""
+
+    kind = "required"
+
+    def __init__(self, field: str):
+        super().__init__([field], f"{field} is required")
+
+    def check(self, values):
+        return values.get(self.fields[0]) is None
+
+    def check_many(self, columns):
+        column = columns[self.fields[0]]
+        if column.dtype == object:
+            return np.equal(column, None).astype(bool)
+        return np.isnan(column)
+
+
+class Range(Rule):
+    """Numeric field within optional inclusive/exclusive bounds."""
+
+    kind = "range"
+
+    def __init__(
+        self,
+        field: str,
+        ge: Optional[float] = None,
+        le: Optional[float] = None,
+        gt: Optional[float] = None,
+        lt: Optional[float] = None
+    ):
+        bounds = []
+        if ge is not None:
+            bounds.append(f">= {ge:g}")
+        if gt is not None:
+            bounds.append(f"> {gt:g}")
+        if le is not None:
+            bounds.append(f"<= {le:g}")
+        if lt is not None:
+            bounds.append(f"< {lt:g}")
+        super().__init__([field], f"{field} must be {' and '.join(bounds)}")
+        self.ge, self.le, self.gt, self.lt = ge, le, gt, lt
+
+    def check(self, values):
+        value = values.get(self.fields[0])
+        if value is None:
+            return False
+        return (
+            (self.ge is not None and value < self.ge)
+            or (self.le is not None and value > self.le)
+            or (self.gt is not None and value <= self.gt)
+            or (self.lt is not None and value >= self.lt)
+        )
+
+    def check_many(self, columns):
+        column = columns[self.fields[0]]
+        violated = np.zeros(column.shape, dtype=bool)
+        # NaN (missing) compares False everywhere, so missing never violates
+        if self.ge is not None:
+            violated |= column < self.ge
+        if self.le is not None:
+            violated |= column > self.le
+        if self.gt is not None:
+            violated |= column <= self.gt
+        if self.lt is not None:
+            violated |= column >= self.lt
+        return violated
+
+
+class Integral(Rule):
+    """Numeric field must be a whole number."""
+
+    kind = "integer"
+
+    def __init__(self, field: str):
+        super().__init__([field], f"{field} must be a whole number")
+
+    def check(self, values):
+        value = values.get(self.fields[0])
+        return value is not None and not float(value).is_integer()
+
+    def check_many(self, columns):
+        column = columns[self.fields[0]]
+        with np.errstate(invalid="ignore"):
+            return ~np.isnan(column) & (np.floor(column) != column)
+
+
+class OneOf(Rule):
+    """Text field must be one of the offered options (case-insensitive)."""
+
+    kind = "one_of"
+
+    def __init__(self, field: str, options: Sequence[str]):
+        super().__init__([field], f"{field} must be one of: {', '.join(options)}")
+        self.options = [_normalize_text(option) for option in options]
+        self._option_set = frozenset(self.options)
+
+    def check(self, values):
+        value = values.get(self.fields[0])
+        return value is not None and value not in self._option_set
+
+    def check_many(self, columns):
+        column = columns[self.fields[0]]
+        return (~np.equal(column, None) & ~np.isin(column, self.options)).astype(bool)
+
+
+class ProductAtMost(Rule):
+    """Product of numeric fields must not exceed a limit field (e.g. NOB x L1 <= LS)."""
+
+    kind = "product_at_most"
+
+    def __init__(self, factors: Sequence[str], limit: str, message: str):
+        super().__init__(list(factors) + [limit], message)
+        self.factors = list(factors)
+        self.limit = limit
+
+    def check(self, values):
+        numbers = [values.get(field) for field in self.fields]
+        if any(number is None for number in numbers):
+            return False
+        return math.prod(numbers[:-1]) > numbers[-1]
+
+    def check_many(self, columns):
+        product = np.prod([columns[field] for field in self.factors], axis=0)
+        # NaN > x is False, so rows missing any field pass
+        return product > columns[self.limit]
+
+
+class Incompatible(Rule):
+    """Two option values that must not be combined (e.g. grease and surface)."""
+
+    kind = "incompatible"
+
+    def __init__(self, field: str, value: str, other_field: str, other_value: str, message: str):
+        super().__init__([field, other_field], message)
+        self.value = _normalize_text(value)
+        self.other_value = _normalize_text(other_value)
+
+    def check(self, values):
+        first, second = self.fields
+        return values.get(first) == self.value and values.get(second) == self.other_value
+
+    def check_many(self, columns):
+        first, second = self.fields
+        return (np.equal(columns[first], self.value) & np.equal(columns[second], self.other_value)).astype(bool)
+
+
+# 2. RULE SET FOR LINEAR GUIDES
+def rules_from_schema(schema=AutoGeneratedParameters) -> Tuple[Dict[str, str], List[Rule], List[Rule]]:
+    """
+    Derive field types, required fields and ranges from the generated schema.
+
+    Returns:
+        Tuple: {field: "number" | "text"}, Required rules, Range rules
+    """
+    field_types = {}
+    required = []
+    ranges = []
+    for field, info in schema.model_fields.items():
+        annotation = info.annotation
+        if typing.get_origin(annotation) is typing.Union:
+            annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+        field_types[field] = "number" if annotation in (int, float) else "text"
+
+        if info.is_required():
+            required.append(Required(field))
+
+        bounds = {}
+        for constraint in info.metadata:
+            for bound in ("ge", "le", "gt", "lt"):
+                if getattr(constraint, bound, None) is not None:
+                    bounds[bound] = float(getattr(constraint, bound))
+        if bounds:
+            ranges.append(Range(field, **bounds))
+    return field_types, required, ranges
+
+
+LINEAR_GUIDE_RULES: List[Rule] = [
+    Range("LS", gt=0),
+    Integral("NOB"),
+    OneOf("ST", SURFACE_TREATMENTS),
+    OneOf("MX", LUBRICATION_UNITS),
+    OneOf("GREASE", GREASE_TYPES),
+    ProductAtMost(
+        ["NOB", "L1"], "LS",
+        message="Blocks do not fit on the rail: NOB x L1 (block length) must not exceed LS"
+    ),
+    Incompatible(
+        "GREASE", "LGHP 2", "ST", "Standard",
+        message="LGHP 2 high-temperature grease is not approved for untreated (Standard) rails"
+    ),
+    Incompatible(
+        "GREASE", "LGHP 2", "MX", "MX-1",
+        message="LGHP 2 high-temperature grease is not compatible with MX-1 lubrication units"
+    ),
+]
+
+
+# 3. COMPILED ENGINE
+class RuleEngine:
+    """
+    Evaluates a compiled rule set against one or many parameter sets.
+
+    Field types, required fields and ranges come from AutoGeneratedParameters;
+    the remaining rules are declared in LINEAR_GUIDE_RULES.
+    """
+
+    def __init__(self, rules: Iterable[Rule], schema=AutoGeneratedParameters):
+        """Compile the rules; this runs once per process at import time."""
+        self.field_types, self.required_rules, schema_ranges = rules_from_schema(schema)
+        self.rules: List[Rule] = schema_ranges + list(rules)
+
+        used = {field for rule in self.rules for field in rule.fields}
+        unknown = used - set(self.field_types)
+        if unknown:
+            raise ValueError(f"Rules reference unknown fields: {sorted(unknown)}")
+
+        self.numeric_fields = sorted(f for f, t in self.field_types.items() if t == "number")
+        self.text_fields = sorted(f for f, t in self.field_types.items() if t == "text")
+
+    def _coerce(self, params: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict]]:
+        """Map aliases and coerce values to the field types."""
+        values = {}
+        errors = []
+        for key, raw in params.items():
+            field = FIELD_ALIASES.get(key, key)
+            kind = self.field_types.get(field)
+            if kind is None or raw is None or raw == "":
+                continue
+            if kind == "number":
+                try:
+                    values[field] = _to_number(raw)
+                except (TypeError, ValueError):
+                    errors.append(self._violation_for_type(field))
+            else:
+                values[field] = _normalize_text(raw)
+        return values, errors
+
+    @staticmethod
+    def _violation_for_type(field: str) -> Dict:
+        return {"rule": f"type:{field}", "fields": [field], "message": f"{field} must be a number"}
+
+    @staticmethod
+    def _violation(rule: Rule) -> Dict:
+        return {"rule": rule.name, "fields": list(rule.fields), "message": rule.message}
+
+    def validate(self, params: Dict[str, Any], require_complete: bool = False) -> List[Dict]:
+        """
+        Validate one parameter set.
+
+        Args:
+            params: Flat parameters (see configuration_params)
+            require_complete: Also enforce fields the schema marks as required
+
+        Returns:
+            List[Dict]: Violations with rule, fields and message (empty if valid)
+        """
+        values, violations = self._coerce(params)
+        if require_complete:
+            mistyped = {field for violation in violations for field in violation["fields"]}
+            violations += [
+                self._violation(rule) for rule in self.required_rules
+                if rule.fields[0] not in mistyped and rule.check(values)
+            ]
+        violations += [self._violation(rule) for rule in self.rules if rule.check(values)]
+        return violations
+
+    def _columns(self, candidates: Sequence[Dict[str, Any]]) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Transpose candidates into one array per field plus type-error masks."""
+        n = len(candidates)
+        rows = [{FIELD_ALIASES.get(k, k): v for k, v in candidate.items()} for candidate in candidates]
+
+        columns = {}
+        type_errors = {}
+        for field in self.numeric_fields:
+            column = np.full(n, np.nan)
+            bad = None
+            for i, row in enumerate(rows):
+                raw = row.get(field)
+                if raw is None or raw == "":
+                    continue
+                try:
+                    column[i] = _to_number(raw)
+                except (TypeError, ValueError):
+                    if bad is None:
+                        bad = np.zeros(n, dtype=bool)
+                    bad[i] = True
+            columns[field] = column
+            if bad is not None:
+                type_errors[field] = bad
+
+        for field in self.text_fields:
+            column = np.empty(n, dtype=object)
+            column[:] = [
+                None if row.get(field) in (None, "") else _normalize_text(row[field])
+                for row in rows
+            ]
+            columns[field] = column
+        return columns, type_errors
+
+    def validate_batch(
+        self,
+        candidates: Sequence[Dict[str, Any]],
+        require_complete: bool = True
+    ) -> Tuple[np.ndarray, Dict[int, List[Dict]]]:
+        """
+        Validate many parameter sets with one vectorized pass per rule.
+
+        Args:
+            candidates: Flat parameter sets
+            require_complete: Also enforce fields the schema marks as required
+
+        Returns:
+            Tuple: Boolean validity array and {index: violations} for invalid rows
+        """
+        if not candidates:
+            return np.ones(0, dtype=bool), {}
+        columns, type_errors = self._columns(candidates)
+
+        masks: List[Tuple[Dict, np.ndarray]] = [
+            (self._violation_for_type(field), mask) for field, mask in type_errors.items()
+        ]
+        if require_complete:
+            # A mistyped value is reported once, not also as missing
+            for rule in self.required_rules:
+                mask = rule.check_many(columns)
+                if rule.fields[0] in type_errors:
+                    mask = mask & ~type_errors[rule.fields[0]]
+                masks.append((self._violation(rule), mask))
+        masks += [(self._violation(rule), rule.check_many(columns)) for rule in self.rules]
+
+        violated = np.zeros(len(candidates), dtype=bool)
+        for _, mask in masks:
+            violated |= mask
+
+        # Materialize messages only for the rows that failed
+        violations: Dict[int, List[Dict]] = {}
+        for violation, mask in masks:
+            for index in np.flatnonzero(mask).tolist():
+                violations.setdefault(index, []).append(violation)
+        return ~violated, violations
+
+
+def configuration_params(config: Any) -> Dict[str, Any]:
+    """
+    Flatten a configuration (ORM row or schema) into rule-engine parameters.
+
+    geometry/material/advanced params are merged; the dedicated columns
+    (part_number, surface_treatment, number_of_blocks) take precedence.
+    """
+    params: Dict[str, Any] = {}
+    for group in ("advanced_params", "material_params", "geometry_params"):
+        params.update(getattr(config, group, None) or {})
+    for column in ("part_number", "surface_treatment", "number_of_blocks"):
+        value = getattr(config, column, None)
+        if value is not None:
+            params[FIELD_ALIASES[column]] = value
+    return params
+
+
+# Singleton instance for easy import
+rule_engine = RuleEngine(LINEAR_GUIDE_RULES)
@@ -2,21 +2,72 @@
 FastAPI Main Application
 Path: app/main.py
 """
-from pathlib import Path
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from app.core.database import engine, Base
+from app.core.database import engine, Base, SessionLocal, ensure_columns, ensure_indexes
+from app.core.cad_engine import DXFGenerator
 from app.core.config import settings
+from app.core.job_queue import export_queue
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import REQUEST_ID_HEADER, ProfilingMiddleware
+from app.core.response_cache import configuration_cache
+from app.core.storage import export_storage
+from app.api import downloads, metrics
 from app.api.v1.router import api_router
 from app.db import models  # Import models to ensure they're registered
+from app.services import export_service
 
-# Create database tables on startup
-Base.metadata.create_all(bind=engine)
+EXPORTS_DIR = DXFGenerator.EXPORT_DIR
+
+logger = logging.getLogger(__name__)
+
+
+def init_storage() -> None:
+    """
+    Create database tables (and columns/indexes added since) and the exports directory.
+    
+    Runs in the lifespan rather than at import time, so importing the app
+    (tests, scripts, worker processes) never touches the database or disk.
+    """
+    Base.metadata.create_all(bind=engine)
+    ensure_columns(engine)
+    ensure_indexes(engine)
+    EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifecycle: set up storage (unless INIT_ON_STARTUP is off),
+    recover export jobs (unless RECOVER_EXPORTS_ON_STARTUP is off), start the storage sweeper and the cache
+    invalidation bus on startup, stop background work on shutdown.
+    """
+    if settings.INIT_ON_STARTUP:
+        init_storage()
+    
+    if settings.RECOVER_EXPORTS_ON_STARTUP:
+        # Re-queue exports left unfinished by a crash or restart
+        db = SessionLocal()
+        try:
+            export_service.recover_unfinished_exports(db)
+        except (OperationalError, ProgrammingError) as e:
+            # No schema yet (INIT_ON_STARTUP off before the deploy step ran)
+            logger.warning("Skipping export recovery: %s", e.orig)
+        finally:
+            db.close()
+    
+    export_storage.start_sweeper(settings.EXPORT_SWEEP_INTERVAL_SECONDS)
+    configuration_cache.bus.start()
+    
+    yield
+    
+    configuration_cache.bus.close()
+    export_storage.stop_sweeper()
+    export_queue.shutdown()
 
-# Ensure exports directory exists
-EXPORTS_DIR = Path(__file__).parent.parent / "exports"
-EXPORTS_DIR.mkdir(parents=True, exist_ok=True)
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -25,7 +76,8 @@ app = FastAPI(
     description="Backend API for SKF bearing configuration and CAD export",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -35,14 +87,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", REQUEST_ID_HEADER],
 )
 
-# Mount static files for CAD exports (generated DXF files)
-app.mount("/downloads", StaticFiles(directory=str(EXPORTS_DIR)), name="downloads")
+# Opt-in per-request profiling (PROFILING_ENABLED; see /api/v1/admin/profiles)
+app.add_middleware(ProfilingMiddleware)
+
+# Request latency and status per route template (see /metrics)
+app.add_middleware(MetricsMiddleware)
+
+# Serve generated CAD files (ETags, range requests, precompressed variants)
+app.include_router(downloads.router, prefix="/downloads", tags=["Downloads"])
 
 # Include API router with /api/v1 prefix
 app.include_router(api_router, prefix="/api/v1")
 
+# Prometheus scrape endpoint
+app.include_router(metrics.router, tags=["Monitoring"])
+
 
 @app.get("/", tags=["Root"])
 async def root():
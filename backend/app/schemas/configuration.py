@@ -1,11 +1,25 @@
 # schemas/configuration.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from app.core.generators import generator_registry, normalize_product_id
+
+
+def _product_id(value: Optional[str]) -> Optional[str]:
+    """Canonical product ID; unknown products are rejected with the available ones."""
+    if value is None:
+        return None
+    value = normalize_product_id(value)
+    if value not in generator_registry.product_ids():
+        raise ValueError(f"Unknown product {value!r}; available: {', '.join(generator_registry.product_ids())}")
+    return value
+
 
 # 1. BASE SCHEMA (shared fields)
 class ConfigurationBase(BaseModel):
+    product_id: Optional[str] = "LINEAR_GUIDE"  # generator registry key (frontend SCHEMAS)
     part_number: str
     surface_treatment: Optional[str] = None
     number_of_blocks: Optional[int] = None
@@ -16,10 +30,11 @@ class ConfigurationBase(BaseModel):
 
 # 2. CREATE SCHEMA (for POST requests)
 class ConfigurationCreate(ConfigurationBase):
-    pass  # inherits everything from Base
+    _check_product_id = field_validator("product_id")(_product_id)
 
 # 3. UPDATE SCHEMA (for PATCH/PUT requests)
 class ConfigurationUpdate(BaseModel):
+    product_id: Optional[str] = None
     part_number: Optional[str] = None
     surface_treatment: Optional[str] = None
     number_of_blocks: Optional[int] = None
@@ -27,6 +42,8 @@ class ConfigurationUpdate(BaseModel):
     material_params: Optional[dict] = None
     advanced_params: Optional[dict] = None
     status: Optional[str] = None
+
+    _check_product_id = field_validator("product_id")(_product_id)
     
 # 4. RESPONSE SCHEMA (what API returns)
 class ConfigurationResponse(ConfigurationBase):
@@ -35,4 +52,44 @@ class ConfigurationResponse(ConfigurationBase):
     updated_at: datetime
     
     class Config:
-        from_attributes = True  # allows reading from SQLAlchemy models
\ No newline at end of file
+        from_attributes = True  # allows reading from SQLAlchemy models
+
+
+# 5. BULK IMPORT REPORT SCHEMAS
+class ConfigurationImportError(BaseModel):
+    line: int
+    error: str
+
+class ConfigurationImportReport(BaseModel):
+    total_lines: int
+    imported: int
+    failed: int
+    errors: List[ConfigurationImportError]
+    errors_truncated: bool = False  # more failures than IMPORT_MAX_REPORTED_ERRORS
+
+
+# 6. RULE VALIDATION SCHEMAS
+class RuleViolation(BaseModel):
+    rule: str
+    fields: List[str]
+    message: str
+
+class ConfigurationBatchValidationRequest(BaseModel):
+    candidates: List[Dict[str, Any]]  # flat parameter sets, e.g. {"NOB": 2, "L1": 80, "LS": 500}
+    require_complete: bool = True
+
+class CandidateValidationErrors(BaseModel):
+    index: int
+    violations: List[RuleViolation]
+
+class ConfigurationBatchValidationResponse(BaseModel):
+    total: int
+    valid_count: int
+    invalid_count: int
+    valid: List[bool]
+    errors: List[CandidateValidationErrors]
+
+
+# 7. UPDATE RESPONSE SCHEMA (PATCH reports what a non-draft configuration still lacks)
+class ConfigurationUpdateResponse(ConfigurationResponse):
+    incomplete: List[RuleViolation] = []  # missing required parameters, not enforced by this update
@@ -1,6 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Literal, Optional
+
+from app.core.geometry import DEFAULT_DETAIL, get_detail_level
+from app.core.writers import get_writer
+
+
+def _export_format(value: str) -> str:
+    """Canonical name of a supported export format (ValueError lists the supported ones)."""
+    return get_writer(value).format
+
+
+def _detail_level(value: str) -> str:
+    """Canonical name of a drawing detail level (ValueError lists the available ones)."""
+    return get_detail_level(value).name
 
 # 1. BASE SCHEMA (shared fields)
 class ExportBase(BaseModel):
@@ -10,6 +23,8 @@ class ExportBase(BaseModel):
     job_id: Optional[str] = None
     error_message: Optional[str] = None
     configuration_id: int
+    input_hash: Optional[str] = None  # fingerprint of the parameters the file was generated from
+    detail: Optional[str] = None      # drawing detail level (None = standard)
 
 # 2. CREATE SCHEMA (for POST requests)
 class ExportCreate(BaseModel):
@@ -17,6 +32,17 @@ class ExportCreate(BaseModel):
     format: str
     # status defaults to pending, others are None initially
 
+    # "job": queue generation and store the file under /downloads
+    # "stream": return the file bytes directly in the response
+    delivery: Literal["job", "stream"] = "job"
+    compress: bool = False  # stream only: gzip the response body
+    persist: bool = False   # stream only: also store a durable artifact
+    # drawing formats: "preview" (fast, no rendered dimensions), "standard" or "full" (hole detail)
+    detail: str = DEFAULT_DETAIL
+
+    _check_format = field_validator("format")(_export_format)
+    _check_detail = field_validator("detail")(_detail_level)
+
 # 3. UPDATE SCHEMA (for internal updates like status change)
 class ExportUpdate(BaseModel):
     status: Optional[str] = None
@@ -31,3 +57,84 @@ class ExportResponse(ExportBase):
     
     class Config:
         from_attributes = True
+
+
+# 5. CACHE STATS SCHEMA (content-addressed export cache)
+class ExportCacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+# 6. BATCH SCHEMA (ZIP export of many configurations)
+class ExportBatchCreate(BaseModel):
+    configuration_ids: Optional[List[int]] = None
+    # filter used when configuration_ids is not given
+    status: Optional[str] = None
+    part_number: Optional[str] = None
+    format: str = "DXF"
+    detail: str = DEFAULT_DETAIL
+
+    _check_format = field_validator("format")(_export_format)
+    _check_detail = field_validator("detail")(_detail_level)
+
+
+# 7. STORAGE SWEEP SCHEMA (retention and orphan cleanup report)
+class ExportStorageReport(BaseModel):
+    swept_at: datetime
+    files_scanned: int
+    bytes_before: int
+    bytes_after: int
+    orphans_removed: int
+    expired_removed: int
+    evicted_removed: int
+    bytes_reclaimed: int
+    max_bytes: int
+    duration_ms: float
+
+
+# 8. ARTIFACT FRESHNESS SCHEMA (per-artifact state of a configuration)
+class ArtifactFreshness(BaseModel):
+    artifact: str
+    description: str
+    depends_on: List[str]        # configuration parameters the artifact reads
+    fingerprint: Optional[str]   # hash of their current values
+    fresh: bool                  # a generated file matches the current parameters
+    stale_exports: int = 0
+    latest_export_id: Optional[int] = None
+    file_path: Optional[str] = None
+
+
+# 9. MULTI-FORMAT SCHEMA (one configuration, several formats, one geometry build)
+class ExportFormatsCreate(BaseModel):
+    configuration_id: int
+    formats: List[str] = Field(..., min_length=1)
+    detail: str = DEFAULT_DETAIL
+
+    _check_detail = field_validator("detail")(_detail_level)
+
+    @field_validator("formats")
+    @classmethod
+    def _check_formats(cls, value: List[str]) -> List[str]:
+        return [_export_format(f) for f in value]
+
+
+# 10. GENERATOR SCHEMAS (CAD generator registry, one per product)
+class GeneratorParam(BaseModel):
+    key: str
+    type: str
+    default: Optional[Any] = None
+    required: bool = False
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    options: Optional[List[Any]] = None
+    unit: Optional[str] = None
+    description: str = ""
+
+class GeneratorInfo(BaseModel):
+    product_id: str
+    name: str
+    formats: List[str]
+    revision: int
+    has_model: bool              # GET /models/configuration/{id} serves a GLB
+    params: List[GeneratorParam]
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+# 1. LINEAR GUIDE MODEL PARAMETERS (query parameters of the models route)
+class LinearGuideModelParams(BaseModel):
+    W: float = Field(20, gt=0)          # rail width (mm)
+    LS: float = Field(500, gt=0)        # rail length (mm)
+    NOB: int = Field(2, ge=0, le=10)    # number of carriages
+    H: Optional[float] = Field(None, gt=0)   # overall height
+    H1: Optional[float] = Field(None, gt=0)  # rail height
+    L1: Optional[float] = Field(None, gt=0)  # carriage length
+    B: Optional[float] = Field(None, gt=0)   # carriage width
+    F: Optional[float] = Field(None, gt=0)   # mounting-hole pitch
+    G: Optional[float] = Field(None, ge=0)   # first hole from rail end
+    DD1DD2HH: Optional[str] = None           # d1 x d2 x h hole spec (d1 used)
+
+
+# 2. CATALOG MODEL STRETCH ZONES (response of the catalog zones route)
+class StretchZone(BaseModel):
+    start: float
+    end: float
+    stretchable: bool
+
+
+class CatalogModelStretchInfo(BaseModel):
+    model: str
+    axis: str                # long axis the model is stretched along
+    base_length: float       # length of the catalog file
+    min_length: float        # combined length of the rigid features
+    zones: List[StretchZone]
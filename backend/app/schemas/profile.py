@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+
+# 1. STORED REQUEST PROFILE (metadata written next to the collapsed stacks)
+class ProfileInfo(BaseModel):
+    request_id: str
+    method: str
+    path: str
+    query: Optional[str] = None
+    status: int
+    trigger: str            # "header" or "sample"
+    duration_ms: float
+    samples: int            # sampler ticks while the request ran
+    interval_ms: float
+    created_at: str         # ISO 8601, UTC
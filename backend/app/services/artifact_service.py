@@ -0,0 +1,157 @@
+from sqlalchemy.orm import Session
+from app.db.models import Configuration, Export
+from app.core.generators import generator_registry
+from app.core.geometry import DEFAULT_DETAIL
+from app.core.job_queue import export_queue
+from app.domain.artifacts import (
+    ARTIFACT_TYPES,
+    LINEAR_GUIDE_GLB,
+    ArtifactType,
+    artifact_for_format,
+    changed_params,
+    config_fingerprint,
+)
+from app.schemas.export import ExportCreate
+from app.services import export_service, model_service
+from typing import Any, Dict, List, Optional
+
+# Export statuses whose file was generated from some version of the configuration
+GENERATED_STATUSES = ("completed", "stale")
+
+
+class ArtifactSnapshot:
+    """Artifact-relevant state of a configuration, taken before it is modified."""
+
+    def __init__(self, config: Configuration):
+        generator = generator_registry.for_config(config)
+        self.product_id = generator.product_id
+        self.params = generator.artifact_params(config)
+        geometry_params, application_params = model_service.configuration_model_args(config)
+        self.model_args = (dict(geometry_params), dict(application_params))
+        self.model_generated = model_service.is_model_generated(*self.model_args)
+
+
+def _generated_exports(db: Session, config_id: int, artifact: ArtifactType) -> List[Export]:
+    """Exports of a configuration that hold a file of the given artifact, newest first."""
+    exports = db.query(Export)\
+        .filter(
+            Export.configuration_id == config_id,
+            Export.status.in_(GENERATED_STATUSES)
+        )\
+        .order_by(Export.created_at.desc(), Export.id.desc())\
+        .all()
+    return [e for e in exports if artifact_for_format(e.format) is artifact]
+
+
+def invalidate_artifacts(db: Session, config: Configuration, before: ArtifactSnapshot) -> List[ArtifactType]:
+    """
+    Re-evaluate the exports of the artifacts a configuration change affects.
+
+    Only artifacts that read a changed parameter are touched (all of them if
+    the product changed). Their exports become `stale` when their input
+    fingerprint no longer matches, and `completed` again if a later change
+    restored the inputs they were made from.
+
+    Args:
+        db: Database session
+        config: The configuration after the change
+        before: Snapshot taken before the change
+
+    Returns:
+        List[ArtifactType]: The affected artifact types
+    """
+    generator = generator_registry.for_config(config)
+    if generator.product_id != before.product_id:
+        affected = list(ARTIFACT_TYPES.values())
+    else:
+        changed = changed_params(before.params, generator.artifact_params(config))
+        affected = generator.affected_artifacts(changed, list(ARTIFACT_TYPES.values()))
+    for artifact in affected:
+        if artifact is LINEAR_GUIDE_GLB:
+            continue  # models are keyed by their inputs; nothing is stored per configuration
+        fingerprints = {}  # per detail level; "full" drawings also read the hole parameters
+        for db_export in _generated_exports(db, config.id, artifact):
+            if db_export.detail not in fingerprints:
+                fingerprints[db_export.detail] = config_fingerprint(config, artifact, db_export.detail)
+            db_export.status = "completed" if db_export.input_hash == fingerprints[db_export.detail] else "stale"
+    db.commit()
+    return affected
+
+
+def regenerate_artifacts(
+    db: Session,
+    config: Configuration,
+    artifacts: List[ArtifactType],
+    before: ArtifactSnapshot
+) -> List[Export]:
+    """
+    Queue regeneration of affected artifacts that had been generated before.
+
+    - Export formats: one new export per artifact and detail level the configuration has stale exports of
+    - GLB: the model is rebuilt in the export queue if the previous one was cached
+
+    Returns:
+        List[Export]: Exports created for the regenerated files
+    """
+    created = []
+    for artifact in artifacts:
+        if artifact is LINEAR_GUIDE_GLB:
+            continue
+        stale_details = dict.fromkeys(
+            e.detail for e in _generated_exports(db, config.id, artifact) if e.status == "stale"
+        )
+        for detail in stale_details:
+            # Legacy format names (e.g. STEP drawn as DXF) are regenerated under the artifact's format
+            created.append(export_service.create_export(
+                db, ExportCreate(configuration_id=config.id, format=artifact.formats[0], detail=detail or DEFAULT_DETAIL)
+            ))
+
+    if LINEAR_GUIDE_GLB in artifacts and before.model_generated and generator_registry.for_config(config).has_model:
+        model_args = model_service.configuration_model_args(config)
+        if not model_service.is_model_generated(*model_args):
+            # A failed rebuild is reported when the model is requested
+            export_queue.submit(model_service.get_linear_guide_model, *model_args, on_error=lambda e: None)
+    return created
+
+
+def get_artifact_freshness(db: Session, config_id: int) -> Optional[List[Dict[str, Any]]]:
+    """
+    Report, per artifact type, whether a file matching the current parameters exists.
+
+    Args:
+        db: Database session
+        config_id: ID of the configuration
+
+    Returns:
+        List[Dict]: One entry per artifact type the configuration's product has,
+        or None if the configuration doesn't exist
+    """
+    config = db.query(Configuration).filter(Configuration.id == config_id).first()
+    if not config:
+        return None
+
+    generator = generator_registry.for_config(config)
+    report = []
+    for artifact in ARTIFACT_TYPES.values():
+        if not generator.produces(artifact) and not (artifact is LINEAR_GUIDE_GLB and generator.has_model):
+            continue
+        entry = {
+            "artifact": artifact.name,
+            "description": artifact.description,
+            "depends_on": generator.depends_on(artifact),
+            "fingerprint": config_fingerprint(config, artifact),
+        }
+        if artifact is LINEAR_GUIDE_GLB:
+            entry["fresh"] = model_service.is_model_generated(*model_service.configuration_model_args(config))
+        else:
+            exports = _generated_exports(db, config.id, artifact)
+            # Fingerprints are those of the standard detail level
+            current = next((e for e in exports if e.detail is None and e.input_hash == entry["fingerprint"]), None)
+            entry.update(
+                fresh=current is not None,
+                stale_exports=sum(1 for e in exports if e.status == "stale"),
+                latest_export_id=exports[0].id if exports else None,
+                file_path=current.file_path if current else None,
+            )
+        report.append(entry)
+    return report
@@ -1,39 +1,112 @@
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app.db.models import Configuration
+from typing import AsyncIterable, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from app.core.config import settings
+from app.db.models import Configuration, Export
+from app.db.pagination import paginate
+from app.db.session import AnySession, run_db
+from app.core.generators import generator_registry
+from app.core.response_cache import configuration_cache
+from app.domain.configuration import configuration_fingerprint
+from app.domain.validation import rule_engine
 from app.schemas.configuration import ConfigurationCreate, ConfigurationUpdate
+from app.services import artifact_service
+from app.utils.streaming import aiter_lines
 from fastapi import HTTPException, status
 
-def create_configuration(db: Session, config: ConfigurationCreate):
-    # --- RULE 1: Check Number of Blocks ---
-    # We pretend SKF only allows max 10 blocks on a rail.
-    """Create a new configuration"""
-    if config.number_of_blocks is not None and config.number_of_blocks >10:
-        raise HTTPException(
-            status_code=400,
-            detail="Engineering Error: Maximum 10 blocks allowed per rail."
-        )
-    
-    # --- RULE 2: Grease Logic ---
-    # Example: If grease is 'High Temp', you can't use standard seals (mx-1)
-    # (We are just making this up for the demo, but this is where the logic lives)
-    if config.material_params:
-        grease = config.material_params.get("GREASE")
-        if grease =="LGHP 2" and config.surface_treatment == "standard":
-            pass
+# Fields that shape the geometry; changing one requires a complete configuration
+GEOMETRY_FIELDS = ("product_id", "number_of_blocks", "geometry_params")
 
-    # --- IF RULES PASS, SAVE IT ---
-    db_config = Configuration(**config.model_dump())
-    db.add(db_config)
-    db.commit()
-    db.refresh(db_config)
-    return db_config
+
+def check_rules(config, require_complete: Optional[bool] = None) -> List[Dict]:
+    """Run the product's rules on a configuration
+    linear guides use the engineering rules (app/domain/validation.py), other
+    products their generator's parameter schema (app/core/generators).
+    Drafts may be incomplete; once a configuration leaves draft every
+    required parameter must be present.
+    Args:
+         require_complete: override the status-based completeness check
+    Returns:
+         list of violations, empty if the configuration passes
+     """
+    if require_complete is None:
+        require_complete = (config.status or "draft") != "draft"
+    return generator_registry.for_config(config).validate(config, require_complete=require_complete)
 
 
+def incomplete_violations(config) -> List[Dict]:
+    """Missing required parameters of a non-draft configuration (empty for drafts)"""
+    if (config.status or "draft") == "draft":
+        return []
+    return check_rules(config, require_complete=True)
 
-  
 
+def _rule_error(violations: List[Dict]) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail={
+            "message": "Engineering Error: " + "; ".join(v["message"] for v in violations),
+            "violations": violations
+        }
+    )
 
 
+def _duplicate_error(existing: Configuration) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": f"An identical configuration already exists (ID {existing.id})",
+            "configuration_id": existing.id
+        }
+    )
+
+
+def get_configuration_by_fingerprint(db: Session, fingerprint: str) -> Optional[Configuration]:
+    """Get the configuration stored under a fingerprint (app/domain/configuration.py)"""
+    return db.query(Configuration).filter(Configuration.fingerprint == fingerprint).first()
+
+
+def get_or_create_configuration(db: Session, config: ConfigurationCreate) -> Tuple[Configuration, bool]:
+    """Create a configuration unless an identical one is stored
+    identical = same fingerprint, i.e. the same normalised product, part
+    number, ST, NOB and parameter groups (status is not compared)
+    Returns:
+         the stored configuration and whether it was created
+     """
+    violations = check_rules(config)
+    if violations:
+        raise _rule_error(violations)
+
+    # --- IF RULES PASS, SAVE IT ---
+    # insert first: the unique fingerprint index detects a duplicate without
+    # an extra lookup on the common path, and also catches concurrent creates
+    fingerprint = configuration_fingerprint(config)
+    db_config = Configuration(**config.model_dump(), fingerprint=fingerprint)
+    db.add(db_config)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        existing = get_configuration_by_fingerprint(db, fingerprint)
+        if existing is None:
+            raise
+        return existing, False
+    db.refresh(db_config)
+    return db_config, True
+
+
+def create_configuration(db: Session, config: ConfigurationCreate):
+    """Create a new configuration
+    Raises:
+         HTTPException: 409 if an identical configuration is already stored
+         (use get_or_create_configuration to get that one back instead)
+     """
+    db_config, created = get_or_create_configuration(db, config)
+    if not created:
+        raise _duplicate_error(db_config)
+    return db_config
 
 
 def get_configuration(db: Session, config_id: int):
@@ -46,20 +119,89 @@ def get_configurations(db: Session, skip: int = 0, limit: int = 20):
          skip: how many to skip( for page 2: skip=20)
          limit : how many to return
      """
-    return db.query(Configuration).offset(skip).limit(limit).all()
+    return get_configurations_page(db, skip=skip, limit=limit)[0]
+
+
+def get_configurations_page(
+    db: Session,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    status: Optional[str] = None,
+    part_number: Optional[str] = None
+) -> Tuple[List[Configuration], Optional[str]]:
+    """get one page of configurations ordered by (created_at, id)
+    Args:
+         limit: how many to return
+         cursor: opaque position from the previous page (keyset paging)
+         skip: offset paging, used only without a cursor
+         status / part_number: optional exact-match filters
+    Returns:
+         the page and the cursor of the next page (None on the last page)
+    Raises:
+         ValueError: if the cursor is malformed
+     """
+    query = db.query(Configuration)
+    if status is not None:
+        query = query.filter(Configuration.status == status)
+    if part_number is not None:
+        query = query.filter(Configuration.part_number == part_number)
+    return paginate(query, Configuration, limit=limit, cursor=cursor, skip=skip)
      
-def update_configuration(db: Session, config_id: int, config_update: ConfigurationUpdate):
-    """Update existing configuration """
+def update_configuration(db: Session, config_id: int, config_update: ConfigurationUpdate, regenerate: bool = False):
+    """Update existing configuration
+    exports of artifacts that read a changed parameter are marked stale
+    (app/domain/artifacts.py); the others stay valid
+    completeness is enforced only when the configuration leaves draft or a
+    geometry field changes, so older incomplete rows can still be edited
+    (incomplete_violations() reports what they lack)
+    Args:
+         regenerate: also queue regeneration of the affected artifacts
+    Raises:
+         HTTPException: 409 if the update would make it identical to another configuration
+     """
     db_config = get_configuration(db, config_id)
     if not db_config:
         return None
+    before = artifact_service.ArtifactSnapshot(db_config)
 
     update_data = config_update.model_dump(exclude_unset=True)
+    merged = ConfigurationCreate.model_validate(
+        {**ConfigurationCreate.model_validate(db_config, from_attributes=True).model_dump(), **update_data}
+    )
+    leaves_draft = (db_config.status or "draft") == "draft" and (merged.status or "draft") != "draft"
+    geometry_changed = any(
+        key in update_data and update_data[key] != getattr(db_config, key) for key in GEOMETRY_FIELDS
+    )
+    require_complete = (merged.status or "draft") != "draft" and (leaves_draft or geometry_changed)
+    violations = check_rules(merged, require_complete=require_complete)
+    if violations:
+        raise _rule_error(violations)
+
+    fingerprint = configuration_fingerprint(merged)
+    duplicate = get_configuration_by_fingerprint(db, fingerprint)
+    if duplicate and duplicate.id != config_id:
+        raise _duplicate_error(duplicate)
+
     for key, value in update_data.items():
         setattr(db_config, key, value)
+    db_config.fingerprint = fingerprint
 
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        duplicate = get_configuration_by_fingerprint(db, fingerprint)
+        if duplicate is None:
+            raise
+        raise _duplicate_error(duplicate)
+    configuration_cache.invalidate(config_id)
     db.refresh(db_config)
+
+    affected = artifact_service.invalidate_artifacts(db, db_config, before)
+    if regenerate and affected:
+        artifact_service.regenerate_artifacts(db, db_config, affected, before)
+        db.refresh(db_config)
     return db_config
 
 
@@ -69,6 +211,202 @@ def delete_configuration(db: Session, config_id: int):
     if db_config:
         db.delete(db_config)
         db.commit()
+        configuration_cache.invalidate(config_id)
         return True
     return False
 
+
+def deduplicate_configurations(db: Session, batch_size: int = 1000, dry_run: bool = False) -> Dict:
+    """backfill fingerprints and merge identical configurations
+    rows are visited in ID order and each batch is one transaction (a dry
+    run is a single transaction, rolled back at the end). A row
+    whose fingerprint is already held by another row is merged into it: its
+    exports are moved over and the row is deleted. Safe to run repeatedly,
+    and needed again after FINGERPRINT_VERSION changes.
+    Args:
+         batch_size: rows per transaction
+         dry_run: only report, change nothing
+    Returns:
+         {"scanned", "fingerprinted", "merged", "exports_moved"} counts
+     """
+    report = {"scanned": 0, "fingerprinted": 0, "merged": 0, "exports_moved": 0}
+    last_id = 0
+    while True:
+        batch = (
+            db.query(Configuration)
+            .filter(Configuration.id > last_id)
+            .order_by(Configuration.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        merged_ids = []
+        for db_config in batch:
+            report["scanned"] += 1
+            fingerprint = configuration_fingerprint(db_config)
+            if db_config.fingerprint == fingerprint:
+                continue
+            keeper = get_configuration_by_fingerprint(db, fingerprint)
+            if keeper is None:
+                db_config.fingerprint = fingerprint
+                db.flush()  # later rows of the batch must see it
+                report["fingerprinted"] += 1
+                continue
+            report["exports_moved"] += (
+                db.query(Export)
+                .filter(Export.configuration_id == db_config.id)
+                .update({Export.configuration_id: keeper.id}, synchronize_session=False)
+            )
+            db.expire(db_config, ["exports"])
+            db.delete(db_config)
+            db.flush()
+            merged_ids.append(db_config.id)
+        report["merged"] += len(merged_ids)
+
+        if not dry_run:
+            db.commit()
+            if merged_ids:
+                configuration_cache.invalidate(*merged_ids)
+    if dry_run:
+        db.rollback()
+    return report
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Flatten a pydantic error into one line for the import report"""
+    parts = []
+    for item in error.errors():
+        location = ".".join(str(part) for part in item["loc"])
+        parts.append(f"{location}: {item['msg']}" if location else item["msg"])
+    return "; ".join(parts)
+
+
+def import_configuration_batch(db: Session, lines: List[Tuple[int, Optional[bytes]]]) -> Tuple[int, List[Dict]]:
+    """validate a chunk of NDJSON lines and insert the valid ones in one transaction
+    lines identical to a stored configuration or to an earlier line are
+    rejected as duplicates
+    Args:
+         lines: (line number, raw line) pairs; a None line was too long to read
+    Returns:
+         number of inserted rows and a {"line", "error"} entry per rejected line
+     """
+    rows = []
+    row_lines = []
+    errors = []
+    line_by_fingerprint: Dict[str, int] = {}
+    for line_no, raw in lines:
+        if raw is None:
+            errors.append({"line": line_no, "error": f"Line exceeds {settings.IMPORT_MAX_LINE_BYTES} bytes"})
+            continue
+        if not raw.strip():
+            continue  # blank lines are allowed between records
+
+        try:
+            config = ConfigurationCreate.model_validate_json(raw)
+        except ValidationError as e:
+            errors.append({"line": line_no, "error": _format_validation_error(e)})
+            continue
+
+        violations = check_rules(config)
+        if violations:
+            errors.append({"line": line_no, "error": "; ".join(v["message"] for v in violations)})
+            continue
+
+        fingerprint = configuration_fingerprint(config)
+        if fingerprint in line_by_fingerprint:
+            errors.append({"line": line_no, "error": f"Duplicate of line {line_by_fingerprint[fingerprint]}"})
+            continue
+        line_by_fingerprint[fingerprint] = line_no
+        rows.append({**config.model_dump(), "fingerprint": fingerprint})
+        row_lines.append(line_no)
+
+    stored = dict(
+        db.query(Configuration.fingerprint, Configuration.id)
+        .filter(Configuration.fingerprint.in_(line_by_fingerprint))
+    ) if line_by_fingerprint else {}
+    if stored:
+        for row, line_no in zip(rows, row_lines):
+            if row["fingerprint"] in stored:
+                errors.append({"line": line_no, "error": f"Duplicate of configuration {stored[row['fingerprint']]}"})
+        errors.sort(key=lambda error: error["line"])
+        row_lines = [line_no for row, line_no in zip(rows, row_lines) if row["fingerprint"] not in stored]
+        rows = [row for row in rows if row["fingerprint"] not in stored]
+
+    if not rows:
+        return 0, errors
+
+    # one executemany INSERT for the whole chunk instead of a commit per row
+    try:
+        db.execute(insert(Configuration), rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        errors.extend({"line": line_no, "error": f"Insert failed: {str(e)}"} for line_no in row_lines)
+        return 0, errors
+    return len(rows), errors
+
+
+async def import_configurations(
+    db: AnySession,
+    chunks: AsyncIterable[bytes],
+    transaction_size: Optional[int] = None
+) -> Dict:
+    """stream NDJSON configurations into the database
+    Only one chunk of lines is held at a time, so memory stays flat however
+    large the upload is. Each chunk is its own transaction: a failing line
+    is reported and skipped without rolling back the rest.
+    Args:
+         chunks: raw request body stream
+         transaction_size: lines per validation chunk / transaction
+    Returns:
+         import report (see ConfigurationImportReport)
+     """
+    size = transaction_size or settings.IMPORT_TRANSACTION_SIZE
+    size = max(1, min(size, settings.IMPORT_MAX_TRANSACTION_SIZE))
+
+    report = {"total_lines": 0, "imported": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    async def flush(batch: List[Tuple[int, Optional[bytes]]]) -> None:
+        imported, errors = await run_db(db, import_configuration_batch, lines=batch)
+        report["imported"] += imported
+        report["failed"] += len(errors)
+        room = settings.IMPORT_MAX_REPORTED_ERRORS - len(report["errors"])
+        if len(errors) > room:
+            report["errors_truncated"] = True
+        report["errors"].extend(errors[:max(room, 0)])
+
+    batch = []
+    async for line_no, raw in aiter_lines(chunks, settings.IMPORT_MAX_LINE_BYTES):
+        report["total_lines"] = line_no
+        batch.append((line_no, raw))
+        if len(batch) >= size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+
+    return report
+
+
+def validate_candidates(candidates: List[Dict], require_complete: bool = True) -> Dict:
+    """validate many candidate parameter sets without storing them
+    Args:
+         candidates: flat parameter dicts (PN, NOB, LS, GREASE, ...)
+         require_complete: also require every field the schema marks as required
+    Returns:
+         validation report (see ConfigurationBatchValidationResponse)
+     """
+    valid, violations = rule_engine.validate_batch(candidates, require_complete=require_complete)
+    return {
+        "total": len(candidates),
+        "valid_count": int(valid.sum()),
+        "invalid_count": len(violations),
+        "valid": valid.tolist(),
+        "errors": [
+            {"index": index, "violations": violations[index]}
+            for index in sorted(violations)
+        ]
+    }
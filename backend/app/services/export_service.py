@@ -1,67 +1,247 @@
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from app.db.models import Export, Configuration
-from app.schemas.export import ExportCreate, ExportUpdate
-from app.core.cad_engine import dxf_generator
-from typing import List, Optional
+from app.db.pagination import paginate
+from app.schemas.export import ExportBatchCreate, ExportCreate, ExportFormatsCreate, ExportResponse, ExportUpdate
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.export_cache import export_cache
+from app.core.generators import generator_registry
+from app.core.geometry import DEFAULT_DETAIL, get_detail_level
+from app.core.job_queue import export_queue
+from app.core.storage import export_storage, shard_relative
+from app.core.writers import get_writer
+from app.domain.artifacts import artifact_for_format, config_fingerprint
+from app.utils.compression import write_precompressed_variants
+from app.utils.streaming import gzip_chunks, iter_file
+from concurrent.futures import Future, as_completed
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import io
+import json
+import uuid
+import zipfile
+
+# Statuses of exports that still have work to do
+UNFINISHED_STATUSES = ("pending", "processing")
+
+# Read size when copying artifacts into a streamed archive
+ZIP_COPY_CHUNK_SIZE = 64 * 1024
+
+
+def _export_detail(export_format: str, detail: Optional[str]) -> Optional[str]:
+    """
+    Detail level stored on an Export: None for the default level and for
+    formats without detail levels (e.g. STL), so such exports stay interchangeable.
+    """
+    if detail is None or get_detail_level(detail).name == DEFAULT_DETAIL:
+        return None
+    return get_detail_level(detail).name if get_writer(export_format).uses_detail else None
 
 
 def create_export(db: Session, export: ExportCreate) -> Export:
     """
-    Create a new export request and generate the CAD file.
+    Create a new export request and queue CAD generation.
+    
+    The export is returned as `pending` with a `job_id`; a worker moves it
+    through processing -> completed/failed. Cache hits complete immediately.
+    The configuration's product selects the CAD generator (app/core/generators).
     
     Args:
         db: Database session
-        export: Pydantic schema with export data (configuration_id, format)
+        export: Pydantic schema with export data (configuration_id, format, detail)
         
     Returns:
-        Export: The created database object with file_path populated
+        Export: The created database object
     """
     # Create database object from schema
     db_export = Export(
         configuration_id=export.configuration_id,
         format=export.format,
-        status="processing"  # Default status
+        detail=_export_detail(export.format, export.detail),
+        status="pending",
+        job_id=uuid.uuid4().hex
     )
     
     db.add(db_export)
     db.commit()
     db.refresh(db_export)
     
+    _start_export(db, db_export)
+    
+    # Inline mode (EXPORT_WORKERS=0) has already finished the job
+    db.refresh(db_export)
+    return db_export
+
+
+def _start_export(db: Session, db_export: Export) -> Optional[Future]:
+    """
+    Complete an export from the cache or queue a job for it.
+    
+    Args:
+        db: Database session
+        db_export: Freshly created export in `pending` state
+        
+    Returns:
+        Future: The queued job, or None if the export already finished
+    """
+    # Fetch the configuration to get parameters
+    config = db.query(Configuration).filter(
+        Configuration.id == db_export.configuration_id
+    ).first()
+    
+    if not config:
+        db_export.status = "failed"
+        db_export.error_message = f"Configuration {db_export.configuration_id} not found"
+        db.commit()
+        return None
+    
+    # An identical file already exists (or none can be made): no job needed
+    finished = _finish_without_job(db, config, db_export)
+    db.commit()
+    if finished:
+        return None
+    
+    return _enqueue_export(db_export.id)
+
+
+def _finish_without_job(db: Session, config: Configuration, db_export: Export) -> bool:
+    """
+    Complete a pending export from an identical existing file, or fail it if
+    its product can't produce the format or its parameters are invalid.
+    The caller commits.
+    
+    Returns:
+        bool: True if the export is finished, False if it needs a job
+    """
     try:
-        # Fetch the configuration to get parameters
-        config = db.query(Configuration).filter(
-            Configuration.id == export.configuration_id
-        ).first()
+        fingerprint = config_fingerprint(config, artifact_for_format(db_export.format), db_export.detail)
+        existing_path = _existing_artifact(db, config, db_export.format, fingerprint, db_export.detail)
+    except ValueError as e:
+        db_export.status = "failed"
+        db_export.error_message = str(e)
+        return True
+    
+    if not existing_path:
+        return False
+    db_export.status = "completed"
+    db_export.file_path = existing_path
+    db_export.input_hash = fingerprint
+    return True
+
+
+def _existing_artifact(
+    db: Session,
+    config: Configuration,
+    export_format: str,
+    fingerprint: str,
+    detail: Optional[str] = None
+) -> Optional[str]:
+    """
+    Find a generated file of a format matching a configuration's current inputs.
+    
+    Checks the content-addressed cache, then the configuration's own
+    exports: one completed with the same input fingerprint and detail level
+    is still valid, e.g. after a PATCH that only touched status or material_params.
+    
+    Returns:
+        str: Download URL of the file, or None if it must be generated
         
+    Raises:
+        ValueError: If the product doesn't support the format or its parameters are invalid
+    """
+    if settings.EXPORT_CACHE_ENABLED:
+        generator = generator_registry.for_config(config)
+        writer = generator.writer(export_format)
+        cached_path = export_cache.get(generator.cache_key(config, writer, detail or DEFAULT_DETAIL), writer.suffix)
+        if cached_path:
+            return cached_path
+    
+    previous = db.query(Export)\
+        .filter(
+            Export.configuration_id == config.id,
+            Export.status == "completed",
+            Export.input_hash == fingerprint,
+            Export.detail.is_(None) if detail is None else Export.detail == detail
+        )\
+        .order_by(Export.created_at.desc(), Export.id.desc())\
+        .first()
+    if previous and previous.file_path and _artifact_path(previous.file_path).is_file():
+        return previous.file_path
+    return None
+
+
+def _enqueue_export(export_id: int) -> Future:
+    """Submit an export job, marking it failed if its worker dies."""
+    return export_queue.submit(
+        run_export_job,
+        export_id,
+        on_error=lambda e: _mark_failed(export_id, f"Export worker crashed: {e}")
+    )
+
+
+def run_export_job(export_id: int) -> None:
+    """
+    Job entry point executed in a worker process.
+    
+    Args:
+        export_id: ID of the export to process
+    """
+    db = SessionLocal()
+    try:
+        process_export(db, export_id)
+    finally:
+        db.close()
+
+
+def process_export(db: Session, export_id: int) -> Optional[Export]:
+    """
+    Generate the CAD file for an export and record the outcome.
+    
+    Args:
+        db: Database session
+        export_id: ID of the export to process
+        
+    Returns:
+        Export: The completed or failed export object (unchanged if it was
+        no longer pending, i.e. another worker claimed it), or None if not found
+    """
+    # Claim the job atomically: a copy queued by another process's startup
+    # recovery finds it no longer pending and leaves it alone
+    claimed = db.execute(
+        update(Export)
+        .where(Export.id == export_id, Export.status == "pending")
+        .values(status="processing", claimed_at=datetime.utcnow())
+    ).rowcount
+    db.commit()
+    db_export = get_export(db, export_id)
+    if not db_export or not claimed:
+        return db_export
+    
+    try:
+        config = db_export.configuration
         if not config:
             db_export.status = "failed"
-            db_export.error_message = f"Configuration {export.configuration_id} not found"
+            db_export.error_message = f"Configuration {db_export.configuration_id} not found"
             db.commit()
             return db_export
         
-        # Extract parameters for CAD generation
-        geometry_params = config.geometry_params or {}
-        application_params = {
-            'NOB': config.number_of_blocks or 2,
-            'PN': config.part_number or f'SKF-{config.id}',
-            'ST': config.surface_treatment
-        }
-        
-        # Generate the real DXF file
-        file_path = dxf_generator.generate_linear_guide(
-            config_id=config.id,
-            geometry_params=geometry_params,
-            application_params=application_params
-        )
+        # Generate the real file (or reuse an identical cached one)
+        fingerprint = config_fingerprint(config, artifact_for_format(db_export.format), db_export.detail)
+        file_path = _generate_artifact(config, db_export.format, db_export.detail)
         
         # Update the record with success
         db_export.status = "completed"
         db_export.file_path = file_path
+        db_export.input_hash = fingerprint
+        db_export.error_message = None
         db.commit()
         db.refresh(db_export)
         
     except Exception as e:
         # Handle any errors during generation
+        db.rollback()
         db_export.status = "failed"
         db_export.error_message = str(e)
         db.commit()
@@ -70,6 +250,412 @@ def create_export(db: Session, export: ExportCreate) -> Export:
     return db_export
 
 
+def _mark_failed(export_id: int, error_message: str) -> None:
+    """Mark an export failed from outside a request (e.g. a queue callback)."""
+    db = SessionLocal()
+    try:
+        db_export = get_export(db, export_id)
+        if db_export and db_export.status in UNFINISHED_STATUSES:
+            db_export.status = "failed"
+            db_export.error_message = error_message
+            db.commit()
+    finally:
+        db.close()
+
+
+def recover_unfinished_exports(db: Session, lease_seconds: Optional[int] = None) -> int:
+    """
+    Re-queue exports left pending or processing by a crashed process.
+    
+    Several processes may run this at once (workers, rolling restarts), so
+    only exports whose lease (claimed_at, else created_at) expired are
+    candidates, and each is claimed with a conditional UPDATE on the lease
+    it was read with; exactly one process re-queues it.
+    
+    Args:
+        db: Database session
+        lease_seconds: Lease length (default: EXPORT_RECOVERY_LEASE_SECONDS)
+        
+    Returns:
+        int: Number of exports re-queued
+    """
+    if lease_seconds is None:
+        lease_seconds = settings.EXPORT_RECOVERY_LEASE_SECONDS
+    now = datetime.utcnow()
+    lease_start = func.coalesce(Export.claimed_at, Export.created_at)
+    candidates = db.query(Export.id, Export.claimed_at)\
+        .filter(
+            Export.status.in_(UNFINISHED_STATUSES),
+            lease_start < now - timedelta(seconds=lease_seconds)
+        )\
+        .all()
+    
+    recovered = []
+    for export_id, claimed_at in candidates:
+        claimed = db.execute(
+            update(Export)
+            .where(
+                Export.id == export_id,
+                Export.status.in_(UNFINISHED_STATUSES),
+                Export.claimed_at.is_(None) if claimed_at is None else Export.claimed_at == claimed_at
+            )
+            .values(status="pending", claimed_at=now)
+        ).rowcount
+        if claimed:
+            recovered.append(export_id)
+    db.commit()
+    
+    for export_id in recovered:
+        _enqueue_export(export_id)
+    
+    return len(recovered)
+
+
+def _generate_artifact(config: Configuration, export_format: str, detail: Optional[str] = None) -> str:
+    """
+    Return a file of a configuration in one format, reusing a content-identical file if present.
+    
+    The configuration's product selects the generator (app/core/generators).
+    
+    Args:
+        config: Configuration to export
+        export_format: Export format (see app.core.writers.WRITERS)
+        detail: Drawing detail level (None = standard)
+        
+    Returns:
+        str: Download URL of the file
+        
+    Raises:
+        ValueError: If the product doesn't support the format or its parameters are invalid
+    """
+    generator = generator_registry.for_config(config)
+    writer = generator.writer(export_format)
+    detail = _export_detail(writer.format, detail) or DEFAULT_DETAIL
+    
+    if not settings.EXPORT_CACHE_ENABLED:
+        # One file per input fingerprint and detail level, so exports of earlier inputs stay intact
+        fingerprint = config_fingerprint(config, artifact_for_format(writer.format), detail)
+        level_suffix = "" if detail == DEFAULT_DETAIL else f"_{detail}"
+        relative_name = shard_relative(f"skf_config_{config.id}_{fingerprint[:12]}{level_suffix}{writer.suffix}")
+        writer.save(generator.geometry(config), export_storage.root_dir / relative_name, detail)
+        file_path = f"/downloads/{relative_name}"
+        _precompress(file_path)
+        return file_path
+    
+    cache_key = generator.cache_key(config, writer, detail)
+    path = export_cache.path_for(cache_key, writer.suffix)
+    if not path.exists():
+        writer.save(generator.geometry(config), path, detail)
+        _precompress(export_cache.url_for(cache_key, writer.suffix))
+    return export_cache.url_for(cache_key, writer.suffix)
+
+
+def _precompress(file_path: str) -> None:
+    """Write .gz/.br variants next to a freshly generated artifact."""
+    if settings.EXPORT_PRECOMPRESS:
+        write_precompressed_variants(_artifact_path(file_path))
+
+
+def stream_export(db: Session, export: ExportCreate) -> Optional[Iterator[bytes]]:
+    """
+    Generate a file and return its bytes for direct delivery in the response.
+    
+    Without `persist` the geometry is serialised straight into the response
+    and no file or Export row is created. With `persist` a durable artifact
+    is stored (reusing the export cache) and recorded as a completed Export,
+    and its bytes are streamed from disk.
+    
+    Args:
+        db: Database session
+        export: Export request with delivery="stream"
+        
+    Returns:
+        Iterator[bytes]: File bytes (gzip-compressed if requested), or None
+        if the configuration does not exist
+    """
+    config = db.query(Configuration).filter(
+        Configuration.id == export.configuration_id
+    ).first()
+    if not config:
+        return None
+    
+    detail = _export_detail(export.format, export.detail)
+    if export.persist:
+        file_path = _generate_artifact(config, export.format, detail)
+        db_export = Export(
+            configuration_id=config.id,
+            format=export.format,
+            detail=detail,
+            status="completed",
+            file_path=file_path,
+            input_hash=config_fingerprint(config, artifact_for_format(export.format), detail),
+            job_id=uuid.uuid4().hex
+        )
+        db.add(db_export)
+        db.commit()
+        chunks = iter_file(_artifact_path(file_path))
+    else:
+        generator = generator_registry.for_config(config)
+        chunks = generator.writer(export.format).iter_bytes(generator.geometry(config), detail or DEFAULT_DETAIL)
+    
+    return gzip_chunks(chunks) if export.compress else chunks
+
+
+def start_batch_export(
+    db: Session,
+    batch: ExportBatchCreate
+) -> Tuple[str, List[Tuple[int, Optional[Future]]]]:
+    """
+    Create one export per selected configuration and queue them in parallel.
+    
+    Args:
+        db: Database session
+        batch: Explicit configuration IDs and/or a status/part_number filter
+        
+    Returns:
+        Tuple: Batch ID (stored as each export's job_id) and (export_id, job) pairs
+    """
+    if batch.configuration_ids:
+        config_ids = list(dict.fromkeys(batch.configuration_ids))
+    else:
+        query = db.query(Configuration.id)
+        if batch.status is not None:
+            query = query.filter(Configuration.status == batch.status)
+        if batch.part_number is not None:
+            query = query.filter(Configuration.part_number == batch.part_number)
+        config_ids = [row.id for row in query.order_by(Configuration.id).all()]
+    config_ids = config_ids[:settings.EXPORT_BATCH_MAX_ITEMS]
+    
+    batch_id = uuid.uuid4().hex
+    db_exports = [
+        Export(
+            configuration_id=config_id,
+            format=batch.format,
+            detail=_export_detail(batch.format, batch.detail),
+            status="pending",
+            job_id=batch_id
+        )
+        for config_id in config_ids
+    ]
+    db.add_all(db_exports)
+    db.commit()
+    
+    jobs = [(db_export.id, _start_export(db, db_export)) for db_export in db_exports]
+    return batch_id, jobs
+
+
+def create_format_exports(db: Session, request: ExportFormatsCreate) -> Optional[List[Export]]:
+    """
+    Export one configuration in several formats with a single job.
+    
+    One export is created per format; the job generates them one after
+    another in the same worker, so the geometry is built once and each
+    extra format only costs its serialisation.
+    
+    Args:
+        db: Database session
+        request: Configuration ID and the formats to produce
+        
+    Returns:
+        List[Export]: The created exports in the requested order, or None
+        if the configuration does not exist
+    """
+    config = db.query(Configuration).filter(
+        Configuration.id == request.configuration_id
+    ).first()
+    if not config:
+        return None
+    
+    group_id = uuid.uuid4().hex
+    db_exports = [
+        Export(
+            configuration_id=request.configuration_id,
+            format=export_format,
+            detail=_export_detail(export_format, request.detail),
+            status="pending",
+            job_id=group_id
+        )
+        for export_format in dict.fromkeys(request.formats)
+    ]
+    db.add_all(db_exports)
+    db.commit()
+    
+    # Formats already on disk complete immediately; the rest share one job
+    queued = [db_export.id for db_export in db_exports if not _finish_without_job(db, config, db_export)]
+    db.commit()
+    
+    if queued:
+        export_queue.submit(
+            run_export_group,
+            queued,
+            on_error=lambda e: [_mark_failed(export_id, f"Export worker crashed: {e}") for export_id in queued]
+        )
+    
+    for db_export in db_exports:
+        db.refresh(db_export)
+    return db_exports
+
+
+def run_export_group(export_ids: List[int]) -> None:
+    """
+    Job entry point processing several exports in one worker.
+    
+    Args:
+        export_ids: IDs of the exports to process, in order
+    """
+    db = SessionLocal()
+    try:
+        for export_id in export_ids:
+            process_export(db, export_id)
+    finally:
+        db.close()
+
+
+class _ZipStreamBuffer(io.RawIOBase):
+    """Write-only sink that hands zipfile output to a generator chunk by chunk."""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _in_completion_order(jobs: List[Tuple[int, Optional[Future]]]) -> Iterator[int]:
+    """Yield export IDs as their jobs finish (already finished ones first)."""
+    pending = {}
+    for export_id, future in jobs:
+        if future is None:
+            yield export_id
+        else:
+            pending[future] = export_id
+    
+    for future in as_completed(pending):
+        export_id = pending[future]
+        if future.exception() is not None:
+            # The done-callback may not have run yet; record the crash now
+            _mark_failed(export_id, f"Export worker crashed: {future.exception()}")
+        yield export_id
+
+
+def _artifact_path(file_path: str) -> Path:
+    """Map a /downloads URL back to the file under EXPORT_DIR."""
+    return export_storage.path_for_url(file_path)
+
+
+def stream_batch_zip(
+    batch_id: str,
+    jobs: List[Tuple[int, Optional[Future]]]
+) -> Iterator[bytes]:
+    """
+    Stream a ZIP of a batch's files as each export finishes.
+    
+    Files are copied into the archive in chunks and every compressed chunk is
+    yielded straight away, so neither the archive nor a temp file is ever
+    materialised. The archive ends with manifest.json listing every export
+    (ExportResponse fields plus its archive_name, if any).
+    
+    Args:
+        batch_id: ID returned by start_batch_export
+        jobs: (export_id, job) pairs returned by start_batch_export
+        
+    Yields:
+        bytes: Consecutive pieces of the ZIP archive
+    """
+    buffer = _ZipStreamBuffer()
+    manifest = []
+    
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for export_id in _in_completion_order(jobs):
+            db = SessionLocal()
+            try:
+                item = ExportResponse.model_validate(get_export(db, export_id)).model_dump(mode="json")
+            finally:
+                db.close()
+            
+            item["archive_name"] = None
+            if item["status"] == "completed" and item["file_path"]:
+                source = _artifact_path(item["file_path"])
+                archive_name = f"skf_config_{item['configuration_id']}{source.suffix}"
+                try:
+                    with open(source, "rb") as src, archive.open(archive_name, "w") as dest:
+                        for chunk in iter(lambda: src.read(ZIP_COPY_CHUNK_SIZE), b""):
+                            dest.write(chunk)
+                            yield buffer.drain()
+                    item["archive_name"] = archive_name
+                except FileNotFoundError:
+                    item["status"] = "failed"
+                    item["error_message"] = "Generated file is no longer available"
+            
+            manifest.append(item)
+            yield buffer.drain()
+        
+        archive.writestr("manifest.json", json.dumps({
+            "batch_id": batch_id,
+            "total": len(manifest),
+            "completed": sum(1 for item in manifest if item["status"] == "completed"),
+            "failed": sum(1 for item in manifest if item["status"] != "completed"),
+            "items": manifest
+        }, indent=2))
+    
+    yield buffer.drain()
+
+
+def get_generators() -> List[Dict[str, Any]]:
+    """
+    Describe the CAD generator of every registered product.
+    
+    Returns:
+        List[Dict]: Product ID, name, formats and parameter schema per generator
+    """
+    return [generator_registry.get(product_id).describe() for product_id in generator_registry.product_ids()]
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get hit/miss counters of the export cache.
+    
+    Returns:
+        Dict: Cache statistics (hits, misses, hit_rate)
+    """
+    return export_cache.stats()
+
+
+def sweep_storage() -> Dict[str, Any]:
+    """
+    Apply the retention policy and remove orphaned files now.
+    
+    Returns:
+        Dict: Sweep report (files removed per reason, bytes reclaimed)
+    """
+    return export_storage.sweep()
+
+
+def get_last_storage_report() -> Optional[Dict[str, Any]]:
+    """
+    Get the report of the most recent storage sweep in this process.
+    
+    Returns:
+        Dict: Sweep report, or None if no sweep has run yet
+    """
+    return export_storage.last_report
+
+
 def get_export(db: Session, export_id: int) -> Optional[Export]:
     """
     Get a single export by ID.
@@ -96,11 +682,38 @@ def get_exports_by_config(db: Session, configuration_id: int, skip: int = 0, lim
     Returns:
         List[Export]: List of export objects
     """
-    return db.query(Export)\
-        .filter(Export.configuration_id == configuration_id)\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    return get_exports_page(db, configuration_id, skip=skip, limit=limit)[0]
+
+
+def get_exports_page(
+    db: Session,
+    configuration_id: int,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    status: Optional[str] = None
+) -> Tuple[List[Export], Optional[str]]:
+    """
+    Get one page of a configuration's exports ordered by (created_at, id).
+    
+    Args:
+        db: Database session
+        configuration_id: ID of the configuration to filter by
+        limit: Page size
+        cursor: Opaque position from the previous page (keyset paging)
+        skip: Offset paging, used only without a cursor
+        status: Optional status filter
+        
+    Returns:
+        Tuple: The page and the cursor of the next page (None on the last page)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = db.query(Export).filter(Export.configuration_id == configuration_id)
+    if status is not None:
+        query = query.filter(Export.status == status)
+    return paginate(query, Export, limit=limit, cursor=cursor, skip=skip)
 
 def update_export_status(db: Session, export_id: int, export_update: ExportUpdate) -> Optional[Export]:
     """
@@ -0,0 +1,185 @@
+from sqlalchemy.orm import Session
+from app.db.models import Configuration
+from app.core.config import settings
+from app.core.export_cache import compute_cache_key, model_cache
+from app.core.generators import generator_registry
+from app.core.mesh_engine import model_generator
+from app.core.model_stretch import AXIS_NAMES, STRETCH_REVISION, get_stretch_template
+from app.utils.compression import write_precompressed_variants
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def _model_cache_key(inputs: Dict[str, Any]) -> str:
+    """Content hash of normalized model inputs."""
+    return compute_cache_key({
+        "artifact": "linear_guide_glb",
+        "revision": model_generator.MODEL_REVISION,
+        **inputs
+    })
+
+
+def configuration_model_args(config: Configuration) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Geometry and application parameters a configuration's model is built from."""
+    return config.geometry_params or {}, {'NOB': config.number_of_blocks or 2}
+
+
+def is_model_generated(geometry_params: Dict[str, Any], application_params: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Whether the model for these parameters is already in the cache.
+    
+    Does not count as a cache hit or miss; inconsistent dimensions give False.
+    """
+    try:
+        inputs = model_generator.model_inputs(geometry_params, application_params)
+    except ValueError:
+        return False
+    return model_cache.path_for(_model_cache_key(inputs)).is_file()
+
+
+def get_linear_guide_model(geometry_params: Dict[str, Any], application_params: Optional[Dict[str, Any]] = None) -> Path:
+    """
+    Return the GLB for a Linear Guide, generating it on a cache miss.
+    
+    Models are cached by a hash of their normalized inputs, so every
+    configuration with the same dimensions shares one file.
+    
+    Args:
+        geometry_params: Dict containing W, LS, H, H1, L1, B, F, G, ...
+        application_params: Dict containing NOB
+        
+    Returns:
+        Path: The cached GLB file
+        
+    Raises:
+        ValueError: If the dimensions are inconsistent
+    """
+    inputs = model_generator.model_inputs(geometry_params, application_params)
+    key = _model_cache_key(inputs)
+    path = model_cache.path_for(key)
+    if model_cache.get(key) is None:
+        model_generator.build_linear_guide(inputs).save(path)
+        if settings.EXPORT_PRECOMPRESS:
+            write_precompressed_variants(path)
+    return path
+
+
+def get_configuration_model(db: Session, config_id: int) -> Optional[Path]:
+    """
+    Return the GLB for a stored configuration.
+    
+    Args:
+        db: Database session
+        config_id: ID of the configuration
+        
+    Returns:
+        Path: The cached GLB file, or None if the configuration doesn't exist
+        
+    Raises:
+        ValueError: If the configuration's dimensions are inconsistent or its
+            product has no parametric 3D model
+    """
+    config = db.query(Configuration).filter(Configuration.id == config_id).first()
+    if not config:
+        return None
+    generator = generator_registry.for_config(config)
+    if not generator.has_model:
+        raise ValueError(f"{generator.name} has no parametric 3D model")
+    return get_linear_guide_model(*configuration_model_args(config))
+
+
+def catalog_model_path(model_name: str) -> Optional[Path]:
+    """
+    Resolve a catalog model name (file stem under MODELS_DIR) to its GLB.
+    
+    Returns:
+        Path: The GLB file, or None if there is no such model
+    """
+    if not model_name or Path(model_name).name != model_name or model_name.startswith("."):
+        return None
+    path = settings.models_path / f"{model_name}.glb"
+    return path if path.is_file() else None
+
+
+def quantize_stretch_length(length: float) -> float:
+    """
+    Round a stretch length to MODEL_STRETCH_STEP_MM (never below one step).
+    
+    Returns:
+        float: The length a stretched model is generated and cached at
+    """
+    step = settings.MODEL_STRETCH_STEP_MM
+    if step <= 0:
+        return float(length)
+    return max(step, round(float(length) / step) * step)
+
+
+def get_stretched_model(model_name: str, length: float) -> Optional[Path]:
+    """
+    Return a catalog model stretched to a length, generating it on a cache miss.
+    
+    Ends and hole features keep their shape; only the plain zones between
+    them elongate (see app/core/model_stretch.py). The length is rounded to
+    MODEL_STRETCH_STEP_MM so nearby lengths share one cached file.
+    
+    Args:
+        model_name: Catalog model name (file stem under MODELS_DIR)
+        length: Target length along the model's long axis (model units, mm)
+        
+    Returns:
+        Path: The cached GLB file, or None if the model doesn't exist
+        
+    Raises:
+        ValueError: If the length exceeds MODEL_STRETCH_MAX_LENGTH_MM or the
+            model cannot be stretched to it
+    """
+    length = quantize_stretch_length(length)
+    if length > settings.MODEL_STRETCH_MAX_LENGTH_MM:
+        raise ValueError(
+            f"Length {length:g} mm exceeds the maximum of {settings.MODEL_STRETCH_MAX_LENGTH_MM:g} mm"
+        )
+    source = catalog_model_path(model_name)
+    if source is None:
+        return None
+    stat_result = source.stat()
+    key = compute_cache_key({
+        "artifact": "stretched_glb",
+        "revision": STRETCH_REVISION,
+        "model": model_name,
+        "source": [stat_result.st_mtime_ns, stat_result.st_size],
+        "length": round(float(length), 3)
+    })
+    path = model_cache.path_for(key)
+    if model_cache.get(key) is None:
+        get_stretch_template(source).build(length).save(path)
+        if settings.EXPORT_PRECOMPRESS:
+            write_precompressed_variants(path)
+    return path
+
+
+def get_stretch_info(model_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the stretch zones of a catalog model.
+    
+    Returns:
+        Dict: Axis, base/minimum length and zones, or None if the model doesn't exist
+        
+    Raises:
+        ValueError: If the model cannot be stretched
+    """
+    source = catalog_model_path(model_name)
+    if source is None:
+        return None
+    template = get_stretch_template(source)
+    return {
+        "model": model_name,
+        "axis": AXIS_NAMES[template.axis],
+        "base_length": template.base_length,
+        "min_length": template.min_length,
+        "zones": template.zones(),
+    }
+
+
+def get_model_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss counters of the model cache."""
+    return model_cache.stats()
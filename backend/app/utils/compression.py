@@ -0,0 +1,61 @@
+"""
+Compression helpers - precompressed variants of generated artifacts
+Path: app/utils/compression.py
+"""
+import gzip
+import os
+from pathlib import Path
+from typing import Dict, List
+
+try:  # optional dependency: `pip install brotli` enables .br variants
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+# Content-Encoding -> file suffix, in order of preference
+PRECOMPRESSED_SUFFIXES: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+
+def _compress(encoding: str, data: bytes) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def available_encodings() -> List[str]:
+    """Encodings that can be produced in this environment."""
+    return [enc for enc in PRECOMPRESSED_SUFFIXES if enc != "br" or brotli is not None]
+
+
+def variant_path(path: Path, encoding: str) -> Path:
+    """Path of the precompressed variant of a file."""
+    return path.with_name(path.name + PRECOMPRESSED_SUFFIXES[encoding])
+
+
+def write_precompressed_variants(path: Path) -> List[Path]:
+    """
+    Write max-compression gzip (and brotli, if installed) copies next to a file.
+    
+    Variants are written atomically, so a reader never sees a partial file.
+    
+    Args:
+        path: File to compress
+        
+    Returns:
+        List[Path]: Paths of the written variants
+    """
+    data = path.read_bytes()
+    written = []
+    for encoding in available_encodings():
+        target = variant_path(path, encoding)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(_compress(encoding, data))
+        os.replace(tmp_path, target)
+        written.append(target)
+    return written
+
+
+def remove_precompressed_variants(path: Path) -> None:
+    """Delete all precompressed variants of a file."""
+    for encoding in PRECOMPRESSED_SUFFIXES:
+        variant_path(path, encoding).unlink(missing_ok=True)
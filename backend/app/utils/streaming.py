@@ -0,0 +1,190 @@
+"""
+Streaming helpers - turn push-style writers into pull-style byte iterators
+Path: app/utils/streaming.py
+"""
+import queue
+import threading
+import zlib
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+# Default size of the chunks handed to the HTTP response
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_DONE = object()
+
+
+class _QueueTextSink:
+    """Text stream that encodes writes and hands full chunks to a queue."""
+    
+    def __init__(
+        self,
+        chunks: "queue.Queue",
+        stop: threading.Event,
+        encoding: str,
+        errors: str,
+        chunk_size: int
+    ):
+        self._chunks = chunks
+        self._stop = stop
+        self._encoding = encoding
+        self._errors = errors
+        self._chunk_size = chunk_size
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+    
+    def write(self, text: str) -> int:
+        data = text.encode(self._encoding, self._errors)
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= self._chunk_size:
+            self.flush()
+        return len(text)
+    
+    def flush(self) -> None:
+        if self._pending:
+            self._put(b"".join(self._pending))
+            self._pending.clear()
+            self._pending_size = 0
+    
+    def _put(self, item) -> None:
+        # Block while the consumer is behind, but give up once it is gone
+        while not self._stop.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise ConnectionAbortedError("Stream consumer went away")
+
+
+def iter_text_writer(
+    write: Callable[[TextIO], None],
+    encoding: str = "utf-8",
+    errors: str = "strict",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_pending_chunks: int = 4
+) -> Iterator[bytes]:
+    """
+    Run a function that writes text to a stream and yield the encoded output.
+    
+    The writer runs in a helper thread and a bounded queue provides
+    back-pressure, so at most `max_pending_chunks` chunks are buffered no
+    matter how large the output is. Closing the iterator early stops the writer.
+    
+    Args:
+        write: Callable that writes its whole output to the given text stream
+        encoding: Output encoding
+        errors: Encoding error handler
+        chunk_size: Approximate size of yielded chunks in bytes
+        max_pending_chunks: Queue bound between writer and consumer
+        
+    Yields:
+        bytes: Encoded output chunks
+    """
+    chunks: "queue.Queue" = queue.Queue(maxsize=max_pending_chunks)
+    stop = threading.Event()
+    failure: List[BaseException] = []
+    sink = _QueueTextSink(chunks, stop, encoding, errors, chunk_size)
+    
+    def _produce() -> None:
+        try:
+            write(sink)  # type: ignore[arg-type]
+            sink.flush()
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            try:
+                sink._put(_DONE)
+            except ConnectionAbortedError:
+                pass
+    
+    producer = threading.Thread(target=_produce, name="stream-writer", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                break
+            yield item
+        if failure:
+            raise failure[0]
+    finally:
+        stop.set()
+        producer.join(timeout=1)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip-compress a byte stream on the fly.
+    
+    Args:
+        chunks: Uncompressed input chunks
+        level: zlib compression level (1-9)
+        
+    Yields:
+        bytes: Chunks of a single gzip member
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_file(path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's bytes in chunks."""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            yield chunk
+
+
+async def aiter_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split an async byte stream into lines without buffering the whole body.
+    
+    Only the current partial line is held in memory. Lines longer than
+    max_line_bytes are discarded as they arrive and reported as None so
+    the caller can record an error for them.
+    
+    Args:
+        chunks: Async byte stream (e.g. Request.stream())
+        max_line_bytes: Longest accepted line, excluding the newline
+        
+    Yields:
+        Tuple: 1-based line number and the line without its newline
+               (None if the line was too long)
+    """
+    line_no = 0
+    pending = bytearray()
+    overflow = False
+    
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                if not overflow:
+                    pending += chunk[start:]
+                    if len(pending) > max_line_bytes:
+                        overflow = True
+                        pending.clear()
+                break
+            
+            line_no += 1
+            if overflow or len(pending) + end - start > max_line_bytes:
+                yield line_no, None
+            else:
+                pending += chunk[start:end]
+                yield line_no, bytes(pending)
+            pending.clear()
+            overflow = False
+            start = end + 1
+    
+    # Last line without a trailing newline
+    if pending or overflow:
+        line_no += 1
+        yield line_no, None if overflow else bytes(pending)
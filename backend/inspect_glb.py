@@ -1,75 +1,57 @@
+"""
+Inspect a GLB file: node hierarchy, per-mesh bounds and triangle counts.
+
+Usage (from backend/):
+    python inspect_glb.py path/to/model.glb [--json]
+"""
+import argparse
 import json
-import struct
-import os
+import sys
 
-def inspect_glb(file_path):
-    print(f"Inspecting: {file_path}")
-    
-    if not os.path.exists(file_path):
-        print("Error: File not found")
-        return
+from app.core.glb_reader import GLBDocument
 
-    with open(file_path, 'rb') as f:
-        # Read Header
-        magic = f.read(4)
-        if magic != b'glTF':
-            print("Error: Not a valid GLB file")
-            return
-            
-        version = struct.unpack('<I', f.read(4))[0]
-        length = struct.unpack('<I', f.read(4))[0]
-        
-        print(f"GLB Version: {version}")
-        print(f"Total File Size: {length} bytes")
-        
-        # Read first chunk (JSON)
-        chunk_length = struct.unpack('<I', f.read(4))[0]
-        chunk_type = f.read(4)
-        
-        if chunk_type != b'JSON':
-            print("Error: First chunk is not JSON")
+
+def print_tree(entries, indent=""):
+    for entry in entries:
+        mesh_info = f" [Mesh: {entry['mesh']}]" if entry["mesh"] else ""
+        print(f"{indent}- {entry['name']}{mesh_info}")
+        print_tree(entry["children"], indent + "  ")
+
+
+def inspect_glb(file_path, as_json=False):
+    with GLBDocument(file_path) as doc:
+        summary = doc.summary()
+        if as_json:
+            summary["hierarchy"] = doc.node_tree()
+            print(json.dumps(summary, indent=2))
             return
-            
-        json_data = f.read(chunk_length)
-        data = json.loads(json_data.decode('utf-8'))
-        
-        # Analyze structure
-        nodes = data.get('nodes', [])
-        meshes = data.get('meshes', [])
-        scenes = data.get('scenes', [])
-        
+
+        print(f"Inspecting: {file_path}")
+        print(f"Total File Size: {summary['bytes']} bytes "
+              f"(JSON {summary['json_bytes']}, BIN {summary['bin_bytes']})")
+
         print(f"\n--- Structure Summary ---")
-        print(f"Total Nodes: {len(nodes)}")
-        print(f"Total Meshes: {len(meshes)}")
-        
+        print(f"Total Nodes: {summary['nodes']}")
+        print(f"Total Meshes: {summary['meshes']}")
+        print(f"Rendered Triangles: {summary['rendered_triangles']}")
+        print(f"Scene Bounds: {summary['scene_min']} .. {summary['scene_max']}")
+
+        print(f"\n--- Meshes ---")
+        for mesh in summary["mesh_details"]:
+            print(f"- {mesh['name']}: {mesh['triangles']} triangles x{mesh['instances']}, "
+                  f"bounds {mesh['min']} .. {mesh['max']}")
+
         print(f"\n--- Node Hierarchy ---")
-        # Find root nodes (nodes not referenced as children of other nodes)
-        all_children = set()
-        for node in nodes:
-            if 'children' in node:
-                all_children.update(node['children'])
-                
-        root_nodes = [i for i in range(len(nodes)) if i not in all_children]
-        
-        def print_tree(node_index, indent=""):
-            node = nodes[node_index]
-            name = node.get('name', f"Node_{node_index}")
-            mesh_index = node.get('mesh')
-            mesh_info = ""
-            if mesh_index is not None:
-                mesh_name = meshes[mesh_index].get('name', f"Mesh_{mesh_index}")
-                mesh_info = f" [Mesh: {mesh_name}]"
-                
-            print(f"{indent}- {name}{mesh_info}")
-            
-            if 'children' in node:
-                for child_index in node['children']:
-                    print_tree(child_index, indent + "  ")
+        print_tree(doc.node_tree())
 
-        for root in root_nodes:
-            print_tree(root)
 
 if __name__ == "__main__":
-    # Adjusted path for the user's environment
-    file_path = r"c:\Users\shashank\Desktop\SKF3\frontend\src\assets\model.glb"
-    inspect_glb(file_path)
+    parser = argparse.ArgumentParser(description="Inspect a GLB file")
+    parser.add_argument("file_path")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+    try:
+        inspect_glb(args.file_path, as_json=args.json)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
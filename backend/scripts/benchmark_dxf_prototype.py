@@ -0,0 +1,66 @@
+"""
+Benchmark: per-export DXF time with and without the prototype document.
+
+Usage (from backend/):
+    python scripts/benchmark_dxf_prototype.py [--runs 200]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Make `app` importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.cad_engine import DXFGenerator
+
+
+def time_document_setup(generator: DXFGenerator, runs: int) -> float:
+    """Average milliseconds to obtain a ready-to-draw document."""
+    generator._new_document()  # warm-up (builds the prototype once)
+    start = time.perf_counter()
+    for _ in range(runs):
+        generator._new_document()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def time_full_export(generator: DXFGenerator, runs: int, out_dir: Path) -> float:
+    """Average milliseconds for a complete generate_linear_guide call."""
+    generator.EXPORT_DIR = out_dir
+    generator.generate_linear_guide(0, {'W': 20, 'LS': 1000}, {'NOB': 4, 'PN': 'BENCH'})
+    start = time.perf_counter()
+    for i in range(runs):
+        generator.generate_linear_guide(
+            config_id=i,
+            geometry_params={'W': 20, 'LS': 100 + (i % 15) * 100},
+            application_params={'NOB': 1 + i % 10, 'PN': 'BENCH'}
+        )
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        results = {}
+        for label, use_prototype in (("ezdxf.new", False), ("prototype", True)):
+            generator = DXFGenerator(use_prototype=use_prototype)
+            results[label] = (
+                time_document_setup(generator, args.runs),
+                time_full_export(generator, args.runs, out_dir)
+            )
+    
+    print(f"{'mode':<12}{'doc setup (ms)':>16}{'full export (ms)':>18}")
+    for label, (setup_ms, export_ms) in results.items():
+        print(f"{label:<12}{setup_ms:>16.2f}{export_ms:>18.2f}")
+    
+    before, after = results["ezdxf.new"][1], results["prototype"][1]
+    print(f"\nPer-export speedup: {before - after:.2f} ms ({(before - after) / before:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+"""
+Benchmark suite: API throughput and CAD generation, compared against a baseline.
+
+Runs offline in one process against a temporary SQLite database and
+exports directory, driving the app through an in-process ASGI client
+(httpx + the app's lifespan). Suites:
+
+    cad         generate_linear_guide latency over NOB 1-10 x LS 100-1500
+                (geometry cache disabled, so every call builds the drawing)
+    crud        sequential create / read / update / delete of configurations
+    pagination  first page, deep offset page and a cursor walk at each table
+                size (rows are seeded through the bulk NDJSON import)
+    exports     concurrent DXF exports through the job queue (artifact cache
+                disabled, distinct parameters so nothing is deduplicated)
+    startup     cold import of app.main and lifespan startup in fresh
+                interpreters (scripts/startup_profile.py), checked against
+                a time budget; ezdxf must not be imported with the app
+    detail      render + serialise latency and file size of each drawing
+                detail level (preview, standard, full) in DXF and SVG, over
+                a small, a medium and a large guide (geometry built once)
+
+Results are written as JSON. Each metric records whether lower or higher
+is better; gated metrics present in the baseline are compared and the run
+exits with status 1 if any regressed by more than the threshold, or if
+startup exceeded its budget (an absolute limit, checked even without a
+baseline). Only stable metrics are gated: means, medians, throughput and
+output sizes. Tail latencies (p95), single grid cells, sub-millisecond
+SVG writes and the lifespan startup time are reported but never fail a run.
+
+Baselines are machine-specific and are not committed (the default path is
+git-ignored): record one with --save-baseline on the machine (or CI
+runner) that compares against it, with the same options.
+
+Usage (from backend/):
+    python scripts/benchmark_suite.py [--suites cad,crud,pagination,exports,startup,detail]
+        [--rows 10000,100000] [--output results.json]
+        [--baseline scripts/benchmark_baseline.json] [--threshold 0.5]
+        [--startup-budget-ms 1500] [--save-baseline] [--quick]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+SUITES = ("cad", "crud", "pagination", "exports", "startup", "detail")
+
+NOB_GRID = range(1, 11)
+LS_GRID = range(100, 1501, 100)
+PAGE_SIZE = 100
+DETAIL_SIZES = {"small": (1, 100), "medium": (4, 800), "large": (10, 1500)}  # NOB, LS
+DETAIL_FORMATS = ("DXF", "SVG")
+
+
+class Results:
+    """Collected metrics plus unscored details (e.g. the full latency grid)."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self.details: Dict[str, Any] = {}
+
+    def add(self, name: str, value: float, unit: str, better: str = "lower", gated: bool = True) -> None:
+        """Record a metric; ungated (noisy) metrics are compared for information only."""
+        self.metrics[name] = {"value": round(value, 4), "unit": unit, "better": better, "gated": gated}
+        print(f"  {name:<48}{value:>12.2f} {unit}")
+
+    def add_latencies(self, prefix: str, samples_ms: List[float]) -> None:
+        """Mean, p50 and p95 of a latency sample (milliseconds)."""
+        self.add(f"{prefix}.mean_ms", statistics.fmean(samples_ms), "ms")
+        self.add(f"{prefix}.p50_ms", percentile(samples_ms, 50), "ms")
+        self.add(f"{prefix}.p95_ms", percentile(samples_ms, 95), "ms", gated=False)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+async def timed(call: Callable, *args, **kwargs):
+    """Await a call and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = await call(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def configuration_payload(i: int) -> Dict[str, Any]:
+    """Deterministic, valid configuration spread over the NOB x LS grid."""
+    return {
+        "part_number": f"BENCH-{i:06d}",
+        "number_of_blocks": NOB_GRID[i % len(NOB_GRID)],
+        "geometry_params": {"W": 20, "LS": LS_GRID[(i // len(NOB_GRID)) % len(LS_GRID)]},
+    }
+
+
+# =============================================================================
+# SUITES
+# =============================================================================
+
+def bench_cad(results: Results, repeat: int) -> None:
+    """generate_linear_guide latency across the NOB x LS grid."""
+    from app.core.cad_engine import dxf_generator
+
+    dxf_generator.generate_linear_guide(0, {"W": 20, "LS": 500}, {"NOB": 2, "PN": "BENCH"})  # prototype, ezdxf import
+    grid: Dict[str, float] = {}
+    samples: List[float] = []
+    config_id = 1
+    for nob in NOB_GRID:
+        for ls in LS_GRID:
+            cell = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                dxf_generator.generate_linear_guide(
+                    config_id, {"W": 20, "LS": ls}, {"NOB": nob, "PN": "BENCH"}, filename="bench/cad.dxf"
+                )
+                cell.append((time.perf_counter() - start) * 1000)
+                config_id += 1
+            grid[f"NOB={nob},LS={ls}"] = statistics.fmean(cell)
+            samples.extend(cell)
+
+    results.add_latencies("cad.generate_linear_guide", samples)
+    results.add("cad.generate_linear_guide.nob1_ls100_ms", grid["NOB=1,LS=100"], "ms", gated=False)
+    results.add("cad.generate_linear_guide.nob10_ls1500_ms", grid["NOB=10,LS=1500"], "ms", gated=False)
+    results.details["cad.generate_linear_guide.grid_ms"] = {key: round(value, 3) for key, value in grid.items()}
+
+
+def bench_startup(results: Results, runs: int, database_url: str, budget_ms: float, lifespan_budget_ms: float) -> List[str]:
+    """Cold start in fresh interpreters (fastest run); returns the exceeded budgets."""
+    from startup_profile import run_once  # scripts/ is on sys.path when run as a script
+
+    samples = [run_once(["ezdxf"], database_url) for _ in range(max(runs, 1))]
+    import_ms = min(sample["import_ms"] for sample in samples)
+    lifespan_ms = min(sample["lifespan_ms"] for sample in samples)
+    results.add("startup.import_ms", import_ms, "ms")
+    results.add("startup.lifespan_ms", lifespan_ms, "ms", gated=False)  # a few ms; enforced by its budget
+
+    failures = []
+    if budget_ms and import_ms > budget_ms:
+        failures.append(f"import of app.main took {import_ms:.0f} ms (budget {budget_ms:.0f} ms)")
+    if lifespan_budget_ms and lifespan_ms > lifespan_budget_ms:
+        failures.append(f"lifespan startup took {lifespan_ms:.0f} ms (budget {lifespan_budget_ms:.0f} ms)")
+    loaded = sorted({name for sample in samples for name in sample["forbidden_loaded"]})
+    if loaded:
+        failures.append(f"imported at startup but should load lazily: {', '.join(loaded)}")
+    return failures
+
+
+def bench_detail(results: Results, repeat: int) -> None:
+    """Render + serialise latency and output size per drawing detail level."""
+    from app.core.geometry import DETAIL_LEVELS, build_linear_guide_geometry, linear_guide_drawing_inputs
+    from app.core.writers import get_writer
+
+    geometries = {
+        size: build_linear_guide_geometry(
+            linear_guide_drawing_inputs(1, {"W": 20, "LS": ls}, {"NOB": nob, "PN": "BENCH"}), {"W": 20, "LS": ls}
+        )
+        for size, (nob, ls) in DETAIL_SIZES.items()
+    }
+    b"".join(get_writer("DXF").iter_bytes(geometries["small"]))  # ezdxf import
+    table: Dict[str, Dict[str, Any]] = {}
+    for export_format in DETAIL_FORMATS:
+        writer = get_writer(export_format)
+        for level in DETAIL_LEVELS:
+            samples: List[float] = []
+            for size, geometry in geometries.items():
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    size_bytes = sum(len(chunk) for chunk in writer.iter_bytes(geometry, level))
+                    samples.append((time.perf_counter() - start) * 1000)
+                table[f"{export_format},{level},{size}"] = {
+                    "mean_ms": round(statistics.fmean(samples[-repeat:]), 3), "bytes": size_bytes
+                }
+            prefix = f"detail.{export_format.lower()}.{level}"
+            # SVG writes take well under a millisecond: too noisy to gate on
+            results.add(f"{prefix}.mean_ms", statistics.fmean(samples), "ms", gated=export_format != "SVG")
+            results.add(f"{prefix}.large_bytes", table[f"{export_format},{level},large"]["bytes"], "bytes")
+    results.details["detail.levels"] = table
+
+
+async def bench_crud(client, results: Results, operations: int) -> None:
+    """Sequential create, read, update and delete throughput."""
+    latencies: Dict[str, List[float]] = {"create": [], "read": [], "update": [], "delete": []}
+    ids = []
+    for i in range(operations):
+        response, ms = await timed(client.post, "/api/v1/configurations/", json=configuration_payload(i))
+        response.raise_for_status()
+        ids.append(response.json()["id"])
+        latencies["create"].append(ms)
+    for config_id in ids:
+        response, ms = await timed(client.get, f"/api/v1/configurations/{config_id}")
+        response.raise_for_status()
+        latencies["read"].append(ms)
+    for i, config_id in enumerate(ids):
+        response, ms = await timed(
+            client.patch, f"/api/v1/configurations/{config_id}", json={"geometry_params": {"W": 20, "LS": 200 + i % 10}}
+        )
+        response.raise_for_status()
+        latencies["update"].append(ms)
+    for config_id in ids:
+        response, ms = await timed(client.delete, f"/api/v1/configurations/{config_id}")
+        response.raise_for_status()
+        latencies["delete"].append(ms)
+
+    for operation, samples in latencies.items():
+        results.add(f"crud.{operation}.ops_per_s", 1000 * len(samples) / sum(samples), "ops/s", better="higher")
+        results.add(f"crud.{operation}.p95_ms", percentile(samples, 95), "ms", gated=False)
+
+
+async def seed(client, start: int, stop: int) -> float:
+    """Bulk-import configurations start..stop-1; returns rows per second."""
+    async def body():
+        for i in range(start, stop):
+            yield (json.dumps(configuration_payload(i)) + "\n").encode()
+
+    begin = time.perf_counter()
+    response = await client.post("/api/v1/configurations/import", content=body())
+    response.raise_for_status()
+    report = response.json()
+    if report.get("failed"):
+        raise RuntimeError(f"seeding failed: {report}")
+    return (stop - start) / (time.perf_counter() - begin)
+
+
+async def bench_pagination(client, results: Results, sizes: List[int], repeat: int, walk_pages: int) -> None:
+    """List latency at each table size (offset first/deep page, cursor walk)."""
+    seeded = 0
+    for rows in sorted(sizes):
+        rows_per_s = await seed(client, seeded, rows)
+        seeded = rows
+        results.add(f"pagination.{rows}.seed_rows_per_s", rows_per_s, "rows/s", better="higher")
+
+        pages = {"first": 0, "deep": max(rows - PAGE_SIZE, 0)}
+        for label, skip in pages.items():
+            samples = []
+            for _ in range(repeat):
+                response, ms = await timed(
+                    client.get, "/api/v1/configurations/", params={"skip": skip, "limit": PAGE_SIZE}
+                )
+                response.raise_for_status()
+                samples.append(ms)
+            results.add(f"pagination.{rows}.offset_{label}_page_ms", statistics.fmean(samples), "ms")
+
+        samples, cursor = [], None
+        for _ in range(min(walk_pages, rows // PAGE_SIZE)):
+            params = {"limit": PAGE_SIZE, **({"cursor": cursor} if cursor else {})}
+            response, ms = await timed(client.get, "/api/v1/configurations/", params=params)
+            response.raise_for_status()
+            samples.append(ms)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        results.add(f"pagination.{rows}.cursor_walk_page_ms", statistics.fmean(samples), "ms")
+
+
+async def wait_for_export(client, export_id: int, timeout: float = 120) -> Dict[str, Any]:
+    """Poll an export until it leaves pending/processing."""
+    deadline = time.perf_counter() + timeout
+    while True:
+        export = (await client.get(f"/api/v1/exports/{export_id}")).json()
+        if export["status"] not in ("pending", "processing"):
+            return export
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"export {export_id} still {export['status']}")
+        await asyncio.sleep(0.01)
+
+
+async def bench_exports(client, results: Results, count: int) -> None:
+    """Throughput of `count` DXF exports submitted at once."""
+    async def create_configs(offset: int, n: int) -> List[int]:
+        ids = []
+        for i in range(offset, offset + n):
+            payload = configuration_payload(i)
+            payload["geometry_params"]["W"] = 20 + i  # distinct drawings, no artifact reuse
+            response = await client.post("/api/v1/configurations/", json=payload)
+            response.raise_for_status()
+            ids.append(response.json()["id"])
+        return ids
+
+    async def export(config_id: int) -> float:
+        start = time.perf_counter()
+        response = await client.post("/api/v1/exports/", json={"configuration_id": config_id, "format": "DXF"})
+        response.raise_for_status()
+        result = await wait_for_export(client, response.json()["id"])
+        if result["status"] != "completed":
+            raise RuntimeError(f"export failed: {result.get('error_message')}")
+        return (time.perf_counter() - start) * 1000
+
+    # Warm-up: start the worker processes (and their ezdxf import) untimed
+    from app.core.config import settings
+    warm_up = await create_configs(900000, 2 * max(settings.EXPORT_WORKERS, 1))
+    await asyncio.gather(*(export(config_id) for config_id in warm_up))
+
+    ids = await create_configs(800000, count)
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(export(config_id) for config_id in ids))
+    elapsed = time.perf_counter() - start
+
+    results.add("exports.throughput_per_s", count / elapsed, "exports/s", better="higher")
+    results.add_latencies("exports.latency", list(latencies))
+    results.details["exports.workers"] = settings.EXPORT_WORKERS
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+async def run_api_suites(suites: List[str], args, results: Results) -> None:
+    """Start the app (lifespan included) and run the suites that go through HTTP."""
+    import httpx
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            if "crud" in suites:
+                print("crud")
+                await bench_crud(client, results, args.crud_ops)
+            if "pagination" in suites:
+                print("pagination")
+                await bench_pagination(client, results, args.rows, args.page_repeat, args.walk_pages)
+            if "exports" in suites:
+                print("exports")
+                await bench_exports(client, results, args.exports)
+
+
+def compare(metrics: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """Print metric changes against the baseline; return the regressed metric names."""
+    regressions = []
+    print(f"\n{'metric':<48}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name, metric in metrics.items():
+        base = baseline.get(name)
+        if base is None or not base["value"]:
+            continue
+        change = metric["value"] / base["value"] - 1
+        worse = change > threshold if metric["better"] == "lower" else change < -threshold
+        worse = worse and metric.get("gated", True)
+        if worse:
+            regressions.append(name)
+        print(f"{name:<48}{base['value']:>12.2f}{metric['value']:>12.2f}{change:>+9.1%}{'  REGRESSION' if worse else ''}{'' if metric.get('gated', True) else '  (info)'}")
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", default=",".join(SUITES), help=f"comma-separated subset of {', '.join(SUITES)}")
+    parser.add_argument("--rows", default="10000,100000", help="table sizes for the pagination suite")
+    parser.add_argument("--cad-repeat", type=int, default=3, help="calls per NOB x LS grid cell")
+    parser.add_argument("--crud-ops", type=int, default=500, help="configurations created/read/updated/deleted")
+    parser.add_argument("--page-repeat", type=int, default=20, help="requests per offset page measurement")
+    parser.add_argument("--walk-pages", type=int, default=50, help="pages followed in the cursor walk")
+    parser.add_argument("--exports", type=int, default=40, help="exports submitted concurrently")
+    parser.add_argument("--export-workers", type=int, help="EXPORT_WORKERS for the run (default: the setting)")
+    parser.add_argument("--startup-runs", type=int, default=3, help="cold starts measured (the fastest counts)")
+    parser.add_argument("--startup-budget-ms", type=float, default=1500, help="max import time of app.main (0 = no limit)")
+    parser.add_argument("--lifespan-budget-ms", type=float, default=500, help="max lifespan startup time (0 = no limit)")
+    parser.add_argument("--quick", action="store_true", help="small sizes for a smoke run (10k rows, fewer ops)")
+    parser.add_argument("--output", type=Path, help="write the results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown of gated metrics before failing (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline instead of comparing")
+    args = parser.parse_args()
+
+    suites = [suite.strip() for suite in args.suites.split(",") if suite.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    args.rows = [int(rows) for rows in args.rows.split(",")]
+    if args.quick:
+        args.rows, args.cad_repeat, args.crud_ops, args.exports = [10000], 3, 300, 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Configure the app before anything imports it
+        os.environ.update(
+            DATABASE_URL=f"sqlite:///{Path(tmp) / 'bench.db'}",
+            EXPORTS_DIR=str(Path(tmp) / "exports"),
+            EXPORT_CACHE_ENABLED="false",
+            EXPORT_PRECOMPRESS="false",
+            EXPORT_SWEEP_INTERVAL_SECONDS="0",
+            GEOMETRY_CACHE_SIZE="0",
+            INIT_ON_STARTUP="true",
+        )
+        if args.export_workers is not None:
+            os.environ["EXPORT_WORKERS"] = str(args.export_workers)
+        sys.path.insert(0, str(BACKEND_DIR))
+
+        results = Results()
+        budget_failures: List[str] = []
+        if "startup" in suites:
+            print("startup")
+            budget_failures = bench_startup(
+                results, args.startup_runs, f"sqlite:///{Path(tmp) / 'startup.db'}",
+                args.startup_budget_ms, args.lifespan_budget_ms
+            )
+        if "cad" in suites:
+            print("cad")
+            bench_cad(results, args.cad_repeat)
+        if "detail" in suites:
+            print("detail")
+            bench_detail(results, args.cad_repeat * 10)
+        if set(suites) & {"crud", "pagination", "exports"}:
+            asyncio.run(run_api_suites(suites, args, results))
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "suites": suites,
+            "rows": args.rows if "pagination" in suites else None,
+            "quick": args.quick,
+        },
+        "metrics": results.metrics,
+        "details": results.details,
+        "budget_failures": budget_failures,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    for failure in budget_failures:
+        print(f"\nFAIL: {failure}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"\nbaseline written to {args.baseline}")
+    elif not args.baseline.exists():
+        print(f"\nno baseline at {args.baseline}; record one with --save-baseline")
+    else:
+        baseline = json.loads(args.baseline.read_text())["metrics"]
+        regressions = compare(results.metrics, baseline, args.threshold)
+        if regressions:
+            print(f"\nFAIL: {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nno regressions beyond {args.threshold:.0%}")
+    if budget_failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
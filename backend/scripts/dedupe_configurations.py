@@ -0,0 +1,54 @@
+"""
+Backfill configuration fingerprints and merge duplicate configurations.
+
+Rows created before fingerprinting have no fingerprint and may be
+identical copies of each other. This job fingerprints every row (see
+app/domain/configuration.py); the first row holding a fingerprint is kept,
+and each later identical row is merged into it: its exports move to the
+kept row and the duplicate is deleted. Run it once after deploying
+fingerprinting and again whenever FINGERPRINT_VERSION changes.
+
+The database changes are safe while the API is serving, but the API's
+cached GET /configurations/{id} responses are only invalidated through a
+shared bus (CONFIG_CACHE_INVALIDATION_BUS=redis). With the default
+process-local cache, restart the API afterwards (or set
+CONFIG_CACHE_TTL_SECONDS), or merged configurations keep being served.
+
+Usage (from backend/):
+    python scripts/dedupe_configurations.py [--batch-size 1000] [--dry-run]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    from app.core.config import settings
+    from app.core.database import SessionLocal, ensure_columns, ensure_indexes
+    from app.services.configuration_service import deduplicate_configurations
+
+    # The fingerprint column and its unique index may not exist yet
+    ensure_columns()
+    ensure_indexes()
+
+    db = SessionLocal()
+    try:
+        report = deduplicate_configurations(db, batch_size=max(args.batch_size, 1), dry_run=args.dry_run)
+    finally:
+        db.close()
+    print(json.dumps({**report, "dry_run": args.dry_run}, indent=2))
+    if report.get("merged") and not args.dry_run and not settings.CONFIG_CACHE_INVALIDATION_BUS:
+        print("Configurations were merged: restart the API to drop its cached responses", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Optimize catalog GLB models: weld, quantize (KHR_mesh_quantization), prune
+unused accessors and write LOD variants next to a size/vertex report.
+
+Usage (from backend/):
+    python scripts/optimize_models.py [models_dir] [--output DIR]
+        [--lods 1,0.4,0.15] [--no-quantize] [--keep-extras] [--json]
+
+models_dir defaults to settings.MODELS_DIR (resolved against the backend
+root); output defaults to <models_dir>/optimized. Exits with status 1 if
+the directory is missing or holds no .glb files, or a model fails.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Make `app` importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.config import settings
+from app.core.glb_optimizer import DEFAULT_LOD_RATIOS, optimize_glb
+
+
+def _percent(after: int, before: int) -> str:
+    return f"{(1 - after / before) * 100:5.1f}%" if before else "   - "
+
+
+def print_report(report: dict) -> None:
+    """Print one model's LOD table."""
+    print(f"\n{Path(report['source']).name}: {report['bytes']:,} bytes, "
+          f"{report['vertices']:,} vertices, {report['triangles']:,} triangles, "
+          f"{report['unused_accessors']} unused accessors")
+    print(f"  {'LOD':<4}{'bytes':>12}{'saved':>8}{'vertices':>11}{'saved':>8}{'triangles':>11}")
+    for lod in report["lods"]:
+        print(
+            f"  {lod['level']:<4}{lod['bytes']:>12,}{_percent(lod['bytes'], report['bytes']):>8}"
+            f"{lod['vertices']:>11,}{_percent(lod['vertices'], report['vertices']):>8}"
+            f"{lod['triangles']:>11,}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("models_dir", nargs="?", type=Path, default=settings.models_path)
+    parser.add_argument("--output", type=Path, help="directory for the optimized files")
+    parser.add_argument("--lods", default=",".join(str(r) for r in DEFAULT_LOD_RATIOS),
+                        help="vertex share kept per LOD, comma-separated (1 = weld only)")
+    parser.add_argument("--no-quantize", action="store_true", help="keep float32 attributes")
+    parser.add_argument("--keep-extras", action="store_true", help="keep vendor `extras` metadata")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    models_dir = args.models_dir
+    if not models_dir.is_dir():
+        print(f"Models directory not found: {models_dir}", file=sys.stderr)
+        return 1
+    sources = sorted(models_dir.glob("*.glb"))
+    if not sources:
+        print(f"No .glb models in {models_dir}", file=sys.stderr)
+        return 1
+    output = args.output or models_dir / "optimized"
+    ratios = [float(r) for r in args.lods.split(",") if r.strip()]
+
+    reports = []
+    failures = 0
+    for source in sources:
+        try:
+            report = optimize_glb(
+                source, output,
+                lod_ratios=ratios,
+                quantize=not args.no_quantize,
+                keep_extras=args.keep_extras
+            )
+        except ValueError as e:
+            print(f"Skipping {source.name}: {e}", file=sys.stderr)
+            failures += 1
+            continue
+        reports.append(report)
+        if not args.json:
+            print_report(report)
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    elif reports:
+        before = sum(r["bytes"] for r in reports)
+        after = sum(r["lods"][0]["bytes"] for r in reports)
+        print(f"\nTotal LOD0: {before:,} -> {after:,} bytes ({_percent(after, before).strip()} smaller)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
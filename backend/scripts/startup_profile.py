@@ -0,0 +1,147 @@
+"""
+Startup profile: cold import time per module and a startup-time budget check.
+
+Each run starts a fresh interpreter with `python -X importtime`, imports
+app.main and runs the lifespan startup (schema setup, export recovery)
+against a throwaway SQLite database. The report lists the slowest modules
+and packages; the exit status is 1 when the fastest run exceeds a budget
+or a module that should load lazily (ezdxf by default) was imported with
+the app. The benchmark suite runs the same check as its "startup" suite
+(scripts/benchmark_suite.py), failing the run when the budget is exceeded.
+
+Usage (from backend/):
+    python scripts/startup_profile.py [--runs 3] [--top 20]
+        [--budget-ms 1500] [--lifespan-budget-ms 500] [--forbid ezdxf] [--json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+IMPORT_MARKER = "--- app.main imported"
+
+# Runs in the child interpreter; argv[1] is a comma-separated list of forbidden packages
+CHILD = f"""
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.main
+import_ms = (time.perf_counter() - start) * 1000
+sys.stderr.write({IMPORT_MARKER!r} + "\\n")
+forbidden = [name for name in sys.argv[1].split(",") if name]
+loaded = sorted({{m.split(".")[0] for m in sys.modules}} & set(forbidden))
+
+async def startup():
+    start = time.perf_counter()
+    async with app.main.app.router.lifespan_context(app.main.app):
+        return (time.perf_counter() - start) * 1000
+
+lifespan_ms = asyncio.run(startup())
+print(json.dumps({{"import_ms": import_ms, "lifespan_ms": lifespan_ms, "forbidden_loaded": loaded}}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Import timings (microseconds) recorded before app.main finished importing."""
+    modules = []
+    for line in stderr.splitlines():
+        if line.startswith(IMPORT_MARKER):
+            break
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+        })
+    return modules
+
+
+def run_once(forbid: List[str], database_url: str) -> Dict[str, Any]:
+    """Profile one cold start in a fresh interpreter."""
+    env = dict(os.environ, DATABASE_URL=database_url, PYTHONPATH=str(BACKEND_DIR))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, ",".join(forbid)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+        sys.exit("startup failed:\n" + "\n".join(errors[-40:]))
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["modules"] = parse_importtime(proc.stderr)
+    return result
+
+
+def summarize(modules: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Slowest modules (self time) and top-level packages (summed self time)."""
+    packages = defaultdict(int)
+    for module in modules:
+        packages[module["module"].split(".")[0]] += module["self_us"]
+    slowest = sorted(modules, key=lambda m: m["self_us"], reverse=True)[:top]
+    return {
+        "packages": sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top],
+        "modules": slowest,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure (the fastest is reported)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=1500, help="max import time of app.main (0 = no limit)")
+    parser.add_argument("--lifespan-budget-ms", type=float, default=500, help="max lifespan startup time (0 = no limit)")
+    parser.add_argument("--forbid", action="append", default=None,
+                        help="package that must not be imported with the app (default: ezdxf)")
+    parser.add_argument("--database-url", help="database to start against (default: a temporary SQLite file)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+    forbid = args.forbid if args.forbid is not None else ["ezdxf"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{Path(tmp) / 'startup.db'}"
+        runs = [run_once(forbid, database_url) for _ in range(max(args.runs, 1))]
+
+    best = min(runs, key=lambda r: r["import_ms"])
+    lifespan_ms = min(r["lifespan_ms"] for r in runs)
+    report = {
+        "import_ms": round(best["import_ms"], 1),
+        "lifespan_ms": round(lifespan_ms, 1),
+        "runs": [round(r["import_ms"], 1) for r in runs],
+        "forbidden_loaded": best["forbidden_loaded"],
+        **summarize(best["modules"], args.top),
+    }
+
+    failures = []
+    if args.budget_ms and report["import_ms"] > args.budget_ms:
+        failures.append(f"import of app.main took {report['import_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    if args.lifespan_budget_ms and report["lifespan_ms"] > args.lifespan_budget_ms:
+        failures.append(f"lifespan startup took {report['lifespan_ms']:.0f} ms (budget {args.lifespan_budget_ms:.0f} ms)")
+    if report["forbidden_loaded"]:
+        failures.append(f"imported at startup but should load lazily: {', '.join(report['forbidden_loaded'])}")
+    report["failures"] = failures
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"import app.main: {report['import_ms']:.1f} ms (runs: {', '.join(f'{ms:.0f}' for ms in report['runs'])})")
+        print(f"lifespan startup: {report['lifespan_ms']:.1f} ms\n")
+        print(f"{'package':<32}{'self (ms)':>12}")
+        for name, self_us in report["packages"]:
+            print(f"{name:<32}{self_us / 1000:>12.1f}")
+        print(f"\n{'module':<48}{'self (ms)':>12}{'cumulative (ms)':>18}")
+        for module in report["modules"]:
+            print(f"{module['module']:<48}{module['self_us'] / 1000:>12.1f}{module['cumulative_us'] / 1000:>18.1f}")
+        for failure in failures:
+            print(f"\nFAIL: {failure}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
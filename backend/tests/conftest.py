@@ -0,0 +1,12 @@
+"""
+Pytest setup: import the app from the backend root against a throwaway database.
+"""
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Settings are read at import time; never touch the development database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, str(BACKEND_DIR))
@@ -0,0 +1,122 @@
+"""
+GLB optimizer: weld and decimate invariants, and the LOD pipeline on a catalog model.
+"""
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.core.glb_optimizer import Primitive, decimate, load_primitives, optimize_glb, weld
+from app.core.glb_reader import GLBDocument
+from app.core.glb_writer import MODE_TRIANGLES
+
+CATALOG_MODEL = settings.models_path / "SSELBWN14-110.glb"
+
+
+def _triangles(positions, normal=(0.0, 0.0, 1.0)):
+    """Unindexed triangle soup: every triangle has its own three vertices."""
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    normals = np.tile(np.asarray(normal, dtype=np.float32), (len(positions), 1))
+    indices = np.arange(len(positions), dtype=np.uint32)
+    return Primitive({"POSITION": positions, "NORMAL": normals}, indices, 0, MODE_TRIANGLES)
+
+
+def _grid(n):
+    """A flat n x n quad grid as a triangle soup (two triangles per cell)."""
+    corners = []
+    for i in range(n):
+        for j in range(n):
+            a, b, c, d = (i, j, 0), (i + 1, j, 0), (i + 1, j + 1, 0), (i, j + 1, 0)
+            corners += [a, b, c, a, c, d]
+    return _triangles(corners)
+
+
+def _assert_well_formed(primitive):
+    elements = primitive.indices.reshape(-1, 3)
+    assert len(primitive.indices) % 3 == 0
+    assert primitive.indices.max(initial=0) < primitive.vertex_count
+    assert (elements[:, 0] != elements[:, 1]).all()
+    assert (elements[:, 1] != elements[:, 2]).all()
+    assert (elements[:, 0] != elements[:, 2]).all()
+    for values in primitive.attributes.values():
+        assert len(values) == primitive.vertex_count
+
+
+def _triangle_positions(primitive):
+    """Triangles as sorted tuples of vertex positions, for geometry comparisons."""
+    corners = primitive.attributes["POSITION"][primitive.indices].reshape(-1, 3, 3)
+    return sorted(tuple(sorted(map(tuple, triangle.round(6).tolist()))) for triangle in corners)
+
+
+def test_weld_merges_shared_vertices_and_keeps_geometry():
+    quad = _triangles([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0), (1, 1, 0), (0, 1, 0)])
+
+    welded = weld(quad, 1e-6)
+
+    _assert_well_formed(welded)
+    assert welded.vertex_count == 4
+    assert welded.triangle_count == 2
+    assert _triangle_positions(welded) == _triangle_positions(quad)
+
+
+def test_weld_drops_duplicates_and_collapsed_triangles_but_keeps_back_faces():
+    soup = _triangles([
+        (0, 0, 0), (1, 0, 0), (0, 1, 0),
+        (1, 0, 0), (0, 1, 0), (0, 0, 0),      # same triangle, rotated
+        (0, 0, 0), (0, 1, 0), (1, 0, 0),      # opposite winding
+        (0, 0, 0), (0, 0, 1e-9), (1, 0, 0),   # collapses when welded
+    ])
+
+    welded = weld(soup, 1e-6)
+
+    _assert_well_formed(welded)
+    assert welded.triangle_count == 2
+
+
+def test_weld_keeps_vertices_with_different_normals():
+    up = _triangles([(0, 0, 0), (1, 0, 0), (0, 1, 0)])
+    down = _triangles([(0, 0, 0), (0, 1, 0), (1, 0, 0)], normal=(0.0, 0.0, -1.0))
+    both = Primitive(
+        {name: np.concatenate([up.attributes[name], down.attributes[name]]) for name in up.attributes},
+        np.arange(6, dtype=np.uint32), 0, MODE_TRIANGLES
+    )
+
+    assert weld(both, 1e-6).vertex_count == 6
+
+
+@pytest.mark.parametrize("ratio", [0.5, 0.2])
+def test_decimate_reduces_vertices_within_bounds(ratio):
+    mesh = [weld(_grid(40), 1e-6)]
+    positions = mesh[0].attributes["POSITION"]
+
+    simplified = decimate(mesh, ratio, diagonal=float(np.linalg.norm(np.ptp(positions, axis=0))))
+
+    kept = simplified[0]
+    _assert_well_formed(kept)
+    assert ratio * mesh[0].vertex_count <= kept.vertex_count < mesh[0].vertex_count
+    assert kept.triangle_count < mesh[0].triangle_count
+    new_positions = kept.attributes["POSITION"]
+    assert (new_positions >= positions.min(axis=0) - 1e-5).all()
+    assert (new_positions <= positions.max(axis=0) + 1e-5).all()
+
+
+def test_decimate_full_ratio_is_a_no_op():
+    mesh = [weld(_grid(4), 1e-6)]
+
+    assert decimate(mesh, 1.0, diagonal=1.0) is mesh
+
+
+@pytest.mark.skipif(not CATALOG_MODEL.is_file(), reason="catalog models not checked out")
+def test_optimize_catalog_model_lods(tmp_path):
+    report = optimize_glb(CATALOG_MODEL, tmp_path)
+
+    vertices = [lod["vertices"] for lod in report["lods"]]
+    assert vertices[0] <= report["vertices"]
+    assert vertices == sorted(vertices, reverse=True)
+    assert report["lods"][-1]["vertices"] < vertices[0]
+    for lod in report["lods"]:
+        with GLBDocument(tmp_path / f"{CATALOG_MODEL.stem}.lod{lod['level']}.glb") as doc:
+            primitives = [p for mesh in load_primitives(doc) for p in mesh]
+        assert sum(p.vertex_count for p in primitives) == lod["vertices"]
+        for primitive in primitives:
+            if primitive.mode == MODE_TRIANGLES:
+                _assert_well_formed(primitive)
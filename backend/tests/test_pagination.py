@@ -0,0 +1,87 @@
+"""
+Keyset pagination on (created_at, id).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.db.models import Configuration
+from app.db.pagination import decode_cursor, encode_cursor, paginate
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    # Three rows per timestamp, so ties are broken by id
+    session.add_all(
+        Configuration(part_number=f"PN-{i}", status="draft" if i % 2 else "completed",
+                      created_at=START + timedelta(seconds=i // 3))
+        for i in range(25)
+    )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _walk(db, limit, query=None):
+    """All rows reached by following cursors, and the number of pages."""
+    query = query if query is not None else db.query(Configuration)
+    rows, cursor = paginate(query, Configuration, limit)
+    pages = 1
+    while cursor:
+        page, cursor = paginate(query, Configuration, limit, cursor=cursor)
+        rows += page
+        pages += 1
+    return rows, pages
+
+
+def _ordered(rows):
+    return sorted(rows, key=lambda row: (row.created_at, row.id))
+
+
+@pytest.mark.parametrize("limit", [1, 7, 25, 100])
+def test_cursor_pages_cover_every_row_once_in_order(db, limit):
+    rows, pages = _walk(db, limit)
+
+    assert [row.id for row in rows] == [row.id for row in _ordered(db.query(Configuration).all())]
+    assert pages == max(1, -(-25 // limit))
+
+
+def test_cursor_pages_with_filter(db):
+    query = db.query(Configuration).filter(Configuration.status == "draft")
+    rows, _ = _walk(db, 4, query)
+
+    assert [row.id for row in rows] == [row.id for row in _ordered(query.all())]
+
+
+def test_inserts_before_the_cursor_do_not_shift_later_pages(db):
+    first, cursor = paginate(db.query(Configuration), Configuration, 10)
+    db.add(Configuration(part_number="EARLY", created_at=START - timedelta(days=1)))
+    db.commit()
+
+    second, _ = paginate(db.query(Configuration), Configuration, 10, cursor=cursor)
+
+    expected = _ordered(db.query(Configuration).filter(Configuration.part_number != "EARLY").all())
+    assert [row.id for row in first + second] == [row.id for row in expected[:20]]
+
+
+def test_offset_paging_is_kept(db):
+    rows, cursor = paginate(db.query(Configuration), Configuration, 5, skip=20)
+
+    assert [row.id for row in rows] == [row.id for row in _ordered(db.query(Configuration).all())[20:]]
+    assert cursor is None
+
+
+def test_cursor_round_trip_and_malformed_cursor():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
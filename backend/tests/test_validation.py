@@ -0,0 +1,59 @@
+"""
+RuleEngine: the vectorized batch path must agree with per-candidate validate().
+"""
+import pytest
+
+from app.domain.validation import rule_engine
+
+VALID = {
+    "PN": "SSELBWN14-110", "ST": "Standard", "NOB": 2, "H": 20, "LS": 500, "W": 32,
+    "L1": 80, "B": 23, "C": 30, "MX": "None", "GREASE": "LGMT 2",
+}
+
+CANDIDATES = [
+    VALID,
+    {**VALID, "LS": "500", "NOB": "2"},                     # numeric strings
+    {**{k: v for k, v in VALID.items() if k != "ST"}, "surface_treatment": "Standard"},  # alias
+    {**VALID, "NOB": 10, "L1": 80, "LS": 500},              # blocks do not fit
+    {**VALID, "NOB": 2.5},                                  # not an integer
+    {**VALID, "LS": -1},                                    # out of range
+    {**VALID, "ST": "Gold"},                                # unknown option
+    {**VALID, "GREASE": "LGHP 2"},                          # incompatible with Standard
+    {**VALID, "GREASE": "LGHP 2", "ST": "Zinc Plated", "MX": "MX-1"},
+    {**VALID, "LS": "long"},                                # mistyped, reported once
+    {**VALID, "LS": ""},                                    # missing
+    {k: v for k, v in VALID.items() if k not in ("H", "W")},  # incomplete
+    {},
+    {"PN": "X", "unknown_field": 3},
+]
+
+
+def _rules(violations):
+    return sorted(violation["rule"] for violation in violations)
+
+
+@pytest.mark.parametrize("require_complete", [True, False])
+def test_validate_batch_matches_validate(require_complete):
+    valid, violations = rule_engine.validate_batch(CANDIDATES, require_complete=require_complete)
+
+    assert len(valid) == len(CANDIDATES)
+    for index, candidate in enumerate(CANDIDATES):
+        expected = rule_engine.validate(candidate, require_complete=require_complete)
+        assert bool(valid[index]) == (not expected), candidate
+        assert _rules(violations.get(index, [])) == _rules(expected), candidate
+
+
+def test_candidates_cover_valid_invalid_and_incomplete():
+    valid, violations = rule_engine.validate_batch(CANDIDATES)
+
+    assert valid[:3].all()
+    assert not valid[3:].any()
+    assert "required:H" in _rules(violations[11])
+    assert _rules(violations[9]) == ["type:LS"]
+
+
+def test_validate_batch_empty():
+    valid, violations = rule_engine.validate_batch([])
+
+    assert len(valid) == 0
+    assert violations == {}
@@ -22,9 +22,9 @@ import {
     FastNavPlugin
 } from "@xeokit/xeokit-sdk";
 import "./Preview3D.css";
-import { createExport } from "../../../services/api";
+import { createExport, getExport } from "../../../services/api";
 
-const Preview3D = ({ showModel, configId, modelUrl, modelScale = [1, 1, 1] }) => {
+const Preview3D = ({ showModel, configId, modelUrl, modelScale = [1, 1, 1], onModelError }) => {
     const canvasRef = useRef(null);
     const viewerRef = useRef(null);
     const [sectionEnabled, setSectionEnabled] = useState(false);
@@ -49,11 +49,17 @@ const Preview3D = ({ showModel, configId, modelUrl, modelScale = [1, 1, 1] }) =>
 
         try {
             console.log("Initiating export for Config ID:", configId);
-            const response = await createExport({
+            let response = await createExport({
                 configuration_id: configId,
-                format: "STEP"
+                format: "DXF"
             });
 
+            // Exports are generated by background workers: poll until the job finishes
+            for (let attempt = 0; attempt < 60 && ["pending", "processing"].includes(response.status); attempt++) {
+                await new Promise(resolve => setTimeout(resolve, 500));
+                response = await getExport(response.id);
+            }
+
             console.log("Export response:", response);
 
             if (response.status === "completed" && response.file_path) {
@@ -309,6 +315,7 @@ const Preview3D = ({ showModel, configId, modelUrl, modelScale = [1, 1, 1] }) =>
                         text: "Load Error",
                         subtext: "Could not load 3D model"
                     });
+                    if (onModelError) onModelError(modelUrl);
                 });
 
             } catch (err) {
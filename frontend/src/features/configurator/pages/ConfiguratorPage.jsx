@@ -3,7 +3,7 @@ import Preview3D from "../components/Preview3D";
 import InputPanel from "../components/InputPanel";
 import logo from "../../../assets/CLOGO.png";
 import "./ConfiguratorPage.css";
-import { createConfiguration } from "../../../services/api";
+import { createConfiguration, getStretchedModelUrl } from "../../../services/api";
 import { SCHEMAS, getSchemabyId } from "../../../constants/schemas";
 
 function ConfiguratorPage() {
@@ -15,42 +15,81 @@ function ConfiguratorPage() {
     const [isModelVisible, setIsModelVisible] = useState(false);
     const containerRef = useRef(null);
     const [configId, setConfigId] = useState(null);
+    const [failedModelUrl, setFailedModelUrl] = useState(null); // stretched model the server could not serve
 
     // Get current schema object
     const currentSchema = SCHEMAS[activeSchemaId];
 
     // Model Paths
     const MODEL_PATHS = {
-        LINEAR_GUIDE: "/model.glb",
+        LINEAR_GUIDE: "/SSELBWN14-110.glb",
         HEX_BOLT: "/structural_hex_bolt.glb",
         ALLEN_BOLT: "/M10_Allen_bolt.glb",
         M8_BOLT: "/M8x16.glb",
         HYDRAULIC: "/hydralic.glb"
     };
 
-    const activeModelUrl = MODEL_PATHS[activeSchemaId];
+    // Catalog model the server stretches to the rail length (file stem under MODELS_DIR)
+    const LINEAR_GUIDE_CATALOG_MODEL = "SSELBWN14-110";
+    // Length the static linear guide model represents (base_length of its zones endpoint; used when stretching fails)
+    const LINEAR_GUIDE_BASE_LENGTH = 110;
+    // Matches the server's MODEL_STRETCH_STEP_MM / MODEL_STRETCH_MAX_LENGTH_MM
+    const STRETCH_STEP_MM = 1;
+    const STRETCH_MAX_LENGTH_MM = 6000;
+    // Wait for typing to pause before requesting a stretched model
+    const STRETCH_DEBOUNCE_MS = 300;
+
+    const getLinearGuideLength = () => {
+        const inputLength = parseFloat(formState.LS || formState.L);
+        return (!isNaN(inputLength) && inputLength > 0) ? inputLength : null;
+    };
+
+    const linearGuideLength = activeSchemaId === 'LINEAR_GUIDE' ? getLinearGuideLength() : null;
+    const [stretchLength, setStretchLength] = useState(null); // debounced, quantized linearGuideLength
+
+    useEffect(() => {
+        if (linearGuideLength === null) {
+            setStretchLength(null);
+            return undefined;
+        }
+        const quantized = Math.max(STRETCH_STEP_MM, Math.round(linearGuideLength / STRETCH_STEP_MM) * STRETCH_STEP_MM);
+        const timer = setTimeout(() => setStretchLength(quantized), STRETCH_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [linearGuideLength]);
+
+    /**
+     * Linear guides are resized on the server: the rail's ends and mounting
+     * holes keep their shape and only the plain sections between them are
+     * stretched, so any length can be previewed without distortion.
+     * If the server cannot serve it, the static model is scaled on the client instead.
+     * Lengths are debounced and rounded so typing doesn't request a model per keystroke.
+     */
+    const getStretchedUrl = () => {
+        return stretchLength !== null && linearGuideLength !== null
+            ? getStretchedModelUrl(LINEAR_GUIDE_CATALOG_MODEL, stretchLength)
+            : null;
+    };
+
+    const stretchedUrl = getStretchedUrl();
+    const useStretchedModel = stretchedUrl !== null && stretchedUrl !== failedModelUrl;
+    const activeModelUrl = useStretchedModel ? stretchedUrl : MODEL_PATHS[activeSchemaId];
+
+    const handleModelError = (url) => {
+        if (url === stretchedUrl) {
+            console.warn("Stretched model unavailable, falling back to the static model:", url);
+            setFailedModelUrl(url);
+        }
+    };
 
     /**
      * Dynamic 3D Scaling Logic
      * ========================
      * Base Reference Calibration:
-     * - LINEAR_GUIDE (SSELBWN14-110.glb): Base Length = 1000mm
+     * - LINEAR_GUIDE: No client-side scaling, the server returns the model at the requested length;
+     *   the static fallback model (110mm) is stretched along X, clamped to the maximum rail length
      * - BOLTS: Scale at 1000:1 for unit conversion (model in meters, display in mm)
-     * 
-     * Strategy: Axis Scaling (X-axis stretch for length changes)
-     * Note: This will stretch mounting holes into ovals on very long rails.
      */
-    const BASE_LENGTHS = {
-        LINEAR_GUIDE: 1000,  // Base model represents 1000mm rail
-        HEX_BOLT: 1,
-        ALLEN_BOLT: 1,
-        M8_BOLT: 1,
-        HYDRAULIC: 1  // No scaling for hydraulic
-    };
-
     const calculateModelScale = () => {
-        const baseLength = BASE_LENGTHS[activeSchemaId] || 1000;
-
         // For bolts: Scale based on Diameter (D) and Length (L)
         // Base Model: M8x16 (D=8mm, L=16mm)
         // Unit Conversion: Model is likely in meters, so we multiply by 1000 to get to mm, then apply ratio.
@@ -76,20 +115,11 @@ function ConfiguratorPage() {
             return scale;
         }
 
-        // For linear guides, scale X-axis based on user input
-        if (activeSchemaId === 'LINEAR_GUIDE') {
-            const inputLength = parseFloat(formState.LS || formState.L);
-
-            // Validation: default to 1.0 if invalid input
-            if (isNaN(inputLength) || inputLength <= 0) {
-                return [1, 1, 1];
-            }
-
-            const scaleX = inputLength / baseLength;
-            // Clamp to reasonable bounds (0.1x to 10x) to prevent extreme distortion
-            const clampedScaleX = Math.max(0.1, Math.min(10, scaleX));
-
-            return [clampedScaleX, 1, 1];
+        // Static linear guide fallback: scale X-axis to the input length
+        if (activeSchemaId === 'LINEAR_GUIDE' && stretchedUrl !== null && !useStretchedModel) {
+            const scaleX = stretchLength / LINEAR_GUIDE_BASE_LENGTH;
+            // Clamp to reasonable bounds (0.1x up to the longest rail) to prevent extreme distortion
+            return [Math.max(0.1, Math.min(STRETCH_MAX_LENGTH_MM / LINEAR_GUIDE_BASE_LENGTH, scaleX)), 1, 1];
         }
 
         // For hydraulic components: No dynamic scaling, just unit conversion
@@ -119,8 +149,8 @@ function ConfiguratorPage() {
                 number_of_blocks: formState.number_of_blocks ? parseInt(formState.number_of_blocks) : undefined,
                 geometry_params: { ...formState },
                 status: "draft",
-                // We might want to send the schema_type if backend supports it later
-                schema_type: activeSchemaId
+                // Selects the backend CAD generator (GET /exports/generators)
+                product_id: activeSchemaId
             };
 
             const response = await createConfiguration(payload);
@@ -261,6 +291,7 @@ function ConfiguratorPage() {
                         configId={configId}
                         modelUrl={activeModelUrl}
                         modelScale={modelScale}
+                        onModelError={handleModelError}
                     />
                 </section>
             </div>
@@ -51,8 +51,9 @@ export async function getHealth() {
 
 // --- Configurations ---
 
+// Idempotent: re-applying the same form state returns the stored configuration
 export async function createConfiguration(data) {
-  return request("/configurations/", {
+  return request("/configurations/?idempotent=true", {
     method: "POST",
     body: JSON.stringify(data),
   });
@@ -95,3 +96,13 @@ export async function getExport(id) {
 export async function getExportsByConfiguration(configId) {
   return request(`/exports/configuration/${configId}`);
 }
+
+// --- Models ---
+
+/**
+ * URL of a catalog GLB stretched to a length on the server.
+ * Ends and mounting holes keep their shape; only the plain rail sections elongate.
+ */
+export function getStretchedModelUrl(modelName, length) {
+  return `${API_BASE_URL}/models/catalog/${encodeURIComponent(modelName)}?length=${encodeURIComponent(length)}`;
+}